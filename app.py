@@ -1,19 +1,37 @@
 
 # Import internal modules
 from xenon import db, ServerSettings
+from xenon.cassettes import configure_cassette, CASSETTE_FILE_PATH
+from xenon.persistent_cache import configure_persistent_cache
+from xenon.spotify3.library import configure_library_mirror
+from xenon.spotify3.playlist_store import configure_playlist_store
+from xenon.tokens import configure_token_manager
+from xenon.transport import get_transport
 
 # Import external modules
-from flask import Flask
+from flask import Flask, Response
 
 app = Flask(__name__)
 app.config['SQLALCHEMY_BINDS'] = {
     'users': 'sqlite:///users.db',
     'apis': 'sqlite:///apis.db',
-    'govee': 'sqlite:///govee.db'
+    'govee': 'sqlite:///govee.db',
+    'library': 'sqlite:///library.db'
 }
 
 ss = ServerSettings()
 db.init_app(app)
+configure_persistent_cache(app)
+configure_library_mirror(app)
+configure_playlist_store(app)
+spotify_client_id, spotify_client_secret = getattr(ss, 'spotify_client_id', ''), getattr(ss, 'spotify_client_secret', '')
+configure_token_manager(spotify_client_id, spotify_client_secret, start=bool(spotify_client_id and spotify_client_secret))
+configure_cassette(app, getattr(ss, 'cassette_mode', ''), getattr(ss, 'cassette_path', CASSETTE_FILE_PATH), float(getattr(ss, 'cassette_speed', 1.0)))
+
+@app.route('/metrics')
+def metrics() -> Response:
+    """ Upstream request metrics in the Prometheus text format. """
+    return Response(get_transport().metrics.render(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
     app.run(
@@ -0,0 +1,178 @@
+""" The benchmarked hot paths. Each case is set up once & returns the function which is timed; `ops` is the number of operations one call of that function performs, which the throughput is
+reported in. Every case runs against `benchmarks.fixtures` inside the scope set up by `benchmarks.run`, so requests go through the full `xenon.models` path without the network. """
+
+# Import internal modules
+from xenon.helpers import convert_iso_to_dt
+from xenon.govee import GetDevicesRequest
+from xenon.smh import TodosRequest, AssignmentRequest, AttachmentRequest
+from xenon.spotify3.models import FollowingRequest, Track, Album, AudioFeatures
+from xenon.spotify3.playlists import GetPlaylistItems
+from xenon.spotify3.tracks import GetCurrentUsersSavedTracks, GetTracks, GetTracksAudioFeatures
+from xenon.spotify3.albums import GetAlbums
+from benchmarks.fixtures import BENCH_PLAYLIST_ID, BENCH_ASSIGNMENT_ID
+
+# Import external modules
+import datetime
+import json
+
+class Case():
+    """ A named benchmark. `setup(fixtures)` returns the function which is timed. """
+
+    def __init__(self, name: str, setup: callable, ops: int = 1) -> None:
+        self.name: str = name
+        self.setup: callable = setup
+        self.ops: int = ops
+
+def _properties(cls: type, sample: object) -> list:
+    """ Returns the names of the properties of `cls` which can be read from `sample`. Properties which raise on the recorded payloads are left out, so the case times only working code. """
+    names = []
+    for name in dir(cls):
+        if not isinstance(getattr(cls, name, None), property):
+            continue
+        try:
+            getattr(sample, name)
+        except Exception:
+            continue
+        names.append(name)
+    return names
+
+def _read_properties(objects: list, names: list) -> callable:
+    def run() -> None:
+        for object_ in objects:
+            for name in names:
+                getattr(object_, name)
+    return run
+
+def _json(fixtures: dict, name: str) -> any:
+    return json.loads(fixtures[name].content)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+def _get_playlist_items(fixtures: dict) -> callable:
+    def run() -> None:
+        ngr = GetPlaylistItems(BENCH_PLAYLIST_ID)
+        ngr.create_request()
+        for item in ngr.get_data().items:
+            item['track']['id']
+    return run
+
+def _get_saved_tracks(fixtures: dict) -> callable:
+    def run() -> None:
+        ngr = GetCurrentUsersSavedTracks()
+        ngr.create_request()
+        for item in ngr.get_data().items:
+            item['added_at']
+    return run
+
+def _construct_playlist_items(fixtures: dict) -> callable:
+    def run() -> None:
+        GetPlaylistItems(BENCH_PLAYLIST_ID)
+    return run
+
+def _config_data_playlist_items(fixtures: dict) -> callable:
+    content = fixtures['playlist_items'].content
+    ngr = GetPlaylistItems(BENCH_PLAYLIST_ID)
+
+    def run() -> None:
+        ngr._data = json.loads(content)
+        ngr._config_data()
+        page = ngr.get_data()
+        page.items, page.offset, page.total, page.next
+    return run
+
+def _track_properties(fixtures: dict) -> callable:
+    ngr = GetTracks([track['id'] for track in _json(fixtures, 'tracks')['tracks']])
+    ngr.create_request()
+    tracks = ngr.get_data()
+    return _read_properties(tracks, _properties(Track, tracks[0]))
+
+def _album_properties(fixtures: dict) -> callable:
+    ngr = GetAlbums([album['id'] for album in _json(fixtures, 'albums')['albums']])
+    ngr.create_request()
+    albums = ngr.get_data()
+    return _read_properties(albums, _properties(Album, albums[0]))
+
+def _audio_features_properties(fixtures: dict) -> callable:
+    ngr = GetTracksAudioFeatures([features['id'] for features in _json(fixtures, 'audio_features')['audio_features'][:50]])
+    ngr.create_request()
+    features = ngr.get_data()
+    return _read_properties(features, _properties(AudioFeatures, features[0]))
+
+def _iso_strings(fixtures: dict) -> list:
+    return [item['added_at'] for name in ('playlist_items', 'saved_tracks') for item in _json(fixtures, name)['items']]
+
+def _convert_iso_to_dt(fixtures: dict) -> callable:
+    values = _iso_strings(fixtures)
+
+    def run() -> None:
+        for value in values:
+            convert_iso_to_dt(value)
+    return run
+
+def _govee_lookups(fixtures: dict) -> callable:
+    ngr = GetDevicesRequest('bench')
+    ngr.create_request()
+    last_device = ngr.get_data()[-1]
+
+    def run() -> None:
+        ngr.get_device_by_name(last_device['deviceName'])
+        ngr.get_device_by_mac_addr(last_device['device'])
+        ngr.get_device_by_model(last_device['model'])
+        ngr.get_controllable_devices()
+        ngr.get_retrievable_devices()
+    return run
+
+def _smh_todos(fixtures: dict) -> callable:
+    now = datetime.datetime(2024, 1, 1)
+
+    def run() -> None:
+        ngr = TodosRequest(now, now)
+        ngr.create_request()
+        ngr.get_all()
+        ngr.get_all_completed()
+        ngr.get_all_todo()
+    return run
+
+def _smh_assignment(fixtures: dict) -> callable:
+    sample = AssignmentRequest(BENCH_ASSIGNMENT_ID)
+    sample.create_request()
+    names = _properties(type(sample.assignment), sample.assignment)
+
+    def run() -> None:
+        ngr = AssignmentRequest(BENCH_ASSIGNMENT_ID)
+        ngr.create_request()
+        assignment = ngr.assignment
+        for name in names:
+            getattr(assignment, name)
+    return run
+
+def _smh_attachment(fixtures: dict) -> callable:
+    def run() -> None:
+        ngr = AttachmentRequest(BENCH_ASSIGNMENT_ID * 100)
+        ngr.create_request()
+        attachment = ngr.attachment
+        attachment.filename, attachment.file_size, attachment.file_url
+    return run
+
+def get_cases(fixtures: dict) -> list:
+    """ Returns every benchmark case. The number of operations of some cases depends on the size of the fixtures. """
+    tracks, albums = _json(fixtures, 'tracks')['tracks'], _json(fixtures, 'albums')['albums']
+
+    return [
+        Case('request.playlist_items', _get_playlist_items),
+        Case('request.saved_tracks', _get_saved_tracks),
+        Case('construct.playlist_items', _construct_playlist_items),
+        Case('config_data.playlist_items', _config_data_playlist_items),
+        Case('models.track_properties', _track_properties, len(tracks)),
+        Case('models.album_properties', _album_properties, len(albums)),
+        Case('models.audio_features_properties', _audio_features_properties, 50),
+        Case('helpers.convert_iso_to_dt', _convert_iso_to_dt, len(_iso_strings(fixtures))),
+        Case('govee.get_data_by_identifier', _govee_lookups, 5),
+        Case('smh.todos', _smh_todos),
+        Case('smh.assignment', _smh_assignment),
+        Case('smh.attachment', _smh_attachment)
+    ]
@@ -0,0 +1,104 @@
+""" Recorded responses the benchmarks are run against, so results do not depend on the network or on an upstream. The fixtures are recorded from `fake_upstream.py` with a fixed seed & stored
+gzipped in `benchmarks/fixtures/`; `python -m benchmarks.fixtures` records them again.
+
+---
+``` python
+with transport_scope(FixtureTransport(load_fixtures())):
+    ngr = GetPlaylistItems(BENCH_PLAYLIST_ID)
+    ngr.create_request()    # answered from `playlist_items.json.gz`
+
+```
+"""
+
+# Import internal modules
+from xenon.transport import Transport, Response
+
+# Import external modules
+from urllib.parse import urlsplit
+import gzip
+import json
+import os
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+BENCH_PLAYLIST_ID = 'benchplaylist0000000000'
+BENCH_ASSIGNMENT_ID = 50000000
+
+# name: (method, url, params, settings of `fake_upstream.FakeSettings()` while recording)
+FIXTURES = {
+    'playlist_items': ('GET', f"https://api.spotify.com/v1/playlists/{BENCH_PLAYLIST_ID}/tracks", {'limit': 100, 'offset': 0}, {}),
+    'saved_tracks': ('GET', 'https://api.spotify.com/v1/me/tracks', {'limit': 50, 'offset': 0}, {}),
+    'tracks': ('GET', 'https://api.spotify.com/v1/tracks', {'ids': ','.join(f"benchtrack{index:012d}" for index in range(50))}, {}),
+    'albums': ('GET', 'https://api.spotify.com/v1/albums', {'ids': ','.join(f"benchalbum{index:012d}" for index in range(20))}, {}),
+    'audio_features': ('GET', 'https://api.spotify.com/v1/audio-features', {'ids': ','.join(f"benchtrack{index:012d}" for index in range(100))}, {}),
+    'govee_devices': ('GET', 'https://developer-api.govee.com/v1/devices', {}, {'device_count': 200}),
+    'smh_todos': ('GET', 'https://api.satchelone.com/api/todos', {}, {'todo_count': 500}),
+    'smh_homework': ('GET', f"https://api.satchelone.com/api/homeworks/{BENCH_ASSIGNMENT_ID}", {}, {}),
+    'smh_attachments': ('GET', 'https://api.satchelone.com/api/attachments', {'ids': BENCH_ASSIGNMENT_ID * 100}, {})
+}
+
+class Fixture():
+    """ One recorded response. """
+
+    __slots__ = ('method', 'url', 'status_code', 'headers', 'content')
+
+    def __init__(self, method: str, url: str, status_code: int, headers: dict, content: bytes) -> None:
+        self.method: str = method
+        self.url: str = url
+        self.status_code: int = status_code
+        self.headers: dict = headers
+        self.content: bytes = content
+
+    def response(self) -> Response:
+        return Response(self.status_code, self.headers, self.content)
+
+def _fixture_path(name: str) -> str:
+    return os.path.join(FIXTURES_PATH, f"{name}.json.gz")
+
+def record() -> None:
+    """ Records every fixture in `FIXTURES` from the Flask app of `fake_upstream.py`. No server or network is needed. """
+    import fake_upstream
+
+    os.makedirs(FIXTURES_PATH, exist_ok=True)
+    client = fake_upstream.app.test_client()
+    defaults = fake_upstream.settings.to_dict()
+
+    for name, (method, url, params, settings) in FIXTURES.items():
+        fake_upstream.settings.update({**defaults, 'seed': 0, **settings})
+
+        parts = urlsplit(url)
+        r = client.open(f"{fake_upstream.HOSTS[parts.netloc]}{parts.path}", method=method, query_string=params, headers={'Govee-API-Key': 'bench'})
+        if r.status_code != 200:
+            raise RuntimeError(f"Recording '{name}' returned status code {r.status_code}.")
+
+        data = {'method': method, 'url': url, 'status_code': r.status_code, 'headers': {'Content-Type': r.headers['Content-Type']}, 'body': r.get_data(as_text=True)}
+        with gzip.open(_fixture_path(name), 'wt', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    fake_upstream.settings.update(defaults)
+
+def load_fixtures() -> dict:
+    """ Returns every recorded fixture as `{name: Fixture()}`. Raises `FileNotFoundError` if they have not been recorded. """
+    fixtures = {}
+    for name in FIXTURES:
+        with gzip.open(_fixture_path(name), 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        fixtures[name] = Fixture(data['method'], data['url'], data['status_code'], data['headers'], data['body'].encode('utf-8'))
+    return fixtures
+
+class FixtureTransport(Transport):
+    """ A `Transport()` which answers every request from the recorded fixtures instead of sending it, matching on the method & url. The parameters are ignored, so one fixture answers every page
+    of a collection. Everything above `_send()` (metrics, caching, the request classes) runs as it does in production. """
+
+    def __init__(self, fixtures: dict, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.fixtures: dict = {(fixture.method, fixture.url): fixture for fixture in fixtures.values()}
+
+    def _send(self, method: str, url: str, params: dict = None, headers: dict = None, data: str = None) -> Response:
+        fixture = self.fixtures.get((method, url))
+        if fixture is None:
+            raise KeyError(f"There is no fixture for {method} {url}.")
+        return fixture.response()
+
+if __name__ == '__main__':
+    record()
@@ -0,0 +1,140 @@
+""" Runs the benchmarks & compares them against the stored baseline. Each case is timed for at least `--min-time` seconds; the throughput, latency percentiles of one call & the peak memory
+allocated by one call (measured separately with `tracemalloc`, which would otherwise slow the timings) are reported.
+
+---
+``` bash
+python -m benchmarks.run --save              # records `benchmarks/baseline.json` on this machine
+python -m benchmarks.run                     # compares against it & exits with 1 if a case regressed
+python -m benchmarks.run -k smh --min-time 3
+
+```
+
+The baseline is only meaningful on the machine it was saved on, so save one before making a change & compare after it.
+"""
+
+# Import internal modules
+from benchmarks.fixtures import FixtureTransport, load_fixtures
+from benchmarks.cases import get_cases
+from xenon.spotify3.context import spotify_context
+
+# Import external modules
+import tracemalloc
+import platform
+import argparse
+import json
+import time
+import sys
+import os
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# The fraction a case may be slower or use more memory than the baseline before it counts as a regression
+DEFAULT_TOLERANCE = 0.15
+
+def _percentile(timings: list, q: float) -> float:
+    """ Returns the `q` percentile of the sorted `timings` (nearest rank). """
+    return timings[min(len(timings) - 1, max(0, int(round(q * len(timings))) - 1))]
+
+def measure(run: callable, ops: int, min_time: float = 1.0, min_iterations: int = 20, warmup: int = 5) -> dict:
+    """ Times `run()` & returns its results. Latencies are of one call of `run()`, in microseconds; the throughput is in operations per second. """
+    for _ in range(warmup):
+        run()
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_iterations or time.perf_counter() - started < min_time:
+        start = time.perf_counter_ns()
+        run()
+        timings.append(time.perf_counter_ns() - start)
+    total = sum(timings) / 1e9
+    timings.sort()
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': len(timings),
+        'ops_per_sec': len(timings) * ops / total,
+        'mean_us': total / len(timings) * 1e6,
+        'p50_us': _percentile(timings, 0.50) / 1e3,
+        'p95_us': _percentile(timings, 0.95) / 1e3,
+        'p99_us': _percentile(timings, 0.99) / 1e3,
+        'peak_kb': peak / 1024
+    }
+
+def compare(result: dict, baseline: dict | None, tolerance: float) -> str:
+    """ Returns how `result` compares to `baseline`: `'new'`, `'ok'`, `'faster'` or a description of the regression. The median latency & the peak memory are compared. """
+    if baseline is None:
+        return 'new'
+
+    regressions = []
+    if result['p50_us'] > baseline['p50_us'] * (1 + tolerance):
+        regressions.append(f"p50 +{(result['p50_us'] / baseline['p50_us'] - 1) * 100:.0f}%")
+    if result['peak_kb'] > baseline['peak_kb'] * (1 + tolerance) and result['peak_kb'] - baseline['peak_kb'] > 1:
+        regressions.append(f"memory +{(result['peak_kb'] / baseline['peak_kb'] - 1) * 100:.0f}%")
+    if regressions:
+        return 'REGRESSED ' + ', '.join(regressions)
+
+    if result['p50_us'] < baseline['p50_us'] * (1 - tolerance):
+        return f"faster {(1 - result['p50_us'] / baseline['p50_us']) * 100:.0f}%"
+    return 'ok'
+
+def load_baseline(fp: str = BASELINE_PATH) -> dict:
+    """ Returns the results of the baseline, or an empty dict if none has been saved. """
+    try:
+        with open(fp, 'r') as f:
+            return json.load(f)['results']
+    except FileNotFoundError:
+        return {}
+
+def save_baseline(results: dict, fp: str = BASELINE_PATH) -> None:
+    data = {
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()} ({platform.processor() or 'unknown cpu'})",
+        'saved_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results
+    }
+    with open(fp, 'w') as f:
+        json.dump(data, f, indent=4)
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks the hot paths of xenon against recorded fixtures.')
+    parser.add_argument('-k', '--filter', default='', help='Only run the cases whose name contains this.')
+    parser.add_argument('--min-time', type=float, default=1.0, help='The minimum number of seconds each case is timed for.')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='The fraction a case may regress by before it fails.')
+    parser.add_argument('--save', action='store_true', help='Stores the results as the new baseline.')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    fixtures = load_fixtures()
+    baseline = load_baseline(args.baseline)
+
+    results = {}
+    regressed = False
+    print(f"{'case':<36} {'ops/s':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'peak KiB':>10}  vs baseline")
+
+    with spotify_context(token='bench', transport=FixtureTransport(fixtures)):
+        for case in get_cases(fixtures):
+            if args.filter not in case.name:
+                continue
+
+            result = measure(case.setup(fixtures), case.ops, args.min_time)
+            results[case.name] = result
+
+            status = compare(result, baseline.get(case.name), args.tolerance)
+            regressed = regressed or status.startswith('REGRESSED')
+            print(f"{case.name:<36} {result['ops_per_sec']:>12,.0f} {result['p50_us']:>10.1f} {result['p95_us']:>10.1f} {result['p99_us']:>10.1f} {result['peak_kb']:>10.1f}  {status}")
+
+    if args.save:
+        save_baseline({**baseline, **results}, args.baseline)
+        print(f"Saved the baseline to {args.baseline}")
+        return 0
+    return 1 if regressed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
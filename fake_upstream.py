@@ -0,0 +1,705 @@
+""" A local stand-in for the Spotify, Govee & SatchelOne apis, so the request classes of `xenon.spotify3`, `xenon.govee` & `xenon.smh` can be run, benchmarked & load tested without credentials
+or network access. Payloads are generated from the ids in the request, so the same id always returns the same object, & the sizes of libraries, playlists & device lists are configurable.
+
+---
+``` bash
+python fake_upstream.py --port 5050 --latency 40 --jitter 20 --throttle-rate 0.02 --error-rate 0.01 --playlist-size 5000
+
+```
+``` python
+from fake_upstream import use_fake_upstream
+use_fake_upstream('http://127.0.0.1:5050')    # every request of the default transport now goes to the fake server
+
+```
+
+The faults can be changed while the server runs by sending json to `/_control` (e.g. `{"latency": 0, "throttle_rate": 0.5}`); `/_control/stats` returns the number of requests & injected faults.
+"""
+
+# Import internal modules
+from xenon.projection import Projection
+from xenon.spotify3.market_set import MARKETS
+from xenon.transport import configure_transport
+
+# Import external modules
+from flask import Flask, Blueprint, Response, abort, jsonify, request
+import threading
+import datetime
+import argparse
+import hashlib
+import random
+import string
+import time
+
+app = Flask(__name__)
+
+# The hosts served by this server & the prefix each is mounted at
+HOSTS = {
+    'api.spotify.com': '/spotify',
+    'accounts.spotify.com': '/accounts',
+    'developer-api.govee.com': '/govee',
+    'api.satchelone.com': '/satchelone'
+}
+
+SPOTIFY_URL = 'https://api.spotify.com/v1'
+
+GENRES = ('acoustic', 'alt-rock', 'ambient', 'blues', 'classical', 'country', 'dance', 'disco', 'drum-and-bass', 'dubstep', 'edm', 'electronic', 'folk', 'funk', 'garage', 'hip-hop', 'house',
+          'indie', 'jazz', 'k-pop', 'metal', 'pop', 'punk', 'r-n-b', 'reggae', 'rock', 'soul', 'synth-pop', 'techno', 'trance')
+WORDS = ('after', 'blue', 'city', 'dream', 'echo', 'fire', 'ghost', 'golden', 'heart', 'island', 'light', 'midnight', 'neon', 'ocean', 'paper', 'river', 'silver', 'summer', 'velvet', 'wild')
+
+class FakeSettings():
+    """ The sizes of the generated collections & the faults injected into every response. `throttle_rate` & `error_rate` are the chance of a request returning a 429 (with `Retry-After` set to
+    `retry_after` seconds) or a 5xx; `latency` & `jitter` are in milliseconds. """
+
+    def __init__(self) -> None:
+        self.latency: float = 0.0
+        self.jitter: float = 0.0
+        self.throttle_rate: float = 0.0
+        self.retry_after: int = 1
+        self.error_rate: float = 0.0
+        self.seed: int = 0
+
+        self.library_size: int = 2000
+        self.playlist_size: int = 500
+        self.playlist_count: int = 50
+        self.followed_count: int = 200
+        self.album_size: int = 14
+        self.show_size: int = 120
+        self.audiobook_size: int = 40
+        self.market_count: int = 80
+        self.device_count: int = 8
+        self.todo_count: int = 60
+
+    def update(self, values: dict) -> None:
+        for key in values:
+            if not hasattr(self, key):
+                raise ValueError(f"Parameter '{key}' returned an unknown setting.")
+
+        for key, value in values.items():
+            setattr(self, key, type(getattr(self, key))(value))
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+settings = FakeSettings()
+
+_stats = {'requests': 0, 'throttled': 0, 'errors': 0}
+_stats_lock = threading.Lock()
+
+def use_fake_upstream(base_url: str = 'http://127.0.0.1:5050', **kwargs) -> None:
+    """ Points the default transports at the fake server at `base_url`. Takes the other keyword arguments of `configure_transport()`. """
+    configure_transport(host_overrides={host: f"{base_url}{prefix}" for host, prefix in HOSTS.items()}, **kwargs)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+def _rng(*parts) -> random.Random:
+    """ Returns a random generator seeded by `parts`, so an object is generated the same way every time it is requested. """
+    digest = hashlib.sha1(':'.join(str(part) for part in (settings.seed,) + parts).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], 'big'))
+
+def _id(*parts) -> str:
+    """ Returns a 22 character base62 id derived from `parts`. """
+    rng = _rng('id', *parts)
+    return ''.join(rng.choice(string.ascii_letters + string.digits) for _ in range(22))
+
+def _name(rng: random.Random, words: int = 2) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).title()
+
+def _iso(rng: random.Random, start_year: int = 1970, end_year: int = 2024) -> str:
+    seconds = rng.randint(int(datetime.datetime(start_year, 1, 1).timestamp()), int(datetime.datetime(end_year, 12, 31).timestamp()))
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _images(rng: random.Random) -> list:
+    key = ''.join(rng.choice('0123456789abcdef') for _ in range(40))
+    return [{'url': f"https://i.scdn.co/image/{key}{size}", 'height': size, 'width': size} for size in (640, 300, 64)]
+
+def _markets(rng: random.Random) -> list:
+    return sorted(rng.sample(MARKETS, min(settings.market_count, len(MARKETS))))
+
+def _external(kind: str, id_: str) -> dict:
+    return {'spotify': f"https://open.spotify.com/{kind}/{id_}"}
+
+def _base(kind: str, id_: str) -> dict:
+    return {'external_urls': _external(kind, id_), 'href': f"{SPOTIFY_URL}/{kind}s/{id_}", 'id': id_, 'type': kind, 'uri': f"spotify:{kind}:{id_}"}
+
+def _availability(object_: dict, rng: random.Random) -> dict:
+    """ Adds `available_markets`, or `is_playable` if the request was for one market, as Spotify does. """
+    if request.args.get('market'):
+        object_['is_playable'] = rng.random() > 0.05
+    else:
+        object_['available_markets'] = _markets(rng)
+    return object_
+
+def _page(path: str, total: int, item: callable, default_limit: int = 20, max_limit: int = 50) -> dict:
+    """ Returns the offset based paging object of `path`, calling `item(index)` for each item on the page. """
+    limit = min(int(request.args.get('limit', default_limit)), max_limit)
+    offset = int(request.args.get('offset', 0))
+    items = [item(index) for index in range(offset, min(offset + limit, total))]
+
+    def url(at: int) -> str:
+        return f"{SPOTIFY_URL}{path}?offset={at}&limit={limit}"
+
+    return {
+        'href': url(offset),
+        'items': items,
+        'limit': limit,
+        'next': url(offset + limit) if offset + limit < total else None,
+        'offset': offset,
+        'previous': url(max(offset - limit, 0)) if offset > 0 else None,
+        'total': total
+    }
+
+def _cursor_page(path: str, total: int, item: callable, default_limit: int = 20) -> dict:
+    """ Returns the cursor based paging object of `path`. The cursor is the index of the next item. """
+    limit = min(int(request.args.get('limit', default_limit)), 50)
+    start = int(request.args.get('after') or 0)
+    items = [item(index) for index in range(start, min(start + limit, total))]
+    after = str(start + limit) if start + limit < total else None
+
+    return {
+        'href': f"{SPOTIFY_URL}{path}?limit={limit}",
+        'items': items,
+        'limit': limit,
+        'next': f"{SPOTIFY_URL}{path}?after={after}&limit={limit}" if after else None,
+        'cursors': {'after': after, 'before': str(start)},
+        'total': total
+    }
+
+def _ids() -> list:
+    return [id_ for id_ in request.args.get('ids', '').split(',') if id_]
+
+def _project(data: dict) -> Response:
+    """ Returns `data` as json, keeping only the `fields` of the request if it has any. """
+    fields = request.args.get('fields')
+    if fields:
+        data = Projection(fields).apply(data)
+    return jsonify(data)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+def simple_artist(artist_id: str) -> dict:
+    return {**_base('artist', artist_id), 'name': _name(_rng('artist', artist_id))}
+
+def artist(artist_id: str) -> dict:
+    rng = _rng('artist', artist_id)
+    return {
+        **simple_artist(artist_id),
+        'followers': {'href': None, 'total': rng.randint(0, 50_000_000)},
+        'genres': rng.sample(GENRES, rng.randint(0, 4)),
+        'images': _images(rng),
+        'popularity': rng.randint(0, 100)
+    }
+
+def album_track_ids(album_id: str) -> list:
+    return [_id('album-track', album_id, index) for index in range(settings.album_size)]
+
+def simple_album(album_id: str) -> dict:
+    rng = _rng('album', album_id)
+    return _availability({
+        **_base('album', album_id),
+        'album_type': rng.choice(('album', 'single', 'compilation')),
+        'artists': [simple_artist(_id('album-artist', album_id, index)) for index in range(rng.randint(1, 2))],
+        'images': _images(rng),
+        'name': _name(rng, 3),
+        'release_date': _iso(rng)[:10],
+        'release_date_precision': 'day',
+        'total_tracks': settings.album_size
+    }, rng)
+
+def album(album_id: str) -> dict:
+    rng = _rng('album', album_id)
+    return {
+        **simple_album(album_id),
+        'copyrights': [{'text': f"(C) {rng.randint(1970, 2024)} {_name(rng)} Records", 'type': 'C'}],
+        'external_ids': {'upc': str(rng.randint(10 ** 11, 10 ** 12 - 1))},
+        'genres': [],
+        'label': f"{_name(rng)} Records",
+        'popularity': rng.randint(0, 100),
+        'tracks': _page(f"/albums/{album_id}/tracks", settings.album_size, lambda index: simple_track(album_track_ids(album_id)[index], album_id, index))
+    }
+
+def simple_track(track_id: str, album_id: str = None, index: int = None) -> dict:
+    rng = _rng('track', track_id)
+    album_id = album_id or _id('track-album', track_id)
+    return _availability({
+        **_base('track', track_id),
+        'artists': simple_album(album_id)['artists'],
+        'disc_number': 1,
+        'duration_ms': rng.randint(90_000, 420_000),
+        'explicit': rng.random() < 0.15,
+        'is_local': False,
+        'name': _name(rng, rng.randint(1, 4)),
+        'preview_url': f"https://p.scdn.co/mp3-preview/{track_id}",
+        'track_number': (index if index is not None else rng.randint(0, settings.album_size - 1)) + 1
+    }, rng)
+
+def track(track_id: str) -> dict:
+    rng = _rng('track', track_id)
+    return {
+        **simple_track(track_id),
+        'album': simple_album(_id('track-album', track_id)),
+        'external_ids': {'isrc': f"GB{rng.randint(10 ** 9, 10 ** 10 - 1)}"},
+        'popularity': rng.randint(0, 100)
+    }
+
+def audio_features(track_id: str) -> dict:
+    rng = _rng('features', track_id)
+    return {
+        'acousticness': rng.random(), 'analysis_url': f"{SPOTIFY_URL}/audio-analysis/{track_id}", 'danceability': rng.random(), 'duration_ms': simple_track(track_id)['duration_ms'],
+        'energy': rng.random(), 'id': track_id, 'instrumentalness': rng.random() ** 3, 'key': rng.randint(-1, 11), 'liveness': rng.random() ** 2, 'loudness': rng.uniform(-30.0, 0.0),
+        'mode': rng.randint(0, 1), 'speechiness': rng.random() ** 2, 'tempo': rng.uniform(60.0, 200.0), 'time_signature': rng.choice((3, 4, 4, 4, 5)),
+        'track_href': f"{SPOTIFY_URL}/tracks/{track_id}", 'type': 'audio_features', 'uri': f"spotify:track:{track_id}", 'valence': rng.random()
+    }
+
+def simple_show(show_id: str) -> dict:
+    rng = _rng('show', show_id)
+    return _availability({
+        **_base('show', show_id),
+        'copyrights': [], 'description': _name(rng, 12), 'html_description': f"<p>{_name(rng, 12)}</p>", 'explicit': rng.random() < 0.2, 'images': _images(rng), 'is_externally_hosted': False,
+        'languages': ['en'], 'media_type': 'audio', 'name': _name(rng, 3), 'publisher': _name(rng), 'total_episodes': settings.show_size
+    }, rng)
+
+def show(show_id: str) -> dict:
+    return {**simple_show(show_id), 'episodes': _page(f"/shows/{show_id}/episodes", settings.show_size, lambda index: simple_episode(_id('show-episode', show_id, index)))}
+
+def simple_episode(episode_id: str) -> dict:
+    rng = _rng('episode', episode_id)
+    return {
+        **_base('episode', episode_id),
+        'audio_preview_url': f"https://p.scdn.co/mp3-preview/{episode_id}", 'description': _name(rng, 20), 'html_description': f"<p>{_name(rng, 20)}</p>",
+        'duration_ms': rng.randint(600_000, 7_200_000), 'explicit': rng.random() < 0.2, 'images': _images(rng), 'is_externally_hosted': False, 'is_playable': True, 'languages': ['en'],
+        'name': _name(rng, 4), 'release_date': _iso(rng, 2010)[:10], 'release_date_precision': 'day', 'resume_point': {'fully_played': False, 'resume_position_ms': 0}
+    }
+
+def episode(episode_id: str) -> dict:
+    return {**simple_episode(episode_id), 'show': simple_show(_id('episode-show', episode_id))}
+
+def simple_audiobook(audiobook_id: str) -> dict:
+    rng = _rng('audiobook', audiobook_id)
+    return _availability({
+        **_base('audiobook', audiobook_id),
+        'authors': [{'name': _name(rng)}], 'copyrights': [], 'description': _name(rng, 20), 'html_description': f"<p>{_name(rng, 20)}</p>", 'edition': 'Unabridged',
+        'explicit': False, 'images': _images(rng), 'languages': ['en'], 'media_type': 'audio', 'name': _name(rng, 3), 'narrators': [{'name': _name(rng)}], 'publisher': _name(rng),
+        'total_chapters': settings.audiobook_size
+    }, rng)
+
+def audiobook(audiobook_id: str) -> dict:
+    return {**simple_audiobook(audiobook_id), 'chapters': _page(f"/audiobooks/{audiobook_id}/chapters", settings.audiobook_size, lambda index: chapter(_id('audiobook-chapter', audiobook_id, index)))}
+
+def chapter(chapter_id: str) -> dict:
+    rng = _rng('chapter', chapter_id)
+    return _availability({
+        **_base('chapter', chapter_id),
+        'audio_preview_url': None, 'chapter_number': rng.randint(0, settings.audiobook_size - 1), 'description': _name(rng, 10), 'html_description': f"<p>{_name(rng, 10)}</p>",
+        'duration_ms': rng.randint(300_000, 3_600_000), 'explicit': False, 'images': _images(rng), 'languages': ['en'], 'name': _name(rng, 3), 'release_date': _iso(rng, 2015)[:10],
+        'release_date_precision': 'day', 'resume_point': {'fully_played': False, 'resume_position_ms': 0}
+    }, rng)
+
+def user(user_id: str) -> dict:
+    rng = _rng('user', user_id)
+    return {**_base('user', user_id), 'display_name': _name(rng), 'followers': {'href': None, 'total': rng.randint(0, 5000)}, 'images': _images(rng)[:1]}
+
+def simple_playlist(playlist_id: str) -> dict:
+    rng = _rng('playlist', playlist_id)
+    return {
+        **_base('playlist', playlist_id),
+        'collaborative': False, 'description': _name(rng, 6), 'images': _images(rng)[:1], 'name': _name(rng, 2), 'owner': user(_id('playlist-owner', playlist_id)), 'public': rng.random() < 0.7,
+        'snapshot_id': _id('snapshot', playlist_id, settings.playlist_size), 'tracks': {'href': f"{SPOTIFY_URL}/playlists/{playlist_id}/tracks", 'total': settings.playlist_size}
+    }
+
+def playlist_item(playlist_id: str, index: int) -> dict:
+    rng = _rng('playlist-item', playlist_id, index)
+    return {'added_at': _iso(rng, 2015), 'added_by': user(_id('playlist-owner', playlist_id)), 'is_local': False, 'track': track(_id('playlist-track', playlist_id, index))}
+
+def saved_track(index: int) -> dict:
+    # Newest first, as Spotify returns the library
+    added_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc) - datetime.timedelta(hours=index * 7)
+    return {'added_at': added_at.strftime('%Y-%m-%dT%H:%M:%SZ'), 'track': track(_id('library-track', index))}
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+spotify = Blueprint('spotify', __name__, url_prefix=HOSTS['api.spotify.com'])
+
+@spotify.route('/v1/<kind>')
+def several(kind: str):
+    """ The `?ids=` endpoints which return several objects of one kind. """
+    objects = {'tracks': track, 'albums': album, 'artists': artist, 'shows': simple_show, 'episodes': episode, 'audiobooks': simple_audiobook, 'chapters': chapter, 'audio-features': audio_features}
+    if kind not in objects:
+        abort(404)
+
+    key = 'audio_features' if kind == 'audio-features' else kind
+    return jsonify({key: [objects[kind](id_) for id_ in _ids()]})
+
+@spotify.route('/v1/<kind>/<object_id>')
+def single(kind: str, object_id: str):
+    objects = {'tracks': track, 'albums': album, 'artists': artist, 'shows': show, 'episodes': episode, 'audiobooks': audiobook, 'chapters': chapter, 'audio-features': audio_features,
+               'users': user}
+    if kind not in objects:
+        abort(404)
+    return _project(objects[kind](object_id))
+
+@spotify.route('/v1/albums/<album_id>/tracks')
+def album_tracks(album_id: str):
+    return jsonify(album(album_id)['tracks'])
+
+@spotify.route('/v1/artists/<artist_id>/albums')
+def artist_albums(artist_id: str):
+    return jsonify(_page(f"/artists/{artist_id}/albums", _rng('artist', artist_id).randint(5, 60), lambda index: simple_album(_id('artist-album', artist_id, index))))
+
+@spotify.route('/v1/artists/<artist_id>/top-tracks')
+def artist_top_tracks(artist_id: str):
+    return jsonify({'tracks': [track(_id('artist-top', artist_id, index)) for index in range(10)]})
+
+@spotify.route('/v1/artists/<artist_id>/related-artists')
+def related_artists(artist_id: str):
+    return jsonify({'artists': [artist(_id('related', artist_id, index)) for index in range(20)]})
+
+@spotify.route('/v1/shows/<show_id>/episodes')
+def show_episodes(show_id: str):
+    return jsonify(show(show_id)['episodes'])
+
+@spotify.route('/v1/audiobooks/<audiobook_id>/chapters')
+def audiobook_chapters(audiobook_id: str):
+    return jsonify(audiobook(audiobook_id)['chapters'])
+
+@spotify.route('/v1/recommendations')
+def recommendations():
+    seeds = ','.join(request.args.get(key, '') for key in ('seed_artists', 'seed_genres', 'seed_tracks'))
+    limit = min(int(request.args.get('limit', 20)), 100)
+    return jsonify({'seeds': [], 'tracks': [track(_id('recommendation', seeds, index)) for index in range(limit)]})
+
+@spotify.route('/v1/recommendations/available-genre-seeds')
+def genre_seeds():
+    return jsonify({'genres': list(GENRES)})
+
+@spotify.route('/v1/markets')
+def markets():
+    return jsonify({'markets': list(MARKETS)})
+
+@spotify.route('/v1/search')
+def search():
+    query = request.args.get('q', '')
+    objects = {'track': track, 'album': simple_album, 'artist': artist, 'playlist': simple_playlist, 'show': simple_show, 'episode': simple_episode, 'audiobook': simple_audiobook}
+
+    result = {}
+    for kind in request.args.get('type', 'track').split(','):
+        if kind in objects:
+            result[f"{kind}s"] = _page('/search', 1000, lambda index, kind=kind: objects[kind](_id('search', kind, query, index)))
+    return jsonify(result)
+
+@spotify.route('/v1/browse/new-releases')
+def new_releases():
+    return jsonify({'albums': _page('/browse/new-releases', 100, lambda index: simple_album(_id('new-release', index)))})
+
+@spotify.route('/v1/browse/featured-playlists')
+def featured_playlists():
+    return jsonify({'message': 'Popular playlists', 'playlists': _page('/browse/featured-playlists', 50, lambda index: simple_playlist(_id('featured', index)))})
+
+@spotify.route('/v1/browse/categories')
+def categories():
+    return jsonify({'categories': _page('/browse/categories', len(GENRES), lambda index: category_object(GENRES[index]))})
+
+def category_object(category_id: str) -> dict:
+    return {'href': f"{SPOTIFY_URL}/browse/categories/{category_id}", 'icons': _images(_rng('category', category_id))[:1], 'id': category_id, 'name': category_id.title()}
+
+@spotify.route('/v1/browse/categories/<category_id>')
+def category(category_id: str):
+    return jsonify(category_object(category_id))
+
+@spotify.route('/v1/browse/categories/<category_id>/playlists')
+def category_playlists(category_id: str):
+    return jsonify({'message': category_id.title(), 'playlists': _page(f"/browse/categories/{category_id}/playlists", 50, lambda index: simple_playlist(_id('category', category_id, index)))})
+
+@spotify.route('/v1/playlists/<playlist_id>')
+def playlist(playlist_id: str):
+    data = simple_playlist(playlist_id)
+    data['followers'] = {'href': None, 'total': _rng('playlist', playlist_id).randint(0, 100_000)}
+    data['tracks'] = _page(f"/playlists/{playlist_id}/tracks", settings.playlist_size, lambda index: playlist_item(playlist_id, index), 100, 100)
+    return _project(data)
+
+@spotify.route('/v1/playlists/<playlist_id>/tracks')
+def playlist_items(playlist_id: str):
+    return _project(_page(f"/playlists/{playlist_id}/tracks", settings.playlist_size, lambda index: playlist_item(playlist_id, index), 100, 100))
+
+@spotify.route('/v1/playlists/<playlist_id>/tracks', methods=['POST', 'PUT', 'DELETE'])
+@spotify.route('/v1/playlists/<playlist_id>', methods=['PUT'])
+def modify_playlist(playlist_id: str):
+    return jsonify({'snapshot_id': _id('snapshot', playlist_id, time.time())})
+
+@spotify.route('/v1/playlists/<playlist_id>/images', methods=['GET', 'PUT'])
+def playlist_images(playlist_id: str):
+    if request.method == 'PUT':
+        return Response(status=202)
+    return jsonify(_images(_rng('playlist', playlist_id))[:1])
+
+@spotify.route('/v1/users/<user_id>/playlists', methods=['GET', 'POST'])
+def user_playlists(user_id: str):
+    if request.method == 'POST':
+        return jsonify(simple_playlist(_id('created', user_id, time.time()))), 201
+    return jsonify(_page(f"/users/{user_id}/playlists", settings.playlist_count, lambda index: simple_playlist(_id('user-playlist', user_id, index))))
+
+@spotify.route('/v1/playlists/<playlist_id>/followers', methods=['PUT', 'DELETE'])
+def follow_playlist(playlist_id: str):
+    return Response(status=200)
+
+# The current user
+
+@spotify.route('/v1/me')
+def me():
+    return jsonify({**user('fake-user'), 'country': 'GB', 'email': 'fake-user@example.com', 'explicit_content': {'filter_enabled': False, 'filter_locked': False}, 'product': 'premium'})
+
+@spotify.route('/v1/me/top/<type_>')
+def top_items(type_: str):
+    objects = {'tracks': track, 'artists': artist}
+    if type_ not in objects:
+        abort(404)
+
+    time_range = request.args.get('time_range', 'medium_term')
+    return jsonify(_page(f"/me/top/{type_}", 50, lambda index: objects[type_](_id('top', type_, time_range, index))))
+
+@spotify.route('/v1/me/tracks')
+def saved_tracks():
+    return _project(_page('/me/tracks', settings.library_size, saved_track))
+
+@spotify.route('/v1/me/<kind>')
+def saved_items(kind: str):
+    objects = {'albums': album, 'shows': simple_show, 'episodes': episode, 'audiobooks': simple_audiobook}
+    if kind not in objects:
+        abort(404)
+
+    key = kind[:-1]
+    if kind == 'audiobooks':
+        # Saved audiobooks are returned as they are, without an `added_at`
+        return jsonify(_page(f"/me/{kind}", settings.library_size // 20, lambda index: objects[kind](_id('saved', kind, index))))
+    return jsonify(_page(f"/me/{kind}", settings.library_size // 20, lambda index: {'added_at': _iso(_rng('saved', kind, index), 2015), key: objects[kind](_id('saved', kind, index))}))
+
+@spotify.route('/v1/me/<kind>', methods=['PUT', 'DELETE'])
+def save_items(kind: str):
+    return Response(status=200)
+
+@spotify.route('/v1/me/<kind>/contains')
+@spotify.route('/v1/me/following/contains')
+@spotify.route('/v1/following/contains')
+def contains(kind: str = None):
+    return jsonify([_rng('contains', id_).random() < 0.5 for id_ in _ids()])
+
+@spotify.route('/v1/me/following')
+def following():
+    return jsonify({'artists': _cursor_page('/me/following', settings.followed_count, lambda index: artist(_id('followed', index)))})
+
+@spotify.route('/v1/me/following', methods=['PUT', 'DELETE'])
+def follow():
+    return Response(status=204)
+
+@spotify.route('/v1/me/playlists')
+def my_playlists():
+    return jsonify(_page('/me/playlists', settings.playlist_count, lambda index: simple_playlist(_id('my-playlist', index))))
+
+# The player
+
+def device(index: int) -> dict:
+    rng = _rng('device', index)
+    return {'id': _id('device', index), 'is_active': index == 0, 'is_private_session': False, 'is_restricted': False, 'name': f"{_name(rng)} Speaker", 'type': 'Speaker',
+            'volume_percent': rng.randint(0, 100), 'supports_volume': True}
+
+@spotify.route('/v1/me/player')
+def playback_state():
+    current = track(_id('now-playing', int(time.time() // 180)))
+    return jsonify({'device': device(0), 'repeat_state': 'off', 'shuffle_state': False, 'context': None, 'timestamp': int(time.time() * 1000),
+                    'progress_ms': int(time.time() * 1000) % current['duration_ms'], 'is_playing': True, 'item': current, 'currently_playing_type': 'track',
+                    'actions': {'disallows': {'resuming': True}}})
+
+@spotify.route('/v1/me/player/devices')
+@spotify.route('/v1/me/players/devices')
+def devices():
+    return jsonify({'devices': [device(index) for index in range(3)]})
+
+@spotify.route('/v1/me/player/queue')
+def queue():
+    return jsonify({'currently_playing': track(_id('now-playing', int(time.time() // 180))), 'queue': [track(_id('queue', index)) for index in range(20)]})
+
+@spotify.route('/v1/me/player/recently-played')
+def recently_played():
+    return jsonify(_cursor_page('/me/player/recently-played', 50, lambda index: {'track': track(_id('recent', index)), 'played_at': _iso(_rng('recent', index), 2023), 'context': None}))
+
+@spotify.route('/v1/me/player', methods=['PUT'])
+@spotify.route('/v1/me/player/<action>', methods=['PUT', 'POST'])
+def player_action(action: str = None):
+    return Response(status=204)
+
+# Authorization
+
+accounts = Blueprint('accounts', __name__, url_prefix=HOSTS['accounts.spotify.com'])
+
+@accounts.route('/api/token', methods=['POST'])
+def token():
+    if request.form.get('grant_type') not in ('authorization_code', 'refresh_token'):
+        return jsonify({'error': 'unsupported_grant_type'}), 400
+
+    data = {'access_token': _id('access', time.time()), 'token_type': 'Bearer', 'expires_in': 3600, 'scope': ''}
+    if request.form.get('grant_type') == 'authorization_code':
+        data['refresh_token'] = _id('refresh', time.time())
+    return jsonify(data)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+govee = Blueprint('govee', __name__, url_prefix=HOSTS['developer-api.govee.com'])
+
+GOVEE_MODELS = ('H6159', 'H6163', 'H6199', 'H6054', 'H6076', 'H7021')
+
+def govee_device(index: int) -> dict:
+    rng = _rng('govee', index)
+    return {
+        'device': ':'.join(f"{rng.randint(0, 255):02X}" for _ in range(8)),
+        'model': rng.choice(GOVEE_MODELS),
+        'deviceName': f"{_name(rng, 1)} Light {index + 1}",
+        'controllable': True,
+        'retrievable': rng.random() < 0.8,
+        'supportCmds': ['turn', 'brightness', 'color', 'colorTem'],
+        'properties': {'colorTem': {'range': {'min': 2000, 'max': 9000}}}
+    }
+
+@govee.route('/v1/devices')
+def govee_devices():
+    if not request.headers.get('Govee-API-Key'):
+        return jsonify({'code': 401, 'message': 'Missing API key'}), 401
+    return jsonify({'data': {'devices': [govee_device(index) for index in range(settings.device_count)]}, 'message': 'Success', 'code': 200})
+
+@govee.route('/v1/devices/control', methods=['PUT'])
+def govee_control():
+    payload = request.get_json(silent=True) or {}
+    if not payload.get('device') or not (payload.get('cmd') or {}).get('name'):
+        return jsonify({'code': 400, 'message': 'Invalid cmd', 'data': {}}), 400
+    return jsonify({'code': 200, 'message': 'Success', 'data': {}})
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+satchelone = Blueprint('satchelone', __name__, url_prefix=HOSTS['api.satchelone.com'])
+
+SUBJECTS = ('Maths', 'English', 'Physics', 'Chemistry', 'Biology', 'History', 'Geography', 'Computer Science', 'French', 'Art')
+
+def todo(index: int) -> dict:
+    rng = _rng('todo', index)
+    return {'id': 10_000_000 + index, 'class_task_id': 50_000_000 + index, 'class_task_type': 'Homework', 'class_task_title': _name(rng, 3), 'completed': rng.random() < 0.6,
+            'due_on': _iso(rng, 2024, 2024), 'subject': rng.choice(SUBJECTS), 'teacher_name': f"Mx {_name(rng, 1)}"}
+
+@satchelone.route('/api/todos')
+def todos():
+    return jsonify([todo(index) for index in range(settings.todo_count)])
+
+@satchelone.route('/api/homeworks/<int:assignment_id>')
+def homework(assignment_id: int):
+    rng = _rng('homework', assignment_id)
+    issued, due = sorted((_iso(rng, 2024, 2024), _iso(rng, 2024, 2024)))
+    occurrences = [{'id': assignment_id * 10 + index, 'starts_at': (issued, due)[index], 'ends_at': (issued, due)[index]} for index in range(2)]
+    return jsonify({
+        'homework': {
+            'id': assignment_id, 'teacher_name': f"Mx {_name(rng, 1)}", 'title': _name(rng, 3), 'subject': rng.choice(SUBJECTS), 'due_on': due, 'issued_at': issued, 'updated_at': issued,
+            'class_group_name': f"{rng.randint(7, 13)}{rng.choice('ABCDEF')}", 'class_group_id': rng.randint(1000, 9999), 'description': _name(rng, 40), 'duration': rng.choice((20, 30, 45, 60)),
+            'duration_units': 'minutes', 'attachment_ids': [assignment_id * 100 + index for index in range(rng.randint(0, 3))], 'web_links': [],
+            'issued_on_lesson_occurrence_id': occurrences[0]['id'], 'due_on_lesson_occurrence_id': occurrences[1]['id']
+        },
+        'lesson_occurrences': occurrences
+    })
+
+@satchelone.route('/api/attachments')
+def attachments():
+    result = []
+    for attachment_id in _ids():
+        rng = _rng('attachment', attachment_id)
+        created = _iso(rng, 2024, 2024)
+        result.append({'id': int(attachment_id), 'content_type': 'application/pdf', 'filename': f"{_name(rng, 2).replace(' ', '_')}.pdf", 'file_size': rng.randint(10_000, 5_000_000),
+                       'file_url': f"https://files.satchelone.com/{attachment_id}.pdf", 'created_at': created, 'updated_at': created})
+    return jsonify({'attachments': result})
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+@app.before_request
+def inject_faults():
+    """ Delays the request by `settings.latency` (+/- `settings.jitter`) milliseconds, then fails it with a 429 or 5xx at the configured rates. """
+    if request.path.startswith('/_control'):
+        return None
+
+    with _stats_lock:
+        _stats['requests'] += 1
+
+    if settings.latency or settings.jitter:
+        time.sleep(max(0.0, settings.latency + random.uniform(-settings.jitter, settings.jitter)) / 1000)
+
+    roll = random.random()
+    if roll < settings.throttle_rate:
+        with _stats_lock:
+            _stats['throttled'] += 1
+        response = jsonify({'error': {'status': 429, 'message': 'API rate limit exceeded'}})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(settings.retry_after)
+        return response
+
+    if roll < settings.throttle_rate + settings.error_rate:
+        with _stats_lock:
+            _stats['errors'] += 1
+        status = random.choice((500, 502, 503))
+        return jsonify({'error': {'status': status, 'message': 'Server error'}}), status
+    return None
+
+@app.errorhandler(404)
+def not_found(e):
+    return jsonify({'error': {'status': 404, 'message': 'Service not found'}}), 404
+
+@app.route('/_control', methods=['GET', 'POST'])
+def control():
+    """ Returns the settings, after updating them with the json of a POST. """
+    if request.method == 'POST':
+        try:
+            settings.update(request.get_json(force=True) or {})
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+    return jsonify(settings.to_dict())
+
+@app.route('/_control/stats', methods=['GET', 'DELETE'])
+def control_stats():
+    with _stats_lock:
+        if request.method == 'DELETE':
+            _stats.update({key: 0 for key in _stats})
+        return jsonify(dict(_stats))
+
+app.register_blueprint(spotify)
+app.register_blueprint(accounts)
+app.register_blueprint(govee)
+app.register_blueprint(satchelone)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local stand-in for the Spotify, Govee & SatchelOne apis.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5050)
+    for key, value in settings.to_dict().items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+
+    args = vars(parser.parse_args())
+    host, port = args.pop('host'), args.pop('port')
+    settings.update(args)
+
+    app.run(host=host, port=port, threaded=True)
@@ -0,0 +1,137 @@
+""" Replays a recorded session (see `xenon.cassettes`) against the Flask app at N times its original speed. The requests the app received are sent again at their recorded offsets divided by
+`--speed`, & the upstream requests they make are answered from the same cassette with their latency divided by `--speed`, so the shape of the traffic is kept without reaching an upstream.
+
+---
+``` bash
+python load_driver.py instance/session.cassette --speed 4                               # in process, through the app's test client
+python load_driver.py instance/session.cassette --speed 4 --url http://127.0.0.1:5000   # against a running server started with `cassette_mode = replay`
+
+```
+
+A cassette recorded outside the app (e.g. from a script using the request classes) has no app requests; its upstream requests are then replayed through `xenon.transport` directly.
+"""
+
+# Import internal modules
+from xenon.cassettes import Cassette, CASSETTE_FILE_PATH
+from xenon.transport import get_transport, get_async_transport
+
+# Import external modules
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import argparse
+import requests
+import time
+
+def _percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(q * len(values))) - 1))] if values else 0.0
+
+class LoadDriver():
+    """ Sends `calls` (`(offset, callable)` pairs, where the callable returns a status code) at `offset / speed` seconds after the start, on up to `workers` threads, & collects the results. """
+
+    def __init__(self, calls: list, speed: float = 1.0, workers: int = 32) -> None:
+        self.calls: list = sorted(calls, key=lambda call: call[0])
+        self.speed: float = speed
+        self.workers: int = workers
+
+        self.latencies: list = []
+        self.lateness: list = []
+        self.statuses: dict = {}
+        self._lock = threading.Lock()
+
+    def _send(self, scheduled: float, call: callable) -> None:
+        started = time.monotonic()
+        try:
+            status = call()
+        except Exception as e:
+            status = type(e).__name__
+        finished = time.monotonic()
+
+        with self._lock:
+            self.latencies.append(finished - started)
+            self.lateness.append(started - scheduled)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def run(self) -> dict:
+        """ Sends every call & returns a summary of the run. """
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for offset, call in self.calls:
+                scheduled = started + offset / self.speed
+                wait = scheduled - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                executor.submit(self._send, scheduled, call)
+        duration = time.monotonic() - started
+
+        return {
+            'requests': len(self.calls),
+            'duration': duration,
+            'rate': len(self.calls) / duration if duration else 0.0,
+            'p50': _percentile(self.latencies, 0.50),
+            'p95': _percentile(self.latencies, 0.95),
+            'p99': _percentile(self.latencies, 0.99),
+            'lateness_p99': _percentile(self.lateness, 0.99),
+            'statuses': dict(sorted(self.statuses.items(), key=lambda item: str(item[0])))
+        }
+
+def _app_calls(cassette: Cassette, url: str = None) -> list:
+    """ Returns the calls which replay the app requests of `cassette`, through the test client of `app.py` or to the server at `url`. """
+    if url is not None:
+        session = requests.Session()
+
+        def call(inbound) -> callable:
+            return lambda: session.request(inbound.method, f"{url.rstrip('/')}{inbound.path}?{inbound.query}", data=inbound.body or None).status_code
+    else:
+        from app import app
+
+        def call(inbound) -> callable:
+            return lambda: app.test_client().open(inbound.path, method=inbound.method, query_string=inbound.query, data=inbound.body or None).status_code
+
+    return [(inbound.offset, call(inbound)) for inbound in cassette.inbound]
+
+def _upstream_calls(cassette: Cassette) -> list:
+    """ Returns the calls which replay the upstream requests of `cassette` through the default transport. """
+    transport = get_transport()
+
+    def call(interaction) -> callable:
+        return lambda: transport.request(interaction.method, interaction.url, params=dict(interaction.params), endpoint='LoadDriver').status_code
+
+    # Interactions are recorded when they finish, so they are sent `elapsed` earlier to start when they originally did
+    return [(max(0.0, interaction.offset - interaction.elapsed), call(interaction)) for interaction in cassette.interactions]
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description='Replays a recorded session against the Flask app.')
+    parser.add_argument('cassette', nargs='?', default=CASSETTE_FILE_PATH)
+    parser.add_argument('--speed', type=float, default=1.0, help='How many times faster than it was recorded the session is replayed.')
+    parser.add_argument('--url', default=None, help='The base url of a running server. The app is run in process if this is not given.')
+    parser.add_argument('--workers', type=int, default=32)
+    args = parser.parse_args(argv)
+
+    if args.speed <= 0:
+        parser.error('--speed must be more than 0')
+
+    cassette = Cassette.load(args.cassette, args.speed)
+    if cassette.inbound:
+        calls = _app_calls(cassette, args.url)
+        print(f"Replaying {len(calls)} app requests over {cassette.duration / args.speed:.1f}s ({args.speed:g}x)")
+    else:
+        calls = _upstream_calls(cassette)
+        print(f"The cassette has no app requests, replaying {len(calls)} upstream requests over {cassette.duration / args.speed:.1f}s ({args.speed:g}x)")
+
+    if args.url is None:
+        # Set after `app.py` is imported, so the upstream requests of the app are answered from this cassette whatever the server settings say
+        get_transport().cassette = cassette
+        get_async_transport().cassette = cassette
+
+    summary = LoadDriver(calls, args.speed, args.workers).run()
+    print(f"Sent {summary['requests']} requests in {summary['duration']:.2f}s ({summary['rate']:.1f}/s)")
+    print(f"Latency p50 {summary['p50'] * 1000:.1f}ms, p95 {summary['p95'] * 1000:.1f}ms, p99 {summary['p99'] * 1000:.1f}ms; p99 start lateness {summary['lateness_p99'] * 1000:.1f}ms")
+    print(f"Status codes: {summary['statuses']}")
+
+    if args.url is None:
+        for endpoint, quantiles in get_transport().metrics.quantiles().items():
+            print(f"  {endpoint}: {quantiles}")
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 
+from fake_upstream import use_fake_upstream
 from xenon.spotify import Album, Artist, Show, Episode, Audiobook, Chapter, Track, SearchItem, User
 from xenon.spotify import ArtistsRequests as ar_r
 from xenon.spotify import AlbumRequests as al_r
@@ -12,6 +13,9 @@ from xenon.spotify import UsersRequests as us_r
 
 import json
 
+# Requests are sent to the local stand-in server (`python fake_upstream.py`) rather than the live apis
+use_fake_upstream('http://127.0.0.1:5050')
+
 # ALBUM: 2cWBwpqMsDJC1ZUwz813lo
 # ARTIST: 7dGJo4pcD2V6oG8kP0tJRR
 # SHOW: 0ofXAdFIQQRsCYj9754UFx
@@ -0,0 +1,8 @@
+# Import external modules
+import tempfile
+import os
+
+# `xenon.loggers` opens its log files under `instance/logs/` of the working directory when it is imported, so the tests run from a scratch directory rather than the repository
+_WORKING_DIRECTORY = tempfile.mkdtemp(prefix='xenon-tests-')
+os.makedirs(os.path.join(_WORKING_DIRECTORY, 'instance', 'logs'), exist_ok=True)
+os.chdir(_WORKING_DIRECTORY)
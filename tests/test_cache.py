@@ -0,0 +1,172 @@
+# Import internal modules
+from xenon.cache import ResponseCache, CacheEntry, cache_scope
+
+# Import external modules
+import time
+
+TRACK_URL = 'https://api.spotify.com/v1/tracks/abc'
+SAVED_TRACKS_URL = 'https://api.spotify.com/v1/me/tracks'
+
+def _entry(content: bytes = b'{}', etag: str = None, ttl: float = 60.0) -> CacheEntry:
+    return CacheEntry(200, {'Content-Type': 'application/json'}, content, etag, time.time() + ttl)
+
+def _cache(**kwargs) -> ResponseCache:
+    return ResponseCache(ttls=[(r'^https://api\.spotify\.com/', 60)], **kwargs)
+
+def test_least_recently_used_entry_is_evicted_first() -> None:
+    cache = _cache(max_entries=2)
+    cache.put('a', _entry())
+    cache.put('b', _entry())
+    cache.get('a')
+    cache.put('c', _entry())
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+    assert cache.stats.evictions == 1
+
+def test_entries_are_evicted_to_stay_within_max_bytes() -> None:
+    size = _entry(b'x' * 100).size
+    cache = _cache(max_bytes=size * 3)
+    for key in 'abcd':
+        cache.put(key, _entry(b'x' * 100))
+
+    assert len(cache) == 3
+    assert cache.size == size * 3
+    assert cache.get('a') is None
+
+def test_entry_larger_than_the_cache_is_not_kept() -> None:
+    cache = _cache(max_bytes=10)
+    cache.put('a', _entry(b'x' * 100))
+
+    assert len(cache) == 0
+    assert cache.size == 0
+
+def test_replacing_an_entry_keeps_the_size_right() -> None:
+    cache = _cache()
+    cache.put('a', _entry(b'x' * 100))
+    cache.put('a', _entry(b'x' * 10))
+
+    assert cache.size == _entry(b'x' * 10).size
+
+def test_urls_without_a_ttl_are_not_cacheable() -> None:
+    cache = _cache()
+
+    assert cache.prepare('GET', 'https://developer-api.govee.com/v1/devices', None, {})[0] is None
+    assert cache.prepare('PUT', TRACK_URL, None, {})[0] is None
+
+def test_fresh_entry_is_returned_without_revalidation() -> None:
+    cache = _cache()
+    key, entry, ttl, headers = cache.prepare('GET', TRACK_URL, {'market': 'GB'}, {})
+    assert entry is None
+    cache.complete(key, entry, ttl, 200, {'ETag': '"v1"'}, b'{"id":"abc"}')
+
+    _, entry, _, headers = cache.prepare('GET', TRACK_URL, {'market': 'GB'}, {})
+    assert entry.content == b'{"id":"abc"}'
+    assert entry.is_fresh
+    assert 'If-None-Match' not in headers
+
+def test_stale_entry_is_revalidated_with_its_etag() -> None:
+    cache = _cache()
+    key = cache.key(TRACK_URL)
+    cache.put(key, _entry(b'{"id":"abc"}', etag='"v1"', ttl=-1))
+
+    key, entry, ttl, headers = cache.prepare('GET', TRACK_URL, None, {'Authorization': 'Bearer token'})
+    assert headers == {'Authorization': 'Bearer token', 'If-None-Match': '"v1"'}
+
+    revalidated = cache.complete(key, entry, ttl, 304, {}, b'')
+    assert revalidated.content == b'{"id":"abc"}'
+    assert revalidated.is_fresh
+    assert cache.stats.revalidations == 1
+    assert cache.stats.misses == 0
+
+def test_changed_response_replaces_a_stale_entry() -> None:
+    cache = _cache()
+    key = cache.key(TRACK_URL)
+    cache.put(key, _entry(b'{"v":1}', etag='"v1"', ttl=-1))
+
+    key, entry, ttl, _ = cache.prepare('GET', TRACK_URL, None, {})
+    assert cache.complete(key, entry, ttl, 200, {'ETag': '"v2"'}, b'{"v":2}') is None
+
+    stored = cache.get(key)
+    assert stored.content == b'{"v":2}'
+    assert stored.etag == '"v2"'
+    assert cache.stats.misses == 1
+
+def test_stale_entry_without_an_etag_is_refetched() -> None:
+    cache = _cache()
+    cache.put(cache.key(TRACK_URL), _entry(ttl=-1))
+
+    _, entry, _, headers = cache.prepare('GET', TRACK_URL, None, {})
+    assert entry is None
+    assert 'If-None-Match' not in headers
+
+def test_no_store_responses_are_not_cached() -> None:
+    cache = _cache()
+    key, entry, ttl, _ = cache.prepare('GET', TRACK_URL, None, {})
+    cache.complete(key, entry, ttl, 200, {'Cache-Control': 'no-store'}, b'{}')
+
+    assert cache.get(key) is None
+
+def test_catalog_responses_are_shared_between_users() -> None:
+    cache = _cache()
+    with cache_scope('user:1'):
+        first = cache.key(TRACK_URL, {'market': 'GB'})
+    with cache_scope('user:2'):
+        second = cache.key(TRACK_URL, {'market': 'GB'})
+
+    assert first == second
+
+def test_user_responses_are_scoped_by_user_not_token() -> None:
+    cache = _cache()
+    with cache_scope('user:1'):
+        first = cache.key(SAVED_TRACKS_URL)
+        assert cache.key(SAVED_TRACKS_URL) == first
+        assert cache.key(TRACK_URL, {'market': 'from_token'}) != cache.key(TRACK_URL)
+    with cache_scope('user:2'):
+        second = cache.key(SAVED_TRACKS_URL)
+
+    assert first != second
+    assert 'user:1' not in first
+
+def test_backend_is_read_on_a_miss_and_written_on_store() -> None:
+    class Backend():
+        def __init__(self) -> None:
+            self.entries = {}
+
+        def get(self, key: str) -> CacheEntry | None:
+            return self.entries.get(key)
+
+        def put(self, key: str, entry: CacheEntry) -> None:
+            self.entries[key] = entry
+
+    backend = Backend()
+    cache = _cache(backend=backend)
+    key, entry, ttl, _ = cache.prepare('GET', TRACK_URL, None, {})
+    cache.complete(key, entry, ttl, 200, {}, b'{"id":"abc"}')
+    assert key in backend.entries
+
+    restarted = _cache(backend=backend)
+    _, entry, _, _ = restarted.prepare('GET', TRACK_URL, None, {})
+    assert entry.content == b'{"id":"abc"}'
+    assert len(restarted) == 1
+
+def test_user_responses_outside_a_scope_are_scoped_by_authorization() -> None:
+    cache = _cache()
+    first = cache.key(SAVED_TRACKS_URL, None, {'Authorization': 'Bearer one'})
+    second = cache.key(SAVED_TRACKS_URL, None, {'Authorization': 'Bearer two'})
+
+    assert first != second
+    assert 'Bearer' not in first
+    assert cache.key(TRACK_URL, None, {'Authorization': 'Bearer one'}) == cache.key(TRACK_URL, None, {'Authorization': 'Bearer two'})
+
+    with cache_scope('user:1'):
+        assert cache.key(SAVED_TRACKS_URL, None, {'Authorization': 'Bearer one'}) == cache.key(SAVED_TRACKS_URL, None, {'Authorization': 'Bearer refreshed'})
+
+def test_users_outside_a_scope_do_not_share_responses() -> None:
+    cache = _cache()
+    key, entry, ttl, _ = cache.prepare('GET', SAVED_TRACKS_URL, None, {'Authorization': 'Bearer one'})
+    cache.complete(key, entry, ttl, 200, {}, b'{"items":["one"]}')
+
+    assert cache.prepare('GET', SAVED_TRACKS_URL, None, {'Authorization': 'Bearer two'})[1] is None
+    assert cache.prepare('GET', SAVED_TRACKS_URL, None, {'Authorization': 'Bearer one'})[1] is not None
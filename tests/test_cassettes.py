@@ -0,0 +1,75 @@
+# Import internal modules
+from xenon.cassettes import Cassette, REDACTED, configure_cassette, stop_cassette, redact
+from xenon.transport import Response
+
+# Import external modules
+from flask import Flask
+import gzip
+import pytest
+
+TOKEN_URL = 'https://accounts.spotify.com/api/token'
+TOKEN_BODY = b'{"access_token":"live-access","token_type":"Bearer","refresh_token":"live-refresh","expires_in":3600}'
+
+@pytest.fixture
+def app_cassette(tmp_path: object) -> tuple:
+    app = Flask(__name__)
+
+    @app.route('/callback', methods=['GET', 'POST'])
+    def callback() -> str:
+        return 'ok'
+
+    cassette = configure_cassette(app, 'record', str(tmp_path / 'session.cassette'))
+    yield app.test_client(), cassette
+    stop_cassette()
+
+def test_redact_replaces_secret_keys_at_any_depth() -> None:
+    data = {'access_token': 'a', 'items': [{'client_secret': 'b', 'name': 'c'}], 'code': 'd', 'country_code': 'GB'}
+
+    assert redact(data) == {'access_token': REDACTED, 'items': [{'client_secret': REDACTED, 'name': 'c'}], 'code': REDACTED, 'country_code': 'GB'}
+
+def test_token_responses_are_redacted(tmp_path: object) -> None:
+    cassette = Cassette('record')
+    cassette.record('POST', TOKEN_URL, None, Response(200, {'Content-Type': 'application/json'}, TOKEN_BODY))
+    cassette.save(str(tmp_path / 'session.cassette'))
+
+    saved = gzip.open(tmp_path / 'session.cassette').read()
+    assert b'live-access' not in saved
+    assert b'live-refresh' not in saved
+
+    replayed, _ = Cassette.load(str(tmp_path / 'session.cassette'), 0).play('POST', TOKEN_URL, None)
+    assert replayed.json() == {'access_token': REDACTED, 'token_type': REDACTED, 'refresh_token': REDACTED, 'expires_in': 3600}
+
+def test_secret_params_are_redacted_and_still_replayed() -> None:
+    cassette = Cassette('record')
+    cassette.record('GET', 'https://api.satchelone.com/api/todos', {'access_token': 'live', 'page': 1}, Response(200, {}, b'[]'))
+    cassette.mode = 'replay'
+
+    assert ('access_token', REDACTED) in cassette.interactions[0].params
+    assert cassette.play('GET', 'https://api.satchelone.com/api/todos', {'access_token': 'other', 'page': 1})[0].content == b'[]'
+
+def test_non_json_bodies_with_secrets_are_dropped() -> None:
+    cassette = Cassette('record')
+    cassette.record('POST', TOKEN_URL, None, Response(200, {}, b'access_token=live&expires_in=3600'))
+
+    assert cassette.interactions[0].content == b''
+
+def test_inbound_query_secrets_are_redacted(app_cassette: tuple) -> None:
+    client, cassette = app_cassette
+    client.get('/callback?code=live-code&state=abc&token=reset-token')
+
+    inbound = cassette.inbound[0]
+    assert 'live-code' not in inbound.query
+    assert 'reset-token' not in inbound.query
+    assert 'state=abc' in inbound.query
+
+def test_inbound_form_and_json_secrets_are_redacted(app_cassette: tuple) -> None:
+    client, cassette = app_cassette
+    client.post('/callback', data={'email': 'user@example.com', 'password': 'hunter2'})
+    client.post('/callback', json={'user': {'name': 'user', 'password': 'hunter2'}})
+    client.post('/callback', data=b'password=hunter2', content_type='text/plain')
+
+    assert [item.body for item in cassette.inbound] == [
+        'email=user%40example.com&password=%5Bredacted%5D',
+        '{"user":{"name":"user","password":"[redacted]"}}',
+        ''
+    ]
@@ -0,0 +1,138 @@
+# Import internal modules
+from xenon.coalescing import SingleFlight
+
+# Import external modules
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import asyncio
+import pytest
+
+def _wait_for_followers(single_flight: SingleFlight, count: int) -> None:
+    """ Blocks the leader until `count` followers have joined its call. """
+    while single_flight.coalesced < count:
+        threading.Event().wait(0.001)
+
+def test_identical_calls_in_flight_are_coalesced() -> None:
+    single_flight = SingleFlight()
+    calls = []
+
+    def fn() -> str:
+        calls.append(1)
+        _wait_for_followers(single_flight, 4)
+        return 'result'
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: single_flight.do('key', fn), range(5)))
+
+    assert results == ['result'] * 5
+    assert len(calls) == 1
+    assert single_flight.stats() == {'calls': 5, 'coalesced': 4}
+
+def test_different_keys_are_not_coalesced() -> None:
+    single_flight = SingleFlight()
+
+    assert single_flight.do('a', lambda: 1) == 1
+    assert single_flight.do('b', lambda: 2) == 2
+    assert single_flight.coalesced == 0
+
+def test_finished_calls_are_not_cached() -> None:
+    single_flight = SingleFlight()
+    calls = []
+
+    single_flight.do('key', lambda: calls.append(1))
+    single_flight.do('key', lambda: calls.append(1))
+
+    assert len(calls) == 2
+
+def test_followers_get_the_exception_of_the_leader() -> None:
+    single_flight = SingleFlight()
+
+    def fn() -> None:
+        _wait_for_followers(single_flight, 2)
+        raise RuntimeError('upstream failed')
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(single_flight.do, 'key', fn) for _ in range(3)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match='upstream failed'):
+            future.result()
+
+    assert single_flight.do('key', lambda: 'recovered') == 'recovered'
+
+def test_disabled_single_flight_runs_every_call() -> None:
+    single_flight = SingleFlight()
+    single_flight.enabled = False
+
+    assert single_flight.do('key', lambda: 1) == 1
+    assert single_flight.calls == 0
+
+def test_identical_tasks_in_flight_are_coalesced() -> None:
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fn() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'result'
+
+    async def main() -> list:
+        return await asyncio.gather(*[single_flight.do_async('key', fn) for _ in range(5)])
+
+    assert asyncio.run(main()) == ['result'] * 5
+    assert len(calls) == 1
+    assert single_flight.coalesced == 4
+
+def test_followers_get_the_exception_of_the_leader_task() -> None:
+    single_flight = SingleFlight()
+
+    async def fn() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError('upstream failed')
+
+    async def main() -> list:
+        return await asyncio.gather(*[single_flight.do_async('key', fn) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in asyncio.run(main()))
+
+def test_cancelled_leader_task_does_not_cancel_its_followers() -> None:
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fn() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def main() -> tuple:
+        leader = asyncio.create_task(single_flight.do_async('key', fn))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(single_flight.do_async('key', fn)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(leader, *followers, return_exceptions=True)
+
+    leader, *followers = asyncio.run(main())
+    assert isinstance(leader, asyncio.CancelledError)
+    assert followers == ['result'] * 3
+    assert len(calls) == 2
+    assert single_flight.coalesced == 2
+
+def test_cancelled_follower_task_does_not_cancel_the_leader() -> None:
+    single_flight = SingleFlight()
+
+    async def fn() -> str:
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def main() -> tuple:
+        leader = asyncio.create_task(single_flight.do_async('key', fn))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.do_async('key', fn))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader, follower = asyncio.run(main())
+    assert leader == 'result'
+    assert isinstance(follower, asyncio.CancelledError)
@@ -0,0 +1,57 @@
+# Import internal modules
+from xenon.identity import identity_scope, merge_payload
+from xenon.spotify3.models import Track, Album, Playlist
+
+def _track(**fields) -> dict:
+    return {'id': 't1', 'name': 'One', 'album': {'id': 'a1', 'name': 'First'}, **fields}
+
+def test_same_id_resolves_to_one_instance() -> None:
+    with identity_scope() as identity_map:
+        first = Track(_track())
+        second = Track(_track())
+
+    assert first is second
+    assert identity_map.stats()['hits'] >= 1
+
+def test_nested_objects_are_shared() -> None:
+    with identity_scope():
+        track = Track(_track())
+        album = Album({'id': 'a1', 'name': 'First', 'total_tracks': 12})
+
+    assert track.get_data()['album'] is album.get_data()
+    assert track.get_data()['album']['total_tracks'] == 12
+
+def test_fuller_payload_is_merged_into_a_simplified_one() -> None:
+    with identity_scope():
+        simplified = Track({'id': 't1', 'name': 'One'})
+        Track(_track(popularity=50, available_markets=['GB', 'US']))
+
+    assert simplified.get_data()['popularity'] == 50
+    assert simplified.get_data()['available_markets'] == ['GB', 'US']
+
+def test_smaller_payload_does_not_overwrite_a_fuller_one() -> None:
+    with identity_scope():
+        full = Track(_track(available_markets=['GB', 'US'], popularity=50))
+        Track({'id': 't1', 'available_markets': [], 'popularity': None})
+
+    assert full.get_data()['available_markets'] == ['GB', 'US']
+    assert full.get_data()['popularity'] == 50
+
+def test_playlist_header_does_not_replace_its_items() -> None:
+    items = {'href': 'https://api.spotify.com/v1/playlists/p1/tracks', 'total': 1, 'items': [{'track': _track()}], 'limit': 100, 'offset': 0, 'next': None}
+
+    with identity_scope():
+        full = Playlist({'id': 'p1', 'name': 'Mix', 'tracks': items})
+        Playlist({'id': 'p1', 'name': 'Mix', 'snapshot_id': 's2', 'tracks': {'href': items['href'], 'total': 1}})
+
+    assert full.get_data()['tracks']['items'] == [{'track': _track()}]
+    assert full.get_data()['snapshot_id'] == 's2'
+
+def test_merge_payload() -> None:
+    kept = {'a': 1, 'b': None, 'c': {'x': 1}, 'd': [1, 2], 'e': [1]}
+    merge_payload(kept, {'a': 2, 'b': 2, 'c': {'x': 2, 'y': 2}, 'd': [], 'e': [1, 2], 'f': 3})
+
+    assert kept == {'a': 1, 'b': 2, 'c': {'x': 1, 'y': 2}, 'd': [1, 2], 'e': [1, 2], 'f': 3}
+
+def test_no_scope_no_interning() -> None:
+    assert Track(_track()) is not Track(_track())
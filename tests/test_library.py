@@ -0,0 +1,139 @@
+# Import internal modules
+from xenon.databases import db
+from xenon.spotify3.context import spotify_context
+from xenon.spotify3.library import LibraryMirror
+from xenon.spotify3.models import FollowingRequest
+from xenon.spotify3.tracks import GetCurrentUsersSavedTracks
+
+# Import external modules
+from flask import Flask
+import datetime
+import pytest
+
+PAGE_SIZE = 50
+
+class FakeLibrary():
+    """ The saved tracks of one user, newest first, served in pages like `GetCurrentUsersSavedTracks()`. """
+
+    def __init__(self, count: int) -> None:
+        self.items: list = []
+        self.requests: int = 0
+        self.next_id: int = 0
+        self.add(count)
+
+    def add(self, count: int) -> None:
+        """ Saves `count` new tracks, each newer than every saved track. """
+        start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(hours=self.next_id)
+        added = []
+        for hours in range(count):
+            track_id = f"track{self.next_id}"
+            added_at = (start + datetime.timedelta(hours=hours)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            added.append({'added_at': added_at, 'track': {'id': track_id, 'name': f"Song {self.next_id}"}})
+            self.next_id += 1
+        self.items = list(reversed(added)) + self.items
+
+    def remove(self, track_id: str) -> None:
+        self.items = [item for item in self.items if item['track']['id'] != track_id]
+
+    def page(self, collection: str, offset: int) -> FollowingRequest:
+        self.requests += 1
+        items = self.items[offset:offset + PAGE_SIZE]
+        return FollowingRequest({
+            'items': items,
+            'limit': PAGE_SIZE,
+            'offset': offset,
+            'total': len(self.items),
+            'next': 'next' if offset + PAGE_SIZE < len(self.items) else None
+        })
+
+@pytest.fixture
+def mirror(tmp_path: object) -> LibraryMirror:
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_BINDS'] = {'library': f"sqlite:///{tmp_path / 'library.db'}"}
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all(bind_key='library')
+    return LibraryMirror(app)
+
+@pytest.fixture
+def library(mirror: LibraryMirror, monkeypatch: pytest.MonkeyPatch) -> FakeLibrary:
+    library = FakeLibrary(120)
+    monkeypatch.setattr(mirror, '_fetch_page', library.page)
+    return library
+
+@pytest.fixture(autouse=True)
+def user() -> iter:
+    with spotify_context(user_id='user1', token='token'):
+        yield
+
+def test_first_sync_fetches_every_page(mirror: LibraryMirror, library: FakeLibrary) -> None:
+    result = mirror.sync('tracks')
+
+    assert (result.added, result.removed, result.requests, result.full) == (120, 0, 3, False)
+    assert mirror.count('tracks') == 120
+    assert [item['track']['id'] for item in mirror.items('tracks', limit=2)] == ['track119', 'track118']
+
+def test_unchanged_library_stops_at_the_first_known_item(mirror: LibraryMirror, library: FakeLibrary) -> None:
+    mirror.sync('tracks')
+    result = mirror.sync('tracks')
+
+    assert (result.added, result.removed, result.requests, result.full) == (0, 0, 1, False)
+
+def test_new_items_are_added_without_fetching_older_pages(mirror: LibraryMirror, library: FakeLibrary) -> None:
+    mirror.sync('tracks')
+    library.add(60)
+    result = mirror.sync('tracks')
+
+    assert (result.added, result.requests, result.full) == (60, 2, False)
+    assert mirror.count('tracks') == 180
+    assert mirror.items('tracks', limit=1)[0]['track']['id'] == 'track179'
+
+def test_removed_item_triggers_a_full_sync(mirror: LibraryMirror, library: FakeLibrary) -> None:
+    mirror.sync('tracks')
+    library.remove('track5')
+    result = mirror.sync('tracks')
+
+    assert (result.removed, result.full) == (1, True)
+    assert result.requests == 1 + 3
+    assert mirror.count('tracks') == 119
+    assert mirror.contains('tracks', ['track5', 'track6']) == [False, True]
+
+def test_libraries_are_kept_per_user(mirror: LibraryMirror, library: FakeLibrary) -> None:
+    mirror.sync('tracks')
+
+    with spotify_context(user_id='user2', token='token'):
+        assert mirror.count('tracks') == 0
+        assert mirror.last_synced('tracks') is None
+    assert mirror.last_synced('tracks') is not None
+
+def test_search_matches_names(mirror: LibraryMirror, library: FakeLibrary) -> None:
+    mirror.sync('tracks')
+
+    found = [item['track']['id'] for item in mirror.search('tracks', 'SONG 11')]
+
+    assert found == ['track119', 'track118', 'track117', 'track116', 'track115', 'track114', 'track113', 'track112', 'track111', 'track110', 'track11']
+
+def test_unknown_collection_raises(mirror: LibraryMirror) -> None:
+    with pytest.raises(ValueError):
+        mirror.sync('podcasts')
+
+def test_objects_are_fetched_without_the_users_market(mirror: LibraryMirror, monkeypatch: pytest.MonkeyPatch) -> None:
+    sent = []
+
+    def create_request(request: GetCurrentUsersSavedTracks) -> None:
+        sent.append(request.api_params)
+        request.code = 200
+        request._data = FollowingRequest({'items': [], 'limit': PAGE_SIZE, 'offset': 0, 'total': 0, 'next': None})
+
+    monkeypatch.setattr(GetCurrentUsersSavedTracks, 'create_request', create_request)
+    with spotify_context(market='DE'):
+        mirror.sync('tracks')
+
+    assert sent[0].get('market') is None
+
+def test_fields_of_one_user_are_not_stored(mirror: LibraryMirror) -> None:
+    episode = {'id': 'e1', 'name': 'Episode', 'resume_point': {'fully_played': False, 'resume_position_ms': 1000}, 'available_markets': ['GB', 'US']}
+
+    assert mirror.decode(mirror.encode(episode)) == {'id': 'e1', 'name': 'Episode', 'available_markets': ['GB', 'US']}
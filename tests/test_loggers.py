@@ -0,0 +1,19 @@
+# Import internal modules
+from xenon.loggers import SamplingFilter, xenon_requests
+
+# Import external modules
+import logging
+
+def record(level: int, msg: str = '%s returned status code %s') -> logging.LogRecord:
+    return logging.LogRecord('xenon_requests', level, __file__, 1, msg, ('url', 500), None)
+
+def test_sampling_limits_repeated_messages() -> None:
+    sampling = SamplingFilter(limit=2)
+
+    assert [sampling.filter(record(logging.WARNING)) for _ in range(3)] == [True, True, False]
+
+def test_errors_are_never_sampled() -> None:
+    sampling = next(item for item in xenon_requests.filters if isinstance(item, SamplingFilter))
+
+    assert sampling.always_level == logging.ERROR
+    assert all(sampling.filter(record(logging.ERROR, 'test_errors_are_never_sampled')) for _ in range(sampling.limit + 5))
@@ -0,0 +1,22 @@
+# Import internal modules
+from xenon.spotify3 import market_set as market_set_module
+from xenon.spotify3.market_set import MarketSet
+
+# Import external modules
+import gc
+
+def test_equal_sets_are_shared() -> None:
+    markets = MarketSet.from_codes(['gb', 'US', 'ZZ'])
+
+    assert MarketSet.from_codes(['US', 'GB', 'ZZ']) is markets
+    assert MarketSet.from_hex(markets.to_hex()) is markets
+    assert markets.to_list() == ['GB', 'US', 'ZZ']
+
+def test_unused_sets_are_forgotten() -> None:
+    markets = MarketSet.from_codes(['FR', 'DE', 'YY'])
+    key = (markets.bits, markets.other)
+    assert key in market_set_module._shared_sets
+
+    del markets
+    gc.collect()
+    assert key not in market_set_module._shared_sets
@@ -0,0 +1,92 @@
+# Import internal modules
+from xenon.databases import db
+from xenon.spotify3 import playlist_store as playlist_store_module
+from xenon.spotify3.context import spotify_context
+from xenon.spotify3.playlist_store import PlaylistStore
+
+# Import external modules
+from flask import Flask
+import pytest
+
+class FakePlaylist():
+    """ One playlist which counts the header & item requests sent for it. """
+
+    def __init__(self, size: int) -> None:
+        self.snapshot_id: str = 'snapshot1'
+        self.items: list = [{'added_at': '2024-01-01T00:00:00Z', 'track': {'id': f"track{position}", 'name': f"Song {position}"}} for position in range(size)]
+        self.header_requests: int = 0
+        self.item_requests: int = 0
+
+    def header(self, playlist_id: str, market: str | None) -> dict:
+        self.header_requests += 1
+        return {'id': playlist_id, 'name': 'Mix', 'snapshot_id': self.snapshot_id, 'tracks': {'href': f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks", 'total': len(self.items)}}
+
+    def fetch_all_items(self, request_class: type, playlist_id: str, market: str = None) -> list:
+        self.item_requests += 1
+        return list(self.items)
+
+    def edit(self) -> None:
+        self.items.append({'added_at': '2024-01-02T00:00:00Z', 'track': {'id': 'new', 'name': 'New'}})
+        self.snapshot_id = 'snapshot2'
+
+@pytest.fixture
+def store(tmp_path: object) -> PlaylistStore:
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_BINDS'] = {'library': f"sqlite:///{tmp_path / 'library.db'}"}
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all(bind_key='library')
+    return PlaylistStore(app)
+
+@pytest.fixture
+def playlist(store: PlaylistStore, monkeypatch: pytest.MonkeyPatch) -> FakePlaylist:
+    playlist = FakePlaylist(3)
+    monkeypatch.setattr(store, '_fetch_header', playlist.header)
+    monkeypatch.setattr(playlist_store_module, 'fetch_all_items', playlist.fetch_all_items)
+    return playlist
+
+def test_unchanged_playlist_is_not_downloaded_again(store: PlaylistStore, playlist: FakePlaylist) -> None:
+    with spotify_context(user_id='user1', token='token'):
+        assert store.refresh('p1') is True
+        assert store.refresh('p1') is False
+        assert [item['track']['id'] for item in store.items('p1')] == ['track0', 'track1', 'track2']
+
+    assert (playlist.header_requests, playlist.item_requests) == (3, 1)
+
+def test_changed_snapshot_downloads_the_items(store: PlaylistStore, playlist: FakePlaylist) -> None:
+    with spotify_context(user_id='user1', token='token'):
+        store.refresh('p1')
+        playlist.edit()
+
+        assert len(store.items('p1')) == 4
+        assert store.snapshot_id('p1') == 'snapshot2'
+
+def test_max_age_serves_the_stored_copy_without_a_request(store: PlaylistStore, playlist: FakePlaylist) -> None:
+    with spotify_context(user_id='user1', token='token'):
+        store.items('p1', max_age=60)
+        store.items('p1', max_age=60)
+
+    assert (playlist.header_requests, playlist.item_requests) == (1, 1)
+
+def test_playlists_are_stored_per_user(store: PlaylistStore, playlist: FakePlaylist) -> None:
+    with spotify_context(user_id='user1', token='token'):
+        store.items('p1', max_age=60)
+
+    with spotify_context(user_id='user2', token='other'):
+        assert store.snapshot_id('p1') is None
+        store.items('p1', max_age=60)
+
+    assert (playlist.header_requests, playlist.item_requests) == (2, 2)
+
+def test_forget_only_removes_the_current_users_copy(store: PlaylistStore, playlist: FakePlaylist) -> None:
+    with spotify_context(user_id='user1', token='token'):
+        store.refresh('p1')
+    with spotify_context(user_id='user2', token='other'):
+        store.refresh('p1')
+        store.forget('p1')
+        assert store.snapshot_id('p1') is None
+
+    with spotify_context(user_id='user1', token='token'):
+        assert store.snapshot_id('p1') == 'snapshot1'
@@ -0,0 +1,69 @@
+# Import internal modules
+from xenon.projection import Projection
+
+# Import external modules
+import pytest
+
+PLAYLIST_ITEMS = {
+    'href': 'https://api.spotify.com/v1/playlists/abc/tracks',
+    'total': 2,
+    'next': None,
+    'items': [
+        {'added_at': '2024-01-01T00:00:00Z', 'is_local': False, 'track': {'id': 't1', 'name': 'One', 'popularity': 10, 'album': {'id': 'a1', 'name': 'First', 'available_markets': ['GB']}}},
+        {'added_at': '2024-01-02T00:00:00Z', 'is_local': False, 'track': {'id': 't2', 'name': 'Two', 'popularity': 20, 'album': {'id': 'a2', 'name': 'Second', 'available_markets': ['US']}}}
+    ]
+}
+
+def test_nested_fields_keep_only_the_listed_fields() -> None:
+    projection = Projection('total,items(added_at,track(name,album(name)))')
+
+    assert projection.apply(PLAYLIST_ITEMS) == {
+        'total': 2,
+        'items': [
+            {'added_at': '2024-01-01T00:00:00Z', 'track': {'name': 'One', 'album': {'name': 'First'}}},
+            {'added_at': '2024-01-02T00:00:00Z', 'track': {'name': 'Two', 'album': {'name': 'Second'}}}
+        ]
+    }
+
+def test_dot_is_short_for_a_group_with_one_field() -> None:
+    assert Projection('items.track(id)') == Projection('items(track(id))')
+    assert Projection('items.track.album.name').apply(PLAYLIST_ITEMS)['items'][1] == {'track': {'album': {'name': 'Second'}}}
+
+def test_exclusion_keeps_every_other_field() -> None:
+    projection = Projection('items(track(album(!available_markets)))')
+    album = projection.apply(PLAYLIST_ITEMS)['items'][0]['track']['album']
+
+    assert album == {'id': 'a1', 'name': 'First'}
+
+def test_missing_fields_are_skipped() -> None:
+    assert Projection('total,snapshot_id').apply(PLAYLIST_ITEMS) == {'total': 2}
+
+def test_keeping_a_whole_value_wins_over_keeping_part_of_it() -> None:
+    assert Projection('items(track(name)),items') == Projection('items')
+    assert Projection('items,items(track(name))') == Projection('items')
+
+def test_groups_of_the_same_field_are_merged() -> None:
+    assert Projection('items(added_at),items(track(id))').to_fields() == 'items(added_at,track(id))'
+    assert Projection('items(added_at)') + Projection('items(track(id))') == Projection('items(added_at,track(id))')
+
+def test_to_fields_round_trips() -> None:
+    fields = 'total,next,items(added_at,track(name,id,album(name)))'
+
+    assert Projection(fields).to_fields() == fields
+    assert Projection(Projection(fields).to_fields()) == Projection(fields)
+    assert Projection('items(track(!available_markets,!popularity))').to_fields() == 'items(track(!available_markets,!popularity))'
+
+def test_whitespace_is_ignored() -> None:
+    assert Projection(' items ( track ( id , name ) ) ') == Projection('items(track(id,name))')
+
+def test_projections_are_hashable() -> None:
+    assert len({Projection('items(track(id))'), Projection('items.track.id'), Projection('total')}) == 2
+
+def test_empty_projection_is_falsy() -> None:
+    assert not Projection('')
+    assert Projection('total')
+
+@pytest.mark.parametrize('fields', ['items(track', 'items)', 'items(,)', ',total', 'items..track', '!items.track', '!items(track)', 'items(track))'])
+def test_invalid_fields_raise(fields: str) -> None:
+    with pytest.raises(ValueError):
+        Projection(fields)
@@ -0,0 +1,74 @@
+# Import internal modules
+from xenon.scheduler import Scheduler, TokenBucket, parse_retry_after
+
+# Import external modules
+from email.utils import format_datetime
+import threading
+import datetime
+import pytest
+
+def test_bucket_allows_a_burst_without_waiting() -> None:
+    bucket = TokenBucket(rate=10.0, capacity=5)
+
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+
+def test_bucket_queues_requests_past_the_burst() -> None:
+    bucket = TokenBucket(rate=10.0, capacity=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+def test_paused_bucket_holds_back_every_reservation() -> None:
+    bucket = TokenBucket(rate=10.0, capacity=5)
+    bucket.pause(2.0)
+    bucket.pause(1.0)
+
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('-1') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+
+    retry_dt = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(retry_dt, usegmt=True)) == pytest.approx(30, abs=2)
+
+def test_reserve_counts_queued_requests() -> None:
+    scheduler = Scheduler(limits={'spotify': (10.0, 1)})
+    scheduler.reserve('https://api.spotify.com/v1/me')
+    scheduler.reserve('https://api.spotify.com/v1/me')
+
+    stats = scheduler.stats('spotify')
+    assert stats['requests'] == 2
+    assert stats['queued'] == 1
+
+def test_429_pauses_the_upstream_and_is_retried() -> None:
+    scheduler = Scheduler(limits={'spotify': (10.0, 5)}, backoff_base=0.1)
+    delay = scheduler.retry_delay('https://api.spotify.com/v1/me', 'GET', 429, {'Retry-After': '2'}, 0)
+
+    assert 2.0 <= delay <= 2.1
+    assert scheduler.reserve('https://api.spotify.com/v1/me') == pytest.approx(2.0, abs=0.05)
+    assert scheduler.stats('spotify')['throttled'] == 1
+
+def test_only_idempotent_requests_are_retried_up_to_max_retries() -> None:
+    scheduler = Scheduler(max_retries=2)
+
+    assert scheduler.retry_delay('https://api.spotify.com/v1/me', 'GET', 503, {}, 1) is not None
+    assert scheduler.retry_delay('https://api.spotify.com/v1/me', 'GET', 503, {}, 2) is None
+    assert scheduler.retry_delay('https://api.spotify.com/v1/me', 'PUT', 503, {}, 0) is None
+    assert scheduler.retry_delay('https://api.spotify.com/v1/me', 'GET', 404, {}, 0) is None
+
+def test_retry_delay_of_an_unregistered_upstream_does_not_deadlock() -> None:
+    scheduler = Scheduler()
+    results = []
+
+    thread = threading.Thread(target=lambda: results.append(scheduler.retry_delay('https://example.com/x', 'GET', 429, {'Retry-After': '1'}, 0)), daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert results[0] is not None
+    assert scheduler.stats('example.com')['throttled'] == 1
@@ -0,0 +1,19 @@
+# Import internal modules
+from xenon.transport import _query_pairs
+
+# Import external modules
+from urllib.parse import urlencode, urlsplit
+import requests
+import pytest
+
+@pytest.mark.parametrize('params', [
+    {'ids': 'a,b', 'limit': 50, 'offset': 0},
+    {'ids': ['a', 'b'], 't': ('c', None, 'd')},
+    {'flag': True, 'ratio': 0.5, 'name': 'x y', 'raw': b'z'},
+    {'market': None},
+    None
+])
+def test_async_query_matches_requests(params: dict) -> None:
+    expected = urlsplit(requests.Request('GET', 'https://api.spotify.com/v1/tracks', params=params).prepare().url).query
+
+    assert urlencode(_query_pairs(params)) == expected
@@ -0,0 +1,229 @@
+# Import external modules
+from collections import OrderedDict
+from contextlib import contextmanager
+from urllib.parse import urlencode
+import contextvars
+import threading
+import hashlib
+import re
+import time
+
+# (url pattern, seconds). The first pattern to match the url decides the ttl; urls which match none are not cached.
+DEFAULT_TTLS = [
+    (r'^https://api\.spotify\.com/v1/(albums|artists|tracks|shows|episodes|audiobooks|chapters)(/|$)', 24 * 60 * 60),
+    (r'^https://api\.spotify\.com/v1/audio-features(/|$)', 7 * 24 * 60 * 60),
+    (r'^https://api\.spotify\.com/v1/(markets|recommendations/available-genre-seeds)(/|$)', 24 * 60 * 60),
+    (r'^https://api\.spotify\.com/v1/browse/', 60 * 60)
+]
+
+# Urls whose responses are the same whoever requests them, so they are cached once for every user. Responses of other urls are scoped to the user they were requested for (see `cache_scope()`).
+SHARED_URLS = [
+    r'^https://api\.spotify\.com/v1/(albums|artists|tracks|audio-features|audio-analysis|markets|recommendations/available-genre-seeds)(/|\?|$)'
+]
+
+_cache_scope: contextvars.ContextVar = contextvars.ContextVar('xenon_cache_scope', default='')
+
+@contextmanager
+def cache_scope(scope: str) -> iter:
+    """ Within this scope cached responses of user dependent urls are kept apart for `scope` (e.g. a user id). `xenon.spotify3.context.spotify_context()` sets it, so it follows the user rather
+    than their access token, which changes on every refresh. Requests sent outside of any scope are scoped by their `Authorization` header instead. """
+    reset_token = _cache_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _cache_scope.reset(reset_token)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class CacheEntry():
+    """ A cached response. `etag` is kept so a stale entry can be revalidated with `If-None-Match` instead of being downloaded again. `expires_at` is a unix timestamp so entries can be shared
+    with other processes through a persistent backend. """
+
+    __slots__ = ('status_code', 'headers', 'content', 'etag', 'expires_at', 'size')
+
+    def __init__(self, status_code: int, headers: dict, content: bytes, etag: str | None, expires_at: float) -> None:
+        self.status_code: int = status_code
+        self.headers: dict = headers
+        self.content: bytes = content
+        self.etag: str | None = etag
+        self.expires_at: float = expires_at
+        self.size: int = len(content) + sum(len(key) + len(value) for key, value in headers.items())
+
+    @property
+    def is_fresh(self) -> bool:
+        """ Returns `True` if the entry has not passed its ttl. """
+        return time.time() < self.expires_at
+
+class CacheStats():
+    """ Counters kept by `ResponseCache()`. """
+
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidations: int = 0
+        self.stores: int = 0
+        self.evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """ The fraction of lookups which were served from the cache (revalidated entries count as hits). """
+        lookups = self.hits + self.revalidations + self.misses
+        if not lookups:
+            return 0.0
+        return (self.hits + self.revalidations) / lookups
+
+    def to_dict(self) -> dict:
+        """ Returns the counters as a dict. """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'hit_ratio': self.hit_ratio
+        }
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class ResponseCache():
+    """ A memory bounded LRU cache of GET responses. Entries are keyed by url, params & user scope (the current `cache_scope()` or `Authorization` header, or none for the urls in `shared`)
+    and live for the ttl of the first pattern in `ttls` that matches the url. Once an entry is stale it is revalidated with `If-None-Match` if the upstream sent an `ETag`; a `304` refreshes the entry & counts as a hit.
+
+    A `backend` (e.g. `xenon.persistent_cache.PersistentResponseStore()`) can be given as a second tier. It is read when an entry is not in memory and written whenever an entry is stored or
+    refreshed, so entries survive restarts & are shared between worker processes. """
+
+    def __init__(self, ttls: list = None, max_bytes: int = 32 * 1024 * 1024, max_entries: int = 10000, backend: object = None, shared: list = None) -> None:
+        self.ttls: list = [(re.compile(pattern), ttl) for pattern, ttl in (ttls if ttls is not None else DEFAULT_TTLS)]
+        self.shared: list = [re.compile(pattern) for pattern in (shared if shared is not None else SHARED_URLS)]
+        self.max_bytes: int = max_bytes
+        self.max_entries: int = max_entries
+        self.backend: object = backend
+
+        self.stats = CacheStats()
+        self.size: int = 0
+
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, url: str) -> float | None:
+        """ Returns the ttl of `url` in seconds, or `None` if it should not be cached. """
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return None
+
+    def is_shared(self, url: str, params: dict = None) -> bool:
+        """ Returns `True` if the response of `url` does not depend on the user. `market=from_token` makes any response depend on the user. """
+        if (params or {}).get('market') == 'from_token':
+            return False
+        return any(pattern.search(url) for pattern in self.shared)
+
+    def key(self, url: str, params: dict = None, headers: dict = None) -> str:
+        """ Builds the cache key of a request. The scope is empty for shared urls & a hash of the current `cache_scope()` otherwise, so the key contains no user id or token. Outside of any
+        `cache_scope()` the hash of the `Authorization` header is used, so requests sent for different users without a scope are never answered with each other's responses. """
+        if self.is_shared(url, params):
+            scope = ''
+        else:
+            scope = hashlib.sha1((_cache_scope.get() or f"authorization:{(headers or {}).get('Authorization', '')}").encode('utf-8')).hexdigest()
+        query = urlencode(sorted((key, str(value)) for key, value in (params or {}).items() if value is not None))
+
+        return f"{scope}:{url}?{query}"
+
+    def get(self, key: str) -> CacheEntry | None:
+        """ Returns the entry of `key` (fresh or stale) & marks it as recently used. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry, persist: bool = True) -> None:
+        """ Stores `entry`, evicting the least recently used entries until the cache is back within its limits. Entries larger than the whole cache are not kept in memory. If `persist` is `True`
+        the entry is also written to `self.backend`. """
+        if persist and self.backend is not None:
+            self.backend.put(key, entry)
+
+        if entry.size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old.size
+
+            self._entries[key] = entry
+            self.size += entry.size
+            self.stats.stores += 1
+
+            while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """ Removes every entry. """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    # The methods below are used by the transports to wrap a request in the cache
+
+    def prepare(self, method: str, url: str, params: dict, headers: dict) -> tuple:
+        """ Looks a request up. Returns `(key, entry, ttl, headers)`: `key` is `None` if the request is not cacheable, `entry` is set if a fresh copy can be returned straight away or if a stale copy
+        can be revalidated, in which case `headers` includes `If-None-Match`. """
+        if method.upper() != 'GET':
+            return (None, None, None, headers)
+
+        ttl = self.ttl_for(url)
+        if ttl is None:
+            return (None, None, None, headers)
+
+        key = self.key(url, params, headers)
+        entry = self.get(key)
+
+        if entry is None and self.backend is not None:
+            entry = self.backend.get(key)
+            if entry is not None:
+                self.put(key, entry, persist=False)
+
+        if entry is not None and not entry.is_fresh:
+            if entry.etag is None:
+                entry = None
+            else:
+                headers = {**(headers or {}), 'If-None-Match': entry.etag}
+
+        return (key, entry, ttl, headers)
+
+    def complete(self, key: str, entry: CacheEntry | None, ttl: float, status_code: int, headers: dict, content: bytes) -> CacheEntry | None:
+        """ Records the upstream response of a prepared request. Returns the entry the caller should answer with: the refreshed entry on a `304`, otherwise `None` (use the upstream response). """
+        if status_code == 304 and entry is not None:
+            entry.expires_at = time.time() + ttl
+            if self.backend is not None:
+                self.backend.put(key, entry)
+
+            with self._lock:
+                self.stats.revalidations += 1
+            return entry
+
+        with self._lock:
+            self.stats.misses += 1
+
+        if status_code == 200 and 'no-store' not in headers.get('Cache-Control', ''):
+            self.put(key, CacheEntry(status_code, dict(headers), content, headers.get('ETag'), time.time() + ttl))
+        return None
+
+    def hit(self) -> None:
+        """ Counts a fresh entry being returned without contacting the upstream. """
+        with self._lock:
+            self.stats.hits += 1
@@ -0,0 +1,305 @@
+# Import internal modules
+from xenon.exceptions import CassetteError
+from xenon.transport import Response, get_transport, get_async_transport
+
+# Import external modules
+from urllib.parse import urlencode
+from flask import Flask, request
+import threading
+import hashlib
+import atexit
+import base64
+import gzip
+import json
+import time
+import re
+
+CASSETTE_FILE_PATH = 'instance/session.cassette'
+CASSETTE_VERSION = 1
+
+# The response headers kept in a cassette. The rest (cookies, tracing ids, ...) are dropped, as they are either secret or meaningless on replay.
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Retry-After')
+
+# Json keys, query parameters & form fields whose values are secrets (access & refresh tokens, passwords, OAuth authorisation codes, ...). Their values are replaced by `REDACTED` before they
+# are recorded.
+SECRET_KEYS = re.compile(r'token|secret|password|passwd|code_verifier|^code$', re.IGNORECASE)
+REDACTED = '[redacted]'
+
+def redact(data: any) -> any:
+    """ Returns a copy of the json value `data` with the values of every key matching `SECRET_KEYS` replaced by `REDACTED`, at any depth. """
+    if isinstance(data, dict):
+        return {key: REDACTED if SECRET_KEYS.search(key) else redact(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [redact(value) for value in data]
+    return data
+
+def redact_content(content: bytes) -> bytes:
+    """ Returns a json body with its secrets redacted. Bodies which mention no secret key are returned as they are; bodies which do but are not json are dropped, as they cannot be
+    redacted safely. """
+    if not SECRET_KEYS.search(content.decode('utf-8', errors='replace')):
+        return content
+
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return b''
+    return json.dumps(redact(data), separators=(',', ':')).encode('utf-8')
+
+def params_key(params: dict | None) -> tuple:
+    """ Returns `params` in the form requests are matched on: sorted `(key, str(value))` pairs without the `None` values. """
+    return tuple(sorted((key, str(value)) for key, value in (params or {}).items() if value is not None))
+
+class Interaction():
+    """ One upstream request & its response. `offset` is the number of seconds after the start of the recording the request finished at & `elapsed` the time the upstream took to answer. """
+
+    __slots__ = ('offset', 'elapsed', 'method', 'url', 'params', 'status_code', 'headers', 'content')
+
+    def __init__(self, offset: float, elapsed: float, method: str, url: str, params: tuple, status_code: int, headers: dict, content: bytes) -> None:
+        self.offset: float = offset
+        self.elapsed: float = elapsed
+        self.method: str = method
+        self.url: str = url
+        self.params: tuple = params
+        self.status_code: int = status_code
+        self.headers: dict = headers
+        self.content: bytes = content
+
+    @property
+    def key(self) -> tuple:
+        return (self.method, self.url, self.params)
+
+class InboundRequest():
+    """ One request the Flask app received while recording, replayed by `load_driver.py`. Only the method, path, query & body are kept; headers (& so cookies) are not. Secret query
+    parameters & form & json fields are redacted (see `_inbound_query()` & `_inbound_body()`), so e.g. a replayed login fails. """
+
+    __slots__ = ('offset', 'method', 'path', 'query', 'body')
+
+    def __init__(self, offset: float, method: str, path: str, query: str = '', body: str = '') -> None:
+        self.offset: float = offset
+        self.method: str = method
+        self.path: str = path
+        self.query: str = query
+        self.body: str = body
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class Cassette():
+    """
+    A recording of the traffic of a session: every upstream request sent through `xenon.transport` with its response & timing, & optionally the requests the Flask app received. A cassette
+    in `'record'` mode captures traffic; in `'replay'` mode the transport answers requests from it instead of sending them.
+
+    ---
+    ``` python
+    cassette = start_recording()
+    ...                                            # use the app or the request classes as normal
+    stop_cassette().save('instance/session.cassette')
+
+    start_replay('instance/session.cassette', speed=4.0)    # upstream latency is replayed 4x faster
+
+    ```
+
+    Requests are matched on their method, url & parameters. A request which was recorded several times is answered with its responses in the order they were recorded, the last one repeating
+    once they run out. `speed` scales the replayed latency: `1.0` is the original timing, `0` answers immediately.
+    """
+
+    def __init__(self, mode: str = 'record', speed: float = 1.0) -> None:
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Parameter 'mode' returned '{mode}' instead of 'record' or 'replay'.")
+        if speed < 0:
+            raise ValueError("Parameter 'speed' returned a negative value.")
+
+        self.mode: str = mode
+        self.speed: float = speed
+
+        self.interactions: list = []
+        self.inbound: list = []
+
+        self._started: float = time.monotonic()
+        self._lock = threading.Lock()
+        self._queues: dict = None
+        self._positions: dict = {}
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    @property
+    def duration(self) -> float:
+        """ The number of seconds between the start of the recording & the last request in it. """
+        offsets = [interaction.offset for interaction in self.interactions] + [inbound.offset for inbound in self.inbound]
+        return max(offsets, default=0.0)
+
+    def _offset(self) -> float:
+        return time.monotonic() - self._started
+
+    # Recording
+
+    def record(self, method: str, url: str, params: dict | None, r: Response) -> None:
+        """ Records the final response of an upstream request. Secrets in the parameters & json body (e.g. the tokens returned by `accounts.spotify.com/api/token`) are redacted, so
+        replayed token refreshes succeed with a placeholder token. """
+        headers = {name: r.headers[name] for name in KEPT_HEADERS if name in r.headers}
+        params = {key: REDACTED if SECRET_KEYS.search(key) else value for key, value in (params or {}).items()}
+        interaction = Interaction(self._offset(), r.elapsed, method, url, params_key(params), r.status_code, headers, redact_content(r.content))
+
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def record_inbound(self, method: str, path: str, query: str = '', body: str = '') -> None:
+        """ Records a request received by the Flask app. """
+        with self._lock:
+            self.inbound.append(InboundRequest(self._offset(), method, path, query, body))
+
+    # Replaying
+
+    def _index(self) -> dict:
+        if self._queues is None:
+            queues = {}
+            for interaction in self.interactions:
+                queues.setdefault(interaction.key, []).append(interaction)
+            self._queues = queues
+        return self._queues
+
+    def play(self, method: str, url: str, params: dict | None) -> tuple:
+        """ Returns the recorded `Response()` of a request & the number of seconds to wait before returning it. Raises `CassetteError()` if the request was not recorded. """
+        params = {key: REDACTED if SECRET_KEYS.search(key) else value for key, value in (params or {}).items()}
+        key = (method, url, params_key(params))
+        with self._lock:
+            queue = self._index().get(key)
+            if not queue:
+                raise CassetteError(method, url)
+
+            position = self._positions.get(key, 0)
+            interaction = queue[min(position, len(queue) - 1)]
+            self._positions[key] = position + 1
+
+        delay = interaction.elapsed / self.speed if self.speed else 0.0
+        return Response(interaction.status_code, interaction.headers, interaction.content, delay), delay
+
+    def rewind(self) -> None:
+        """ Starts answering every request from its first recorded response again. """
+        with self._lock:
+            self._positions.clear()
+
+    # Storage
+
+    def save(self, fp: str = CASSETTE_FILE_PATH) -> None:
+        """ Writes the cassette to `fp` as gzipped json. Response bodies which appear several times (e.g. an unchanged playlist fetched on every page view) are stored once. """
+        with self._lock:
+            interactions, inbound = list(self.interactions), list(self.inbound)
+
+        bodies, body_index = [], {}
+        rows = []
+        for interaction in interactions:
+            digest = hashlib.sha1(interaction.content).digest()
+            if digest not in body_index:
+                body_index[digest] = len(bodies)
+                bodies.append(_encode_body(interaction.content))
+
+            rows.append([round(interaction.offset, 6), round(interaction.elapsed, 6), interaction.method, interaction.url, [list(pair) for pair in interaction.params],
+                         interaction.status_code, interaction.headers, body_index[digest]])
+
+        data = {
+            'version': CASSETTE_VERSION,
+            'bodies': bodies,
+            'interactions': rows,
+            'inbound': [[round(item.offset, 6), item.method, item.path, item.query, item.body] for item in inbound]
+        }
+        with gzip.open(fp, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, fp: str = CASSETTE_FILE_PATH, speed: float = 1.0) -> 'Cassette':
+        """ Reads a cassette saved with `save()`, ready to be replayed at `speed`. """
+        with gzip.open(fp, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if data.get('version') != CASSETTE_VERSION:
+            raise ValueError(f"Parameter 'fp' returned a cassette of version {data.get('version')} instead of {CASSETTE_VERSION}.")
+
+        bodies = [_decode_body(body) for body in data['bodies']]
+        cassette = cls('replay', speed)
+        cassette.interactions = [
+            Interaction(offset, elapsed, method, url, tuple(tuple(pair) for pair in params), status_code, headers, bodies[body])
+            for offset, elapsed, method, url, params, status_code, headers, body in data['interactions']
+        ]
+        cassette.inbound = [InboundRequest(*row) for row in data['inbound']]
+        return cassette
+
+def _encode_body(content: bytes) -> str | list:
+    """ Bodies are stored as text, or as `['b64', ...]` if they are not utf-8. """
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        return ['b64', base64.b64encode(content).decode('ascii')]
+
+def _decode_body(body: str | list) -> bytes:
+    if isinstance(body, list):
+        return base64.b64decode(body[1])
+    return body.encode('utf-8')
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+def _set_cassette(cassette: Cassette | None) -> None:
+    get_transport().cassette = cassette
+    get_async_transport().cassette = cassette
+
+def start_recording() -> Cassette:
+    """ Starts recording the requests of the default transports into a new cassette & returns it. """
+    cassette = Cassette('record')
+    _set_cassette(cassette)
+    return cassette
+
+def start_replay(fp: str = CASSETTE_FILE_PATH, speed: float = 1.0) -> Cassette:
+    """ Makes the default transports answer every request from the cassette at `fp` instead of the upstreams. """
+    cassette = Cassette.load(fp, speed)
+    _set_cassette(cassette)
+    return cassette
+
+def stop_cassette() -> Cassette | None:
+    """ Stops recording or replaying & returns the cassette which was in use. """
+    cassette = get_transport().cassette
+    _set_cassette(None)
+    return cassette
+
+def _redact_pairs(pairs: iter) -> str:
+    """ Returns `(key, value)` pairs url encoded, with the values of secret keys redacted. """
+    return urlencode([(key, REDACTED if SECRET_KEYS.search(key) else value) for key, value in pairs])
+
+def _inbound_query() -> str:
+    """ Returns the query string of the current Flask request as it is recorded, with secret parameters (e.g. the `code` of an OAuth callback) redacted. """
+    return _redact_pairs(request.args.items(multi=True))
+
+def _inbound_body() -> str:
+    """ Returns the body of the current Flask request as it is recorded: form & json bodies with their secret fields redacted. Other bodies are not recorded. """
+    if request.method == 'GET':
+        return ''
+    if request.form:
+        return _redact_pairs(request.form.items(multi=True))
+    if request.is_json:
+        return json.dumps(redact(request.get_json(silent=True)), separators=(',', ':'))
+    return ''
+
+def configure_cassette(app: Flask, mode: str = '', fp: str = CASSETTE_FILE_PATH, speed: float = 1.0) -> Cassette | None:
+    """ Sets up the cassette of the server from its settings. `'record'` records the upstream traffic & every request the app receives, & saves them to `fp` when the server exits. `'replay'`
+    serves the upstream traffic from `fp`. Any other mode leaves the transports alone. """
+    if mode == 'replay':
+        return start_replay(fp, speed)
+    if mode != 'record':
+        return None
+
+    cassette = start_recording()
+
+    @app.before_request
+    def record_inbound() -> None:
+        cassette.record_inbound(request.method, request.path, _inbound_query(), _inbound_body())
+
+    atexit.register(cassette.save, fp)
+    return cassette
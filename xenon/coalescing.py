@@ -0,0 +1,123 @@
+# Import external modules
+import threading
+import asyncio
+
+class _Call():
+    """ An in-flight call which followers wait on. """
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: any = None
+        self.error: BaseException = None
+
+class SingleFlight():
+    """ Coalesces identical calls which are in flight at the same time. The first caller of a key (the leader) runs the call; every caller which arrives before it finishes waits & gets the same
+    result, or the same exception. Once the call is finished the key is forgotten, so nothing is cached. Threads & asyncio tasks are coalesced separately. """
+
+    def __init__(self) -> None:
+        self.enabled: bool = True
+
+        self.calls: int = 0
+        self.coalesced: int = 0
+
+        self._calls: dict = {}
+        self._async_calls: dict = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: any, fn: callable) -> any:
+        """ Runs `fn()` unless an identical call (same `key`) is already in flight, in which case its result is returned instead. """
+        if not self.enabled:
+            return fn()
+
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    async def do_async(self, key: any, fn: callable) -> any:
+        """ Awaitable version of `self.do()`. `fn` returns the awaitable to run. Calls are coalesced per event loop. If the leader is cancelled its followers are not: one of them runs the call
+        again as the new leader. """
+        if not self.enabled:
+            return await fn()
+
+        key = (asyncio.get_running_loop(), key)
+
+        with self._lock:
+            self.calls += 1
+
+        while True:
+            with self._lock:
+                future = self._async_calls.get(key)
+                is_leader = future is None
+                if is_leader:
+                    future = self._async_calls[key] = asyncio.get_running_loop().create_future()
+                else:
+                    self.coalesced += 1
+
+            if not is_leader:
+                try:
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    if not future.cancelled() or asyncio.current_task().cancelling():
+                        raise
+
+                # Only the leader was cancelled, so this caller takes over the call
+                with self._lock:
+                    self.coalesced -= 1
+                continue
+
+            try:
+                result = await fn()
+                future.set_result(result)
+                return result
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                # Mark the exception as retrieved so a leader without followers does not log a warning
+                future.exception()
+                raise
+            finally:
+                with self._lock:
+                    del self._async_calls[key]
+
+    def stats(self) -> dict:
+        """ Returns the number of calls made & how many of them were coalesced into another call. """
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced
+        }
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+_single_flight = SingleFlight()
+
+def get_single_flight() -> SingleFlight:
+    """ Returns the `SingleFlight()` used by `xenon.models.GetRequest()`. """
+    return _single_flight
@@ -39,3 +39,113 @@ class Users(db.Model):
 
     def __repr__(self) -> str:
         return f"<- [{self.id}] - {self.forename} {self.surname} - EMAIL: {self.email} HOUSEHOLD NAME: {self.household_name} ->"
+
+class ApiResponses(db.Model):
+    """ The database which keeps cached api responses across restarts. Shared by every worker process. """
+
+    __bind_key__ = 'apis'
+
+    key = db.Column(db.String, primary_key=True)
+    resource_type = db.Column(db.String, nullable=False, index=True)
+    status_code = db.Column(db.Integer, nullable=False)
+    headers = db.Column(db.JSON, nullable=False)
+    content = db.Column(db.LargeBinary, nullable=False)
+    etag = db.Column(db.String, nullable=True)
+    expires_at = db.Column(db.Float, nullable=False, index=True)
+    size = db.Column(db.Integer, nullable=False)
+    last_access = db.Column(db.Float, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<- [{self.resource_type}] - {self.key} - SIZE: {self.size} ->"
+
+class ApiEntities(db.Model):
+    """ The database which keeps individual Spotify catalog objects (albums, artists, tracks, audio features, ...) across restarts. Shared by every worker process. """
+
+    __bind_key__ = 'apis'
+
+    resource_type = db.Column(db.String, primary_key=True)
+    entity_id = db.Column(db.String, primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    expires_at = db.Column(db.Float, nullable=False, index=True)
+    size = db.Column(db.Integer, nullable=False)
+    last_access = db.Column(db.Float, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<- [{self.resource_type}] - {self.entity_id} - SIZE: {self.size} ->"
+
+class LibraryObjects(db.Model):
+    """ The database which keeps the Spotify objects (tracks, albums, shows, episodes & audiobooks) saved in the libraries mirrored by `xenon.spotify3.library`. Each object is stored once,
+    however many users saved it, so it is kept as fetched without a market & without the fields of one user. """
+
+    __bind_key__ = 'library'
+
+    collection = db.Column(db.String, primary_key=True)
+    item_id = db.Column(db.String, primary_key=True)
+    name = db.Column(db.String, nullable=False, index=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<- [{self.collection}] - {self.item_id} - NAME: {self.name} ->"
+
+class LibraryItems(db.Model):
+    """ The database which keeps which objects each user has saved & when. `sort_key` orders a library newest first: the `added_at` timestamp, or the position for collections without one. """
+
+    __bind_key__ = 'library'
+    __table_args__ = (db.Index('ix_library_items_order', 'user_id', 'collection', 'sort_key'),)
+
+    user_id = db.Column(db.String, primary_key=True)
+    collection = db.Column(db.String, primary_key=True)
+    item_id = db.Column(db.String, primary_key=True)
+    added_at = db.Column(db.String, nullable=True)
+    sort_key = db.Column(db.Float, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<- [{self.user_id}] - {self.collection} - {self.item_id} - ADDED AT: {self.added_at} ->"
+
+class LibrarySyncs(db.Model):
+    """ The database which keeps when each collection of each user was last synced & how many items Spotify reported. """
+
+    __bind_key__ = 'library'
+
+    user_id = db.Column(db.String, primary_key=True)
+    collection = db.Column(db.String, primary_key=True)
+    total = db.Column(db.Integer, nullable=False)
+    synced_at = db.Column(db.Float, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<- [{self.user_id}] - {self.collection} - TOTAL: {self.total} ->"
+
+class PlaylistSnapshots(db.Model):
+    """ The database which keeps the header of each playlist stored by `xenon.spotify3.playlist_store` & the `snapshot_id` its stored items belong to. Playlists are stored per user, as private
+    & collaborative playlists may only be read by some users, & per market, as the playability of their items depends on it. """
+
+    __bind_key__ = 'library'
+
+    user_id = db.Column(db.String, primary_key=True)
+    playlist_id = db.Column(db.String, primary_key=True)
+    market = db.Column(db.String, primary_key=True)
+    snapshot_id = db.Column(db.String, nullable=False)
+    header = db.Column(db.LargeBinary, nullable=False)
+    total = db.Column(db.Integer, nullable=False)
+    checked_at = db.Column(db.Float, nullable=False)
+    fetched_at = db.Column(db.Float, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<- [{self.playlist_id}] - {self.user_id} - {self.market} - SNAPSHOT: {self.snapshot_id} TOTAL: {self.total} ->"
+
+class PlaylistItems(db.Model):
+    """ The database which keeps the items of each stored playlist, in playlist order. """
+
+    __bind_key__ = 'library'
+
+    user_id = db.Column(db.String, primary_key=True)
+    playlist_id = db.Column(db.String, primary_key=True)
+    market = db.Column(db.String, primary_key=True)
+    position = db.Column(db.Integer, primary_key=True)
+    item_id = db.Column(db.String, nullable=True, index=True)
+    added_at = db.Column(db.String, nullable=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<- [{self.playlist_id}] - {self.user_id} - {self.market} - {self.position} - {self.item_id} ->"
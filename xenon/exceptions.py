@@ -1,6 +1,7 @@
 
 # Import internal modules
 from xenon.helpers import get_class_name
+from xenon.loggers import xenon_requests
 
 # Import external modules
 import logging
@@ -14,4 +15,30 @@ class BaseException(Exception):
         super().__init__(message)
 
         exception = get_class_name(self)
-        logger.error(f"{exception}: {message}")
\ No newline at end of file
+        logger.error(f"{exception}: {message}", extra={'sample_key': exception})
+
+class RequestError(BaseException):
+    def __init__(self, request: object) -> None:
+        """ Raised when a request sent on the caller's behalf (e.g. while paging through results) does not return a `200`. The failed request is kept as `self.request`. """
+
+        self.request = request
+        self.code: int = request.code
+
+        super().__init__(f"{get_class_name(request)} returned status code {request.code}", xenon_requests)
+
+class TokenError(BaseException):
+    def __init__(self, user: str, message: str) -> None:
+        """ Raised when the access token of `user` cannot be obtained or refreshed. """
+
+        self.user = user
+
+        super().__init__(f"Token of '{user}': {message}", xenon_requests)
+
+class CassetteError(BaseException):
+    def __init__(self, method: str, url: str) -> None:
+        """ Raised when a cassette which is being replayed has no recorded response for a request. """
+
+        self.method: str = method
+        self.url: str = url
+
+        super().__init__(f"No recorded response for {method} {url}", xenon_requests)
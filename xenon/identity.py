@@ -0,0 +1,96 @@
+# Import external modules
+from contextlib import contextmanager
+import contextvars
+import threading
+
+def merge_payload(kept: dict, data: dict) -> None:
+    """ Merges the json `data` into `kept` without losing anything `kept` already has: missing keys are added, nested dicts are merged the same way, a list replaces a shorter one & a value
+    replaces a `None`. Anything else in `kept` is left as it is, so a simplified payload (e.g. `available_markets: []` or a playlist's `tracks` as `{href, total}`) never overwrites a fuller one. """
+    for key, value in data.items():
+        if key not in kept or kept[key] is None:
+            kept[key] = value
+        elif isinstance(kept[key], dict) and isinstance(value, dict):
+            if kept[key] is not value:
+                merge_payload(kept[key], value)
+        elif isinstance(kept[key], list) and isinstance(value, list) and len(value) > len(kept[key]):
+            kept[key] = value
+
+class IdentityMap():
+    """ Keeps one instance per `(class, id)` so an entity which appears many times in a set of results (e.g. the album of every track on it) is only held once. Used through `identity_scope()`. """
+
+    def __init__(self) -> None:
+        self.lookups: int = 0
+        self.hits: int = 0
+
+        self._entities: dict = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def get(self, cls: type, id_: str) -> object | None:
+        """ Returns the instance of `cls` with `id_`, or `None` if there is none yet. """
+        with self._lock:
+            self.lookups += 1
+            instance = self._entities.get((cls, id_))
+            if instance is not None:
+                self.hits += 1
+            return instance
+
+    def add(self, cls: type, id_: str, instance: object) -> object:
+        """ Adds `instance` unless another thread added one first. Returns the instance which is kept. """
+        with self._lock:
+            return self._entities.setdefault((cls, id_), instance)
+
+    def clear(self) -> None:
+        """ Forgets every instance. """
+        with self._lock:
+            self._entities.clear()
+
+    @property
+    def lock(self) -> threading.RLock:
+        """ Held while an instance is merged so two threads do not merge into it at once. """
+        return self._lock
+
+    def stats(self) -> dict:
+        """ Returns the number of unique entities & how many lookups found an existing one. """
+        return {
+            'entities': len(self),
+            'lookups': self.lookups,
+            'hits': self.hits
+        }
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+_identity_map: contextvars.ContextVar = contextvars.ContextVar('xenon_identity_map', default=None)
+
+def current_identity_map() -> IdentityMap | None:
+    """ Returns the identity map of the current scope, or `None` if no scope is active. """
+    return _identity_map.get()
+
+@contextmanager
+def identity_scope(identity_map: IdentityMap = None) -> iter:
+    """
+    Within this scope models with `_interned = True` resolve to one shared instance per id. A fuller payload for an id which was first seen simplified (e.g. the full album after the album of a
+    track) is merged into the shared instance. The scope follows the context, so it covers the pagination & bulk helpers which copy the context onto their worker threads.
+
+    ---
+    ``` python
+    with identity_scope() as identity_map:
+        items = fetch_all_items(GetCurrentUsersSavedTracks)
+        tracks = [Track(item['track']) for item in items]
+
+    ```
+
+    Scopes can be nested; the inner scope starts empty unless an `identity_map` is given. Keep a scope to one request or one job, as every entity in it is held until the scope ends.
+    """
+
+    token = _identity_map.set(identity_map if identity_map is not None else IdentityMap())
+    try:
+        yield _identity_map.get()
+    finally:
+        _identity_map.reset(token)
@@ -1,22 +1,132 @@
-
 # Import external modules
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import logging
+import threading
+import datetime
+import atexit
+import queue
+import json
+import time
 
 LOGGING_FILE_PATH = 'instance/logs/'
 
+DEFAULT_FORMAT = '[%(levelname)s - %(levelno)s] | %(asctime)s | Line: %(lineno)d | Via: "%(name)s" | Msg: "%(message)s"'
+
+# The attributes every `logging.LogRecord()` has. Any other attribute was passed in `extra` & is added to the json output.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """ Formats each record as one line of json, so the logs can be searched & aggregated by field. Values passed in `extra` are added as fields. """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'line': record.lineno,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exc_info'] = record.exc_text
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value
+
+        return json.dumps(data, default=str)
+
+class SamplingFilter(logging.Filter):
+    """ Lets through at most `limit` records of each message every `interval` seconds. A message is its unformatted template (e.g. `"%s returned status code %s"`) or the `sample_key` passed in
+    `extra`, so a flood of one event is limited without hiding other events. Records at `always_level` or above always pass. The first record after a window which dropped records says how many were dropped in `suppressed`. """
+
+    def __init__(self, limit: int = 100, interval: float = 60.0, always_level: int = logging.ERROR) -> None:
+        super().__init__()
+
+        self.limit: int = limit
+        self.interval: float = interval
+        self.always_level: int = always_level
+
+        self._windows: dict = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.always_level:
+            return True
+
+        key = (record.name, getattr(record, 'sample_key', record.msg if isinstance(record.msg, str) else type(record.msg)))
+        now = time.monotonic()
+        with self._lock:
+            started, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - started >= self.interval:
+                started, count = now, 0
+
+            if count >= self.limit:
+                self._windows[key] = (started, count, suppressed + 1)
+                return False
+
+            self._windows[key] = (started, count + 1, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+class _BoundedQueueHandler(QueueHandler):
+    """ A `QueueHandler()` which drops records when its queue is full instead of blocking the caller, & counts them in `self.dropped`. """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped: int = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listeners: list = []
+
+def _stop_listeners() -> None:
+    """ Writes out the records which are still queued when the process exits. """
+    for listener in _listeners:
+        listener.stop()
+    _listeners.clear()
+
+atexit.register(_stop_listeners)
+
 # Logger class
-def new_logger(name: str, formatter: str = '[%(levelname)s - %(levelno)s] | %(asctime)s | Line: %(lineno)d | Via: "%(name)s" | Msg: "%(message)s"', level: int = logging.INFO) -> logging.Logger:
-    """ Creates, configures & formats a new logger which can be used across the server. """
+def new_logger(name: str, formatter: str = DEFAULT_FORMAT, level: int = logging.INFO, queued: bool = False, queue_size: int = 10000, max_bytes: int = 0, backup_count: int = 5,
+               json_format: bool = False, sampling: SamplingFilter = None) -> logging.Logger:
+    """
+    Creates, configures & formats a new logger which can be used across the server.
+
+    With `queued=True` the caller only puts each record on a queue of `queue_size` records & a background thread writes them to disk, so a slow disk never holds up a request. Records are dropped
+    (& counted) rather than blocking if the queue fills up. `max_bytes` rotates the file once it reaches that size, keeping `backup_count` old files. `json_format=True` writes one json object per
+    line instead of `formatter`. A `SamplingFilter()` limits how often each message is logged.
+    """
 
-    handler = logging.FileHandler(f"{LOGGING_FILE_PATH}{name}.log")
-    handler.setFormatter(logging.Formatter(formatter))
+    handler = RotatingFileHandler(f"{LOGGING_FILE_PATH}{name}.log", maxBytes=max_bytes, backupCount=backup_count)
+    handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(formatter))
 
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    logger.addHandler(handler)
 
+    if sampling is not None:
+        logger.addFilter(sampling)
+
+    if not queued:
+        logger.addHandler(handler)
+        return logger
+
+    queue_handler = _BoundedQueueHandler(queue.Queue(maxsize=queue_size))
+    listener = QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+    logger.addHandler(queue_handler)
     return logger
 
 # Create logger
-govee_logger = new_logger('govee')
-xenon_requests = new_logger('xenon_requests')
\ No newline at end of file
+govee_logger = new_logger('govee', queued=True, max_bytes=10 * 1024 * 1024)
+xenon_requests = new_logger('xenon_requests', queued=True, max_bytes=10 * 1024 * 1024, sampling=SamplingFilter())
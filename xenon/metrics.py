@@ -0,0 +1,181 @@
+# Import external modules
+from bisect import bisect_left
+import threading
+
+# Upper bounds of the latency histograms, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0)
+
+# name: (type, help)
+METRICS = {
+    'xenon_request_duration_seconds': ('histogram', "Time taken by a request as seen by the caller, including rate limit waits, retries & cache lookups."),
+    'xenon_upstream_latency_seconds': ('histogram', "Time taken by the final attempt of a request which reached the upstream."),
+    'xenon_requests_total': ('counter', "Requests sent through the transport, by status code. A status of error counts requests which raised."),
+    'xenon_response_bytes_total': ('counter', "Bytes of response bodies."),
+    'xenon_retries_total': ('counter', "Attempts which were retried."),
+    'xenon_queue_wait_seconds_total': ('counter', "Time requests spent waiting for the rate limit & retry backoff."),
+    'xenon_cache_requests_total': ('counter', "Cacheable requests by outcome: hit, revalidated or miss.")
+}
+
+class Histogram():
+    """ A cumulative histogram with fixed bucket bounds, as used by Prometheus. """
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: tuple = DURATION_BUCKETS) -> None:
+        self.buckets: tuple = buckets
+        self.counts: list = [0] * (len(buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list:
+        """ Returns `(upper bound, count of values <= bound)` for every bucket, ending with `+Inf`. """
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> float | None:
+        """ Estimates the `q` quantile (e.g. `0.99`) by interpolating within its bucket, as `histogram_quantile()` does in Prometheus. Returns `None` if nothing was observed. """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        lower_bound, lower_count = 0.0, 0
+        for bound, total in self.cumulative():
+            if total >= rank:
+                if bound == float('inf'):
+                    return self.buckets[-1]
+                return lower_bound + (bound - lower_bound) * (rank - lower_count) / max(total - lower_count, 1)
+            lower_bound, lower_count = bound, total
+        return self.buckets[-1]
+
+def _escape(value: any) -> str:
+    """ Escapes a label value as required by the text format. """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class Metrics():
+    """
+    Counters & latency histograms for every request sent through `xenon.transport`. Requests are labelled by `endpoint` (the request class, e.g. `GetPlaylistItems`) & `upstream` (e.g. `spotify`).
+
+    ---
+    ``` python
+    metrics = get_transport().metrics
+    metrics.quantiles()['GetPlaylistItems']    # {'count': 120, 'p50': 0.084, 'p99': 0.61}
+    metrics.render()                           # Prometheus text format, served on `/metrics`
+
+    ```
+    """
+
+    def __init__(self, buckets: tuple = DURATION_BUCKETS) -> None:
+        self.buckets: tuple = buckets
+
+        self._histograms: dict = {}
+        self._counters: dict = {}
+        self._lock = threading.Lock()
+
+    def _observe(self, name: str, labels: tuple, value: float) -> None:
+        histogram = self._histograms.get((name, labels))
+        if histogram is None:
+            histogram = self._histograms.setdefault((name, labels), Histogram(self.buckets))
+        histogram.observe(value)
+
+    def _increment(self, name: str, labels: tuple, value: float = 1) -> None:
+        self._counters[(name, labels)] = self._counters.get((name, labels), 0) + value
+
+    def observe_request(self, endpoint: str, upstream: str, method: str, status: int | str, duration: float, latency: float = None, size: int = 0, retries: int = 0, wait: float = 0.0,
+                        cache: str = None) -> None:
+        """ Records one request. `duration` is the time seen by the caller, `latency` the time of the final upstream attempt (`None` if the upstream was not reached). """
+        labels = (('endpoint', endpoint), ('upstream', upstream))
+
+        with self._lock:
+            self._observe('xenon_request_duration_seconds', labels, duration)
+            if latency is not None:
+                self._observe('xenon_upstream_latency_seconds', (('upstream', upstream),), latency)
+
+            self._increment('xenon_requests_total', labels + (('method', method), ('status', str(status))))
+            if size:
+                self._increment('xenon_response_bytes_total', labels, size)
+            if retries:
+                self._increment('xenon_retries_total', labels, retries)
+            if wait:
+                self._increment('xenon_queue_wait_seconds_total', (('upstream', upstream),), wait)
+            if cache is not None:
+                self._increment('xenon_cache_requests_total', labels + (('outcome', cache),))
+
+    def quantiles(self, quantiles: tuple = (0.5, 0.99)) -> dict:
+        """ Returns the request count & estimated duration quantiles of each endpoint, e.g. `{'GetTracks': {'count': 10, 'p50': 0.08, 'p99': 0.3}}`. """
+        result = {}
+        with self._lock:
+            for (name, labels), histogram in self._histograms.items():
+                if name != 'xenon_request_duration_seconds':
+                    continue
+
+                merged = result.setdefault(dict(labels)['endpoint'], Histogram(self.buckets))
+                merged.counts = [a + b for a, b in zip(merged.counts, histogram.counts)]
+                merged.count += histogram.count
+                merged.sum += histogram.sum
+
+        return {
+            endpoint: {'count': histogram.count, **{f"p{q * 100:g}": histogram.quantile(q) for q in quantiles}}
+            for endpoint, histogram in sorted(result.items())
+        }
+
+    def render(self) -> str:
+        """ Returns every metric in the Prometheus text exposition format. """
+        with self._lock:
+            histograms = {key: (histogram.cumulative(), histogram.count, histogram.sum) for key, histogram in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        for name, (type_, help_) in METRICS.items():
+            if type_ == 'histogram':
+                samples = sorted((labels, value) for (metric, labels), value in histograms.items() if metric == name)
+            else:
+                samples = sorted((labels, value) for (metric, labels), value in counters.items() if metric == name)
+            if not samples:
+                continue
+
+            lines.append(f"# HELP {name} {help_}")
+            lines.append(f"# TYPE {name} {type_}")
+            for labels, value in samples:
+                if type_ == 'histogram':
+                    cumulative, count, total = value
+                    for bound, bucket_count in cumulative:
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {bucket_count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {count}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """ Forgets every metric. """
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
@@ -1,10 +1,15 @@
 
 # Import internal modules
 from xenon.loggers import xenon_requests
+from xenon.helpers import get_class_name
 from xenon.exceptions import http_exceptions
+from xenon.transport import get_transport, get_async_transport, Response
+from xenon.coalescing import get_single_flight
+from xenon.identity import current_identity_map, merge_payload
+from xenon.projection import Projection
 
 # Import external modules
-import requests
+import asyncio
 import json
 
 class GetRequest():
@@ -23,8 +28,18 @@ class GetRequest():
     # This code will run if the Api has successfully returned the data
 
     ```
+
+    Inside a coroutine use `await ngr.create_request_async()` instead of `ngr.create_request()`.
+
+    If `self.decoder` is set (e.g. by `xenon.spotify3.structs.typed()`) the response bytes are decoded with `self.decoder.decode()` instead of being parsed into dicts, & `self._config_data()` is
+    not called as the decoder already returns the configured data.
+
+    `self.select()` sets a `Projection()`: only its fields are kept from the parsed json, before `self._config_data()` is called. Request classes whose api can filter the response itself set
+    `projection_param` to the name of that parameter (e.g. `fields` for Spotify playlists), in which case the projection is also sent upstream.
     """
 
+    projection_param: str = None
+
 
     def __init__(self, api_url: str = '', api_params: dict = {}, api_headers: dict = {}, cdq: bool = False) -> None:
         self.api_url: str = api_url
@@ -35,17 +50,64 @@ class GetRequest():
         self._data: dict = None
 
         self.cdq = cdq
+        self.decoder: object = None
+        self.projection: Projection = None
+
+    def select(self, projection: Projection | str) -> 'GetRequest':
+        """ Sets the projection of the request & returns the request. Must be called before the request is sent. """
+        if isinstance(projection, str):
+            projection = Projection(projection)
+
+        self.projection = projection
+        if self.projection_param is not None:
+            self.api_params = {**self.api_params, self.projection_param: projection.to_fields()}
+        return self
 
     def create_request(self) -> None:
         """ Deploys the request at this stage. The urls, parameters & headers are sent of with it. If `self.cdq` (config_data_query) is set to `True` then it calls `self._config_data()`. This however
-        will have to be created on the main object instead of this one """
+        will have to be created on the main object instead of this one
+
+        Identical requests (same class, url, parameters & authorization) which are in flight at the same time share one upstream call & its configured data. """
+
+        self.code, self._data = get_single_flight().do(self._coalesce_key(), self._send_request)
 
-        r = requests.get(url=self.api_url, params=self.api_params, headers=self.api_headers)
+    async def create_request_async(self) -> None:
+        """ Awaitable version of `self.create_request()`. The request is sent through the async transport and `self._config_data()` is called in exactly the same way. """
+
+        self.code, self._data = await get_single_flight().do_async(self._coalesce_key(), self._send_request_async)
+
+    def _coalesce_key(self) -> tuple:
+        """ Returns the key which identical requests share. The class, decoder & projection are included as they decide how the data is configured; the headers are included as they carry the authorization. """
+        params = tuple(sorted((key, str(value)) for key, value in self.api_params.items()))
+        headers = tuple(sorted((key, str(value)) for key, value in self.api_headers.items()))
+        return (type(self), self.decoder, self.projection, self.api_url, params, headers)
+
+    def _send_request(self) -> tuple:
+        """ Sends the request & returns `(self.code, self._data)`. """
+        r = get_transport().request('GET', self.api_url, params=self.api_params, headers=self.api_headers, endpoint=get_class_name(self))
+        self._handle_response(r)
+        return (self.code, self._data)
+
+    async def _send_request_async(self) -> tuple:
+        """ Awaitable version of `self._send_request()`. """
+        r = await get_async_transport().request('GET', self.api_url, params=self.api_params, headers=self.api_headers, endpoint=get_class_name(self))
+        self._handle_response(r)
+        return (self.code, self._data)
+
+    def _handle_response(self, r: Response) -> None:
+        """ Stores the status code & data of the response. If the request succeeded & `self.cdq` is `True` then `self._config_data()` is called. """
 
         self.code = r.status_code
+
+        if self.code == 200 and self.decoder is not None:
+            self._data = self.decoder.decode(r.content)
+            return
+
         self._data = r.json()
 
         if self.code == 200:
+            if self.projection is not None:
+                self._data = self.projection.apply(self._data)
             if self.cdq:
                 self._config_data()
 
@@ -76,8 +138,15 @@ class PutRequest():
         self._data: dict = None
 
     def create_request(self) -> None:
-        r = requests.put(url=self.api_url, params=self.api_params, headers=self.api_headers, data=json.dumps(self.api_payload))
+        r = get_transport().request('PUT', self.api_url, params=self.api_params, headers=self.api_headers, data=json.dumps(self.api_payload), endpoint=get_class_name(self))
+        self._handle_response(r)
+
+    async def create_request_async(self) -> None:
+        """ Awaitable version of `self.create_request()`. """
+        r = await get_async_transport().request('PUT', self.api_url, params=self.api_params, headers=self.api_headers, data=json.dumps(self.api_payload), endpoint=get_class_name(self))
+        self._handle_response(r)
 
+    def _handle_response(self, r: Response) -> None:
         self.code = r.status_code
         self._data = r.text
 
@@ -92,8 +161,15 @@ class DeleteRequest():
         self._data: dict = None
 
     def create_request(self) -> None:
-        r = requests.delete(url=self.api_url, params=self.api_params, headers=self.api_headers)
+        r = get_transport().request('DELETE', self.api_url, params=self.api_params, headers=self.api_headers, endpoint=get_class_name(self))
+        self._handle_response(r)
 
+    async def create_request_async(self) -> None:
+        """ Awaitable version of `self.create_request()`. """
+        r = await get_async_transport().request('DELETE', self.api_url, params=self.api_params, headers=self.api_headers, endpoint=get_class_name(self))
+        self._handle_response(r)
+
+    def _handle_response(self, r: Response) -> None:
         self.code = r.status_code
         self._data = r.text
 
@@ -110,8 +186,15 @@ class PostRequest():
         self.cdq = cdq
 
     def create_request(self) -> None:
-        r = requests.delete(url=self.api_url, params=self.api_params, headers=self.api_headers)
+        r = get_transport().request('POST', self.api_url, params=self.api_params, headers=self.api_headers, data=json.dumps(self.api_payload), endpoint=get_class_name(self))
+        self._handle_response(r)
+
+    async def create_request_async(self) -> None:
+        """ Awaitable version of `self.create_request()`. """
+        r = await get_async_transport().request('POST', self.api_url, params=self.api_params, headers=self.api_headers, data=json.dumps(self.api_payload), endpoint=get_class_name(self))
+        self._handle_response(r)
 
+    def _handle_response(self, r: Response) -> None:
         self.code = r.status_code
         self._data = r.json()
 
@@ -123,9 +206,284 @@ class PostRequest():
         """ Returns the whole data package of the object. This should be used instead of `self._data`. """
         return self._data
 
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class AsyncGetRequest(GetRequest):
+    """ Same as `GetRequest()` except `create_request()` is awaitable. Use this as the inheritance for request classes which are only ever used from asyncio code. """
+
+    async def create_request(self) -> None:
+        await self.create_request_async()
+
+class AsyncPutRequest(PutRequest):
+    """ Same as `PutRequest()` except `create_request()` is awaitable. """
+
+    async def create_request(self) -> None:
+        await self.create_request_async()
+
+class AsyncDeleteRequest(DeleteRequest):
+    """ Same as `DeleteRequest()` except `create_request()` is awaitable. """
+
+    async def create_request(self) -> None:
+        await self.create_request_async()
+
+class AsyncPostRequest(PostRequest):
+    """ Same as `PostRequest()` except `create_request()` is awaitable. """
+
+    async def create_request(self) -> None:
+        await self.create_request_async()
+
+async def gather_requests(requests: list, limit: int = 10, return_exceptions: bool = False) -> list:
+    """ Sends every request in `requests` concurrently, with at most `limit` in flight at once. Any request class can be passed in as `create_request_async()` is used. Returns the requests in the
+    order they were given; each has its `code` & data set. """
+
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _send(request: object) -> object:
+        async with semaphore:
+            await request.create_request_async()
+        return request
+
+    return await asyncio.gather(*[_send(request) for request in requests], return_exceptions=return_exceptions)
+
+def run_requests(requests: list, limit: int = 10) -> list:
+    """ Blocking wrapper around `gather_requests()` for code which is not running an event loop (e.g. a flask view). The event loop's connections are closed once every request is finished. """
+
+    async def _run() -> list:
+        try:
+            return await gather_requests(requests, limit)
+        finally:
+            await get_async_transport().close()
+
+    return asyncio.run(_run())
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
 class ObjectScaffold():
+    """ Models with `_interned = True` resolve to one shared instance per id while an `xenon.identity.identity_scope()` is active; a later payload for the same id is merged into the shared
+    instance with `xenon.identity.merge_payload()`, which only adds to it. `_nested` maps keys of the json to the interned models they hold, so e.g. the album json of every track on an album is
+    the same dict. """
+
+    _interned: bool = False
+    _nested: dict = {}
+
+    def __new__(cls, data: dict = None, *args, **kwargs) -> object:
+        identity_map = current_identity_map() if cls._interned else None
+        if identity_map is not None and isinstance(data, dict) and data.get('id') is not None:
+            existing = identity_map.get(cls, data['id'])
+            if existing is not None:
+                return existing
+        return super().__new__(cls)
+
     def __init__(self, data: dict) -> None:
-        self._data = data
+        identity_map = current_identity_map() if self._interned else None
+        if identity_map is None or not isinstance(data, dict) or data.get('id') is None:
+            self._data = data
+            return
+
+        self._intern_nested(data)
+
+        with identity_map.lock:
+            if '_data' in vars(self):
+                merge_payload(self._data, data)
+                return
+            self._data = data
+
+            kept = identity_map.add(type(self), data['id'], self)
+            if kept is not self:
+                merge_payload(kept._data, data)
+                self._data = kept._data
+
+    def _intern_nested(self, data: dict) -> None:
+        """ Replaces the nested json listed in `_nested` with the json of the shared instances. """
+        for key, model in self._nested.items():
+            value = data.get(key)
+            if isinstance(value, dict):
+                data[key] = model(value).get_data()
+            elif isinstance(value, list):
+                data[key] = [model(item).get_data() if isinstance(item, dict) else item for item in value]
 
     def get_data(self):
-        return self._data
\ No newline at end of file
+        return self._data
+
+class LazyField():
+    """ A field of a `SlotScaffold()` which holds a nested object. The raw json is kept until the field is first read, at which point it is decoded with `decoder` & the raw json is dropped.
+    `decoder` is given the raw json, which may be `None`. `prepare` can be given to shrink the raw json while it is kept (e.g. to share lists which are common to many objects), in which case
+    `export` turns it back into json for `get_data()`. """
+
+    def __init__(self, key: str, decoder: callable, prepare: callable = None, export: callable = None) -> None:
+        self.key: str = key
+        self.decoder: callable = decoder
+        self.prepare: callable = prepare
+        self.export: callable = export
+
+        self.name: str = None
+        self.slot: str = None
+        self.bit: int = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.slot = f"_{name}"
+        self.bit = 1 << sum(1 for value in vars(owner).values() if isinstance(value, LazyField) and value.bit is not None)
+
+    def __get__(self, obj: object, owner: type = None) -> any:
+        if obj is None:
+            return self
+
+        value = getattr(obj, self.slot)
+        if not obj._decoded & self.bit:
+            value = self.decoder(value)
+            setattr(obj, self.slot, value)
+            obj._decoded |= self.bit
+        return value
+
+    def raw(self, obj: object) -> any:
+        """ Returns the json of the field on `obj`, whether or not it has been decoded. """
+        value = getattr(obj, self.slot)
+        if not obj._decoded & self.bit:
+            if value is not None and self.export is not None:
+                return self.export(value)
+            return value
+        if isinstance(value, list):
+            return [item.get_data() if isinstance(item, (ObjectScaffold, SlotScaffold)) else item for item in value]
+        if isinstance(value, (ObjectScaffold, SlotScaffold)):
+            return value.get_data()
+        return value
+
+class SlotScaffold():
+    """
+    A compact alternative to `ObjectScaffold()`. Instead of keeping the whole json package, the fields listed in `_fields` are copied into `__slots__` once when the object is created & the rest
+    of the json is dropped. Nested objects are declared with `LazyField()` & are only decoded when they are first read.
+
+    ---
+    ``` python
+    class Track(SlotScaffold):
+        __slots__ = ('name', 'track_id', '_linked_album')
+        _fields = {'name': 'name', 'track_id': 'id'}
+
+        linked_album = LazyField('album', Album)
+
+    ```
+
+    Every name in `_fields` & every `LazyField()` (prefixed with `_`) must be listed in `__slots__`. A key can be a tuple to read a nested value, e.g. `('followers', 'total')`. Missing keys are `None`.
+    `_converters` maps field names to a callable which is applied to the value as it is copied, e.g. `shared_tuple` for lists which many objects have in common. `_exporters` reverses a converter
+    for `get_data()` where the converted value is not json.
+
+    Like `ObjectScaffold()`, models with `_interned = True` resolve to one shared instance per id within an `xenon.identity.identity_scope()`. Fields the shared instance is missing are filled in
+    from later payloads.
+    """
+
+    __slots__ = ('_decoded',)
+
+    _fields: dict = {}
+    _converters: dict = {}
+    _exporters: dict = {}
+    _lazy_fields: tuple = ()
+    _interned: bool = False
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._lazy_fields = tuple(value for value in vars(cls).values() if isinstance(value, LazyField))
+
+    def __new__(cls, data: dict | ObjectScaffold = None, *args, **kwargs) -> object:
+        identity_map = current_identity_map() if cls._interned else None
+        if identity_map is not None:
+            if isinstance(data, ObjectScaffold):
+                data = data.get_data()
+            if isinstance(data, dict) and data.get('id') is not None:
+                existing = identity_map.get(cls, data['id'])
+                if existing is not None:
+                    return existing
+        return super().__new__(cls)
+
+    def __init__(self, data: dict | ObjectScaffold) -> None:
+        if isinstance(data, ObjectScaffold):
+            data = data.get_data()
+
+        identity_map = current_identity_map() if self._interned else None
+        if identity_map is None or data.get('id') is None:
+            self._decoded: int = 0
+            self._copy(data, False)
+            return
+
+        with identity_map.lock:
+            is_shared = hasattr(self, '_decoded')
+            if not is_shared:
+                self._decoded = 0
+            self._copy(data, is_shared)
+
+            if not is_shared:
+                kept = identity_map.add(type(self), data['id'], self)
+                if kept is not self:
+                    kept._copy(data, True)
+
+    def _copy(self, data: dict, only_missing: bool) -> None:
+        """ Copies the fields out of `data`. If `only_missing` is `True` then only fields which are `None` are set. """
+        for name, key in self._fields.items():
+            if only_missing and getattr(self, name) is not None:
+                continue
+
+            value = _lookup(data, key)
+            if value is not None and name in self._converters:
+                value = self._converters[name](value)
+            setattr(self, name, value)
+
+        for field in self._lazy_fields:
+            if only_missing and (self._decoded & field.bit or getattr(self, field.slot) is not None):
+                continue
+
+            value = data.get(field.key)
+            if value is not None and field.prepare is not None:
+                value = field.prepare(value)
+            setattr(self, field.slot, value)
+
+    def __repr__(self) -> str:
+        shown = [name for name in self._fields if name == 'name' or name.endswith('_id')]
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in shown)})"
+
+    def get_data(self) -> dict:
+        """ Rebuilds the json package from the fields which were kept. Fields which are not listed in `_fields` are not included. """
+        data = {}
+        for name, key in self._fields.items():
+            value = getattr(self, name)
+            if value is not None and name in self._exporters:
+                value = self._exporters[name](value)
+            _assign(data, key, value)
+        for field in self._lazy_fields:
+            data[field.key] = field.raw(self)
+        return data
+
+_shared_tuples: dict = {}
+
+def shared_tuple(values: list) -> tuple:
+    """ Returns `values` as a tuple which is shared with every other equal tuple made by this function. Lists such as `available_markets` are the same for most objects, so this keeps one copy. """
+    values = tuple(values)
+    return _shared_tuples.setdefault(values, values)
+
+def _lookup(data: dict, key: str | tuple) -> any:
+    """ Reads `key` from `data`, following every part of the key if it is a tuple. Returns `None` if any part is missing. """
+    if not isinstance(key, tuple):
+        return data.get(key)
+
+    for part in key:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+def _assign(data: dict, key: str | tuple, value: any) -> None:
+    """ Reverse of `_lookup()`. """
+    if not isinstance(key, tuple):
+        data[key] = value
+        return
+
+    for part in key[:-1]:
+        data = data.setdefault(part, {})
+    data[key[-1]] = value
@@ -0,0 +1,278 @@
+# Import internal modules
+from xenon.databases import db, ApiResponses, ApiEntities
+from xenon.cache import CacheEntry
+from xenon.transport import get_transport
+from xenon.spotify3.market_set import MarketSet
+
+# Import external modules
+from urllib.parse import urlsplit
+from flask import Flask
+import threading
+import json
+import time
+
+# How long each type of Spotify catalog object is kept in `ApiEntities`, in seconds. Types which are not listed are not kept.
+ENTITY_TTLS = {
+    'albums': 30 * 24 * 60 * 60,
+    'artists': 24 * 60 * 60,
+    'tracks': 7 * 24 * 60 * 60,
+    'shows': 24 * 60 * 60,
+    'episodes': 7 * 24 * 60 * 60,
+    'audiobooks': 7 * 24 * 60 * 60,
+    'audio-features': 365 * 24 * 60 * 60
+}
+
+# Eviction is checked once every this many writes rather than on every write
+_EVICTION_INTERVAL = 100
+
+# Reads note the rows they used in memory; the access times are written in one batch once this many seconds have passed, so a read does not open a write transaction
+_TOUCH_INTERVAL = 30.0
+
+def resource_type_of(key: str) -> str:
+    """ Returns the resource type of a `ResponseCache()` key, the first path segment after the api version (e.g. `albums`, `audio-features`). """
+    url = key.split(':', 1)[1]
+    segments = [segment for segment in urlsplit(url).path.split('/') if segment]
+
+    if len(segments) > 1 and segments[0] == 'v1':
+        return segments[1]
+    return segments[0] if segments else ''
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+def _pack_markets(entity: dict) -> dict:
+    """ Returns a copy of `entity` with its `available_markets` replaced by `_markets`, a `MarketSet()` hex string. The album of a track is packed as well. """
+    if not isinstance(entity, dict):
+        return entity
+
+    packed = dict(entity)
+    if isinstance(packed.get('available_markets'), list):
+        packed['_markets'] = MarketSet.from_codes(packed.pop('available_markets')).to_hex()
+    if isinstance(packed.get('album'), dict):
+        packed['album'] = _pack_markets(packed['album'])
+    return packed
+
+def _unpack_markets(entity: dict) -> dict:
+    """ Reverse of `_pack_markets()`. """
+    if not isinstance(entity, dict):
+        return entity
+
+    if '_markets' in entity:
+        entity['available_markets'] = MarketSet.from_hex(entity.pop('_markets')).to_list()
+    if isinstance(entity.get('album'), dict):
+        _unpack_markets(entity['album'])
+    return entity
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class _Store():
+    """ Shared logic of the stores on the `apis` bind. Every method opens its own app context so the stores can be used from worker threads & outside of a flask request. """
+
+    model: db.Model = None
+
+    def __init__(self, app: Flask, max_bytes: int) -> None:
+        self.app: Flask = app
+        self.max_bytes: int = max_bytes
+
+        self._writes: int = 0
+        self._touched: dict = {}
+        self._flushed_at: float = time.time()
+        self._lock = threading.Lock()
+
+    def _count_write(self) -> bool:
+        """ Counts a write & returns `True` when the size limit should be checked. """
+        with self._lock:
+            self._writes += 1
+            return self._writes % _EVICTION_INTERVAL == 0
+
+    def _touch(self, primary_keys: list) -> None:
+        """ Notes that the rows of `primary_keys` (tuples in the order of the primary key columns of `self.model`) were read. The access times are written by `_flush_touches()` once
+        `_TOUCH_INTERVAL` has passed since the last batch. Must be called within an app context. """
+        now = time.time()
+        with self._lock:
+            for primary_key in primary_keys:
+                self._touched[primary_key] = now
+            if now - self._flushed_at < _TOUCH_INTERVAL:
+                return
+
+        self._flush_touches()
+
+    def _flush_touches(self) -> None:
+        """ Writes the pending access times in one transaction. Rows which were removed in the meantime are skipped. Must be called within an app context. """
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            self._flushed_at = time.time()
+        if not touched:
+            return
+
+        columns = [column.key for column in self.model.__mapper__.primary_key]
+        condition = db.and_(*[self.model.__table__.c[column] == db.bindparam(f"_{column}") for column in columns])
+        statement = self.model.__table__.update().where(condition).values(last_access=db.bindparam('_last_access'))
+
+        db.session.execute(statement, [{**{f"_{column}": value for column, value in zip(columns, primary_key)}, '_last_access': accessed_at} for primary_key, accessed_at in touched.items()])
+        db.session.commit()
+
+    def _evict(self, model: db.Model) -> int:
+        """ Removes expired rows of `model`, then the least recently used rows until the table is within `self.max_bytes`. Returns the number of rows removed. """
+        self._flush_touches()
+        now = time.time()
+        removed = model.query.filter(model.expires_at <= now).delete()
+
+        total = db.session.query(db.func.coalesce(db.func.sum(model.size), 0)).scalar()
+        while total > self.max_bytes:
+            rows = model.query.order_by(model.last_access).limit(_EVICTION_INTERVAL).all()
+            if not rows:
+                break
+
+            for row in rows:
+                total -= row.size
+                db.session.delete(row)
+                removed += 1
+
+                if total <= self.max_bytes:
+                    break
+
+        db.session.commit()
+        return removed
+
+class PersistentResponseStore(_Store):
+    """ A `ResponseCache()` backend which keeps responses in the `ApiResponses` table. Entries keep the expiry given to them by the memory cache, which is set per endpoint. Keys are scoped by
+    user id rather than access token (see `xenon.cache.cache_scope()`), so stored responses are still found after a restart or a token refresh. """
+
+    model = ApiResponses
+
+    def __init__(self, app: Flask, max_bytes: int = 256 * 1024 * 1024) -> None:
+        super().__init__(app, max_bytes)
+
+    def get(self, key: str) -> CacheEntry | None:
+        """ Returns the entry of `key`, fresh or stale, or `None` if there is none. """
+        with self.app.app_context():
+            row = db.session.get(ApiResponses, key)
+            if row is None:
+                return None
+
+            self._touch([(key,)])
+            return CacheEntry(row.status_code, row.headers, row.content, row.etag, row.expires_at)
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """ Stores or replaces the entry of `key`. """
+        with self.app.app_context():
+            db.session.merge(ApiResponses(
+                key=key,
+                resource_type=resource_type_of(key),
+                status_code=entry.status_code,
+                headers=dict(entry.headers),
+                content=entry.content,
+                etag=entry.etag,
+                expires_at=entry.expires_at,
+                size=entry.size,
+                last_access=time.time()
+            ))
+            db.session.commit()
+
+            if self._count_write():
+                self._evict(ApiResponses)
+
+    def evict(self) -> int:
+        """ Removes expired entries & enforces the size limit straight away. Returns the number of entries removed. """
+        with self.app.app_context():
+            return self._evict(ApiResponses)
+
+class EntityStore(_Store):
+    """ Keeps individual Spotify catalog objects keyed by resource type & id in the `ApiEntities` table, each for the ttl of its type in `ENTITY_TTLS`. Unlike `PersistentResponseStore()` an
+    object can be reused by any request which includes its id, whichever other ids were requested with it. """
+
+    model = ApiEntities
+
+    def __init__(self, app: Flask, ttls: dict = None, max_bytes: int = 512 * 1024 * 1024) -> None:
+        super().__init__(app, max_bytes)
+
+        self.ttls: dict = ttls if ttls is not None else ENTITY_TTLS
+
+    def ttl_for(self, resource_type: str) -> float | None:
+        """ Returns the ttl of `resource_type`. A type can be scoped with `@` (e.g. `tracks@gb`), in which case the ttl of the base type is used. """
+        return self.ttls.get(resource_type.split('@', 1)[0])
+
+    def get_many(self, resource_type: str, ids: list) -> dict:
+        """ Returns a dict of `{id: data}` for the ids which are stored & have not expired. """
+        if self.ttl_for(resource_type) is None or not ids:
+            return {}
+
+        now = time.time()
+        found = {}
+
+        with self.app.app_context():
+            rows = ApiEntities.query.filter(ApiEntities.resource_type == resource_type, ApiEntities.entity_id.in_(ids), ApiEntities.expires_at > now).all()
+
+            for row in rows:
+                found[row.entity_id] = self.decode(resource_type, row.data)
+
+            self._touch([(resource_type, entity_id) for entity_id in found])
+
+        return found
+
+    def put_many(self, resource_type: str, entities: list) -> None:
+        """ Stores a list of catalog objects (dicts with an `id`). `None` entries, which Spotify returns for unknown ids, are skipped. """
+        ttl = self.ttl_for(resource_type)
+        if ttl is None:
+            return
+
+        now = time.time()
+        expires_at = now + ttl
+
+        with self.app.app_context():
+            for entity in entities:
+                if entity is None:
+                    continue
+
+                data = self.encode(resource_type, entity)
+                db.session.merge(ApiEntities(resource_type=resource_type, entity_id=entity['id'], data=data, expires_at=expires_at, size=len(data), last_access=now))
+            db.session.commit()
+
+            if self._count_write():
+                self._evict(ApiEntities)
+
+    def encode(self, resource_type: str, entity: dict) -> bytes:
+        """ Converts a catalog object into the bytes which are stored. `available_markets` lists (of the object & of its album) are stored as `MarketSet()` hex strings. """
+        return json.dumps(_pack_markets(entity), separators=(',', ':')).encode('utf-8')
+
+    def decode(self, resource_type: str, data: bytes) -> dict:
+        """ Converts stored bytes back into a catalog object. """
+        return _unpack_markets(json.loads(data))
+
+    def evict(self) -> int:
+        """ Removes expired objects & enforces the size limit straight away. Returns the number of objects removed. """
+        with self.app.app_context():
+            return self._evict(ApiEntities)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+_entity_store: EntityStore = None
+
+def get_entity_store() -> EntityStore | None:
+    """ Returns the entity store set up by `configure_persistent_cache()`, or `None` if it has not been set up. """
+    return _entity_store
+
+def configure_persistent_cache(app: Flask, response_max_bytes: int = 256 * 1024 * 1024, entity_max_bytes: int = 512 * 1024 * 1024) -> None:
+    """ Creates the tables of the `apis` bind & makes the default transport cache persist its responses there. Also sets up the entity store used by the bulk Spotify requests. """
+    global _entity_store
+
+    with app.app_context():
+        db.create_all(bind_key='apis')
+
+    cache = get_transport().cache
+    if cache is not None:
+        cache.backend = PersistentResponseStore(app, response_max_bytes)
+
+    _entity_store = EntityStore(app, max_bytes=entity_max_bytes)
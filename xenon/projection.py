@@ -0,0 +1,183 @@
+""" Projections keep only the fields of a response which are needed, so the rest of the json is dropped straight after parsing instead of being held by the models. The syntax is the same as the
+`fields` parameter of the Spotify api, so a projection can also be sent upstream where the api supports it:
+
+---
+``` python
+projection = Projection('total,next,items(added_at,track(name,id,album(name)))')
+projection.apply(data)
+
+# A dot is short for a group with one field; `!` keeps every field except the ones listed
+Projection('items.track(name,album(!available_markets))')
+
+# Request classes take a projection with `select()`
+ngr = GetPlaylistItems(playlist_id).select('items(track(name,id))')
+```
+"""
+
+class _Node():
+    """ The fields kept at one level of the json. `include` maps a field to the `_Node()` of its own fields, or `None` to keep the whole value; `exclude` lists fields to drop instead. """
+
+    __slots__ = ('include', 'exclude')
+
+    def __init__(self) -> None:
+        self.include: dict = {}
+        self.exclude: set = set()
+
+    def add(self, path: list, child: '_Node | None') -> None:
+        """ Adds `path` (a list of field names) with `child` as the node of its last field. Keeping a whole value always wins over keeping part of it. """
+        name = path[0]
+        if len(path) > 1:
+            node = self.include.setdefault(name, _Node())
+            if node is not None:
+                node.add(path[1:], child)
+            return
+
+        if name not in self.include:
+            self.include[name] = child
+        elif self.include[name] is not None:
+            if child is None:
+                self.include[name] = None
+            else:
+                self.include[name].merge(child)
+
+    def merge(self, other: '_Node') -> None:
+        """ Adds every field of `other` to this node. """
+        for name, child in other.include.items():
+            self.add([name], child)
+        self.exclude |= other.exclude
+
+    def apply(self, data: any) -> any:
+        if isinstance(data, list):
+            return [self.apply(item) for item in data]
+        if not isinstance(data, dict):
+            return data
+
+        if self.include:
+            projected = {}
+            for name, child in self.include.items():
+                if name in data:
+                    projected[name] = data[name] if child is None else child.apply(data[name])
+            return projected
+        return {name: value for name, value in data.items() if name not in self.exclude}
+
+    def to_fields(self) -> str:
+        if self.include:
+            return ','.join(name if child is None else f"{name}({child.to_fields()})" for name, child in self.include.items())
+        return ','.join(f"!{name}" for name in sorted(self.exclude))
+
+class Projection():
+    """ A parsed set of fields. Projections are immutable, hashable & equal when they keep the same fields. `+` combines two projections. """
+
+    def __init__(self, fields: str = '') -> None:
+        self._root: _Node = _Parser(fields).parse()
+        self._fields: str = self._root.to_fields()
+
+    @classmethod
+    def from_model(cls, model: type) -> 'Projection':
+        """ Builds the projection of the fields a compact model (`xenon.models.SlotScaffold()`) copies. Lazy fields are kept whole. """
+        root = _Node()
+        for key in model._fields.values():
+            root.add(list(key) if isinstance(key, tuple) else [key], None)
+        for field in model._lazy_fields:
+            root.add([field.key], None)
+
+        projection = cls()
+        projection._root = root
+        projection._fields = root.to_fields()
+        return projection
+
+    def apply(self, data: any) -> any:
+        """ Returns a copy of `data` with only the fields of the projection. Lists are projected item by item. """
+        return self._root.apply(data)
+
+    def to_fields(self) -> str:
+        """ Returns the projection in the syntax of the Spotify `fields` parameter. """
+        return self._fields
+
+    def __add__(self, other: 'Projection') -> 'Projection':
+        return Projection(f"{self._fields},{other._fields}")
+
+    def __bool__(self) -> bool:
+        return bool(self._fields)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Projection):
+            return NotImplemented
+        return self._fields == other._fields
+
+    def __hash__(self) -> int:
+        return hash(self._fields)
+
+    def __repr__(self) -> str:
+        return f"Projection({self._fields!r})"
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class _Parser():
+    """ Recursive descent parser of the `fields` syntax: `fields := item (',' item)*`, `item := '!'? name ('.' name)* ('(' fields ')')?`. """
+
+    def __init__(self, text: str) -> None:
+        self.text: str = text.replace(' ', '')
+        self.position: int = 0
+
+    def parse(self) -> _Node:
+        node = self._fields()
+        if self.position != len(self.text):
+            self._error("Unexpected ')'")
+        return node
+
+    def _fields(self) -> _Node:
+        node = _Node()
+        if self._peek() in ('', ')'):
+            return node
+
+        while True:
+            self._item(node)
+            if self._peek() != ',':
+                return node
+            self.position += 1
+
+    def _item(self, node: _Node) -> None:
+        is_excluded = self._peek() == '!'
+        if is_excluded:
+            self.position += 1
+
+        path = [self._name()]
+        while self._peek() == '.':
+            self.position += 1
+            path.append(self._name())
+
+        child = None
+        if self._peek() == '(':
+            self.position += 1
+            child = self._fields()
+            if self._peek() != ')':
+                self._error("Expected ')'")
+            self.position += 1
+
+        if not is_excluded:
+            node.add(path, child)
+            return
+
+        if len(path) > 1 or child is not None:
+            self._error("Only a single field can be excluded")
+        node.exclude.add(path[0])
+
+    def _name(self) -> str:
+        start = self.position
+        while self.position < len(self.text) and self.text[self.position] not in ',.()!':
+            self.position += 1
+
+        if start == self.position:
+            self._error("Expected a field name")
+        return self.text[start:self.position]
+
+    def _peek(self) -> str:
+        return self.text[self.position] if self.position < len(self.text) else ''
+
+    def _error(self, message: str) -> None:
+        raise ValueError(f"{message} at position {self.position} of projection '{self.text}'.")
@@ -0,0 +1,194 @@
+# Import external modules
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import threading
+import datetime
+import random
+import time
+
+UPSTREAMS = {
+    'api.spotify.com': 'spotify',
+    'accounts.spotify.com': 'spotify',
+    'developer-api.govee.com': 'govee',
+    'api.satchelone.com': 'satchelone'
+}
+
+# (requests per second, burst)
+DEFAULT_LIMITS = {
+    'spotify': (10.0, 20),
+    'govee': (1.0, 10),
+    'satchelone': (5.0, 10)
+}
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ('GET',)
+
+def parse_retry_after(value: str) -> float | None:
+    """ Converts a `Retry-After` header, which is either a number of seconds or a http date, into a number of seconds. Returns `None` if it cannot be parsed. """
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_dt - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class TokenBucket():
+    """ A thread safe token bucket. `rate` tokens are added every second up to `capacity`. Callers reserve a token & are told how long to wait for it, so requests queue up fairly rather than all
+    retrying at once. The bucket can be paused (e.g. after a `Retry-After`) which holds back every reservation until the pause ends. """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate: float = rate
+        self.capacity: int = capacity
+
+        self._tokens: float = capacity
+        self._updated: float = time.monotonic()
+        self._paused_until: float = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """ Takes a token & returns the number of seconds the caller has to wait before using it. """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """ Holds back every reservation for `seconds`. An existing longer pause is kept. """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+class UpstreamStats():
+    """ Counters kept for each upstream by `Scheduler()`. """
+
+    def __init__(self) -> None:
+        self.requests: int = 0
+        self.queued: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+        self.throttled: int = 0
+        self.retries: int = 0
+
+    @property
+    def average_wait(self) -> float:
+        """ The average number of seconds a queued request waited. """
+        if not self.queued:
+            return 0.0
+        return self.total_wait / self.queued
+
+    def to_dict(self) -> dict:
+        """ Returns the counters as a dict. """
+        return {
+            'requests': self.requests,
+            'queued': self.queued,
+            'total_wait': self.total_wait,
+            'average_wait': self.average_wait,
+            'max_wait': self.max_wait,
+            'throttled': self.throttled,
+            'retries': self.retries
+        }
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class Scheduler():
+    """ Rate limits the requests sent by the transports in `xenon.transport`. Each upstream (Spotify, Govee, SatchelOne) has its own `TokenBucket()`; a `429` with a `Retry-After` header pauses
+    that upstream's bucket. Idempotent requests (GET) are retried on `429` & `5xx` with jittered exponential backoff. Hosts which are not in `UPSTREAMS` are not rate limited. """
+
+    def __init__(self, limits: dict = None, max_retries: int = 3, backoff_base: float = 0.5, backoff_cap: float = 30.0) -> None:
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_cap: float = backoff_cap
+
+        self._buckets: dict = {}
+        self._stats: dict = {}
+        self._lock = threading.Lock()
+
+        for upstream, (rate, burst) in (limits or DEFAULT_LIMITS).items():
+            self.set_limit(upstream, rate, burst)
+
+    def set_limit(self, upstream: str, rate: float, burst: int) -> None:
+        """ Sets the rate (requests per second) & burst of `upstream`. """
+        self._buckets[upstream] = TokenBucket(rate, burst)
+
+    def upstream(self, url: str) -> str:
+        """ Returns the name of the upstream `url` belongs to. Unknown hosts return the host itself. """
+        host = urlsplit(url).netloc
+        return UPSTREAMS.get(host, host)
+
+    def stats(self, upstream: str = None) -> dict:
+        """ Returns the counters of `upstream`, or of every upstream if it is `None`. """
+        if upstream is not None:
+            return self._get_stats(upstream).to_dict()
+        return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def _get_stats(self, upstream: str) -> UpstreamStats:
+        """ Returns the stats of `upstream`, creating them on first use. Takes `self._lock` to do so, so it must not be called while holding it. """
+        stats = self._stats.get(upstream)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(upstream, UpstreamStats())
+        return stats
+
+    def reserve(self, url: str) -> float:
+        """ Reserves a slot for a request to `url` & returns how long it must wait before being sent. The wait is added to the upstream's stats. """
+        upstream = self.upstream(url)
+        bucket = self._buckets.get(upstream)
+        wait = 0.0 if bucket is None else bucket.reserve()
+
+        stats = self._get_stats(upstream)
+        with self._lock:
+            stats.requests += 1
+            if wait > 0:
+                stats.queued += 1
+                stats.total_wait += wait
+                stats.max_wait = max(stats.max_wait, wait)
+        return wait
+
+    def retry_delay(self, url: str, method: str, status_code: int, headers: dict, attempt: int) -> float | None:
+        """ Called after every response. Pauses the upstream if the response was a `429` with a `Retry-After` header. Returns how long to wait before retrying, or `None` if the request should not
+        be retried. """
+        upstream = self.upstream(url)
+        stats = self._get_stats(upstream)
+        retry_after = None
+
+        if status_code == 429:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            bucket = self._buckets.get(upstream)
+            if retry_after is not None and bucket is not None:
+                bucket.pause(retry_after)
+
+            with self._lock:
+                stats.throttled += 1
+
+        if status_code not in RETRY_STATUS_CODES or method.upper() not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+            return None
+
+        with self._lock:
+            stats.retries += 1
+
+        backoff = random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            # The bucket is already paused, so only a little jitter is needed to stop every waiting request firing at once
+            return min(self.backoff_cap, retry_after) + random.uniform(0, self.backoff_base)
+        return backoff
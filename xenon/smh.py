@@ -2,6 +2,7 @@
 # Import internal modules
 from xenon.helpers import convert_iso_to_dt
 from xenon.models import GetRequest
+from xenon.projection import Projection
 
 # Import external modules
 import datetime
@@ -46,6 +47,12 @@ def _header() -> dict:
 
 
 class Assignment():
+    # The fields read by the properties below. `AssignmentRequest()` drops every other field.
+    projection = Projection(
+        'homework(id,teacher_name,title,subject,due_on,issued_at,updated_at,class_group_name,class_group_id,description,duration,duration_units,attachment_ids,web_links,'
+        'issued_on_lesson_occurrence_id,due_on_lesson_occurrence_id),lesson_occurrences(id,starts_at)'
+    )
+
     def __init__(self, data: dict) -> None:
         self._data = data
     
@@ -144,6 +151,9 @@ class Assignment():
         return self._get_assignment_data()['due_on_lesson_occurrence_id']
 
 class Attachment():
+    # The fields read by the properties below. `AttachmentRequest()` drops every other field.
+    projection = Projection('attachments(id,content_type,filename,file_size,file_url,created_at,updated_at)')
+
     def __init__(self, data: dict) -> None:
         self._data = data
 
@@ -238,27 +248,8 @@ class AssignmentRequest(GetRequest):
         self.api_params = {}
         self.api_headers = _header()
 
-        self.cdq = True
-
-    def _config_data(self) -> None:
-        """ Configures the data gathered from the request api. This essentially removes any unnecessary data. """
-
-        remove_list = ['teacher_id', 'published_at', 'created_at', 'class_year', 'submission_status', 'submission_ids', 'school_id', 'school_name', 'school_logo_url', 'submission_method_id', 'for_partial_group', 'partial_group_of_student_ids', 'source_id', 'marking_scheme_id', 'submission_type', 'community_resource_item_id', 'bookstore_content_ids', 'period_id']
-
-        h_data = self.get_data()['homework']
-        for key in list(h_data.keys()):
-            if key in remove_list:
-                h_data.pop(key)
-
-        lo_data = self.get_data()['lesson_occurrences']
-        for i, lo in enumerate(lo_data):
-            for key in list(lo.keys()):
-                if key in remove_list:
-                    lo.pop(key)
-                    lo_data[i] = lo
-
-        self._data['homework'] = h_data
-        self._data['lesson_occurrences'] = lo_data
+        # Only the fields `smh.Assignment()` uses are kept
+        self.select(Assignment.projection)
     
     @property
     def assignment(self):
@@ -275,19 +266,14 @@ class AttachmentRequest(GetRequest):
         }
         self.api_headers = _header()
 
+        # Only the fields `smh.Attachment()` uses are kept
+        self.select(Attachment.projection)
+
         self.cdq = True
 
     def _config_data(self) -> None:
-        """ Configures the data gathered from the request api. This essentially removes any unnecessary data. """
-
-        remove_list = ['user_id', 'preview_url', 'third_party_provider', 'third_party_shared_link', 'is_previewable']
-
-        new_data = self.get_data()['attachments'][0]
-        for key in list(new_data.keys()):
-            if key in remove_list:
-                new_data.pop(key)
-        
-        self._data = new_data
+        """ Configures the data gathered from the request api. """
+        self._data = self.get_data()['attachments'][0]
 
     @property
     def attachment(self):
@@ -2,14 +2,12 @@
 # Import internal modules
 from xenon.models import ObjectScaffold, GetRequest, PutRequest, DeleteRequest
 from xenon.helpers import convert_iso_to_dt
+from xenon.tokens import get_token_manager
 
 # Import external modules
 import datetime
 
 
-TOKEN = '' 
-
-
 
 #* ====================================================================================================================================================================================================
 #* MODELS
@@ -19,7 +17,7 @@ TOKEN = ''
 def _headers():
     return {
         'Content-Type': 'application/json',
-        'Authorization': f"Bearer {TOKEN}"
+        'Authorization': f"Bearer {get_token_manager().access_token()}"
     }
 
 class Album(ObjectScaffold):
@@ -1,12 +1,12 @@
 
 # Import internal modules
 from xenon.models import GetRequest, PutRequest, DeleteRequest
-from xenon.spotify3.helpers import _headers, BASE_URL, MAX_ALBUM_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, current_users_market
+from xenon.spotify3.helpers import _headers, BASE_URL, MAX_ALBUM_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, resolve_market
 from xenon.spotify3.models import FollowingRequest, Album
 
 class GetAlbums(GetRequest):
     """ Get Spotify catalog information for multiple albums identified by their Spotify IDs. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-multiple-albums."""
-    def __init__(self, album_ids: list, market: str = current_users_market()) -> None:
+    def __init__(self, album_ids: list, market: str = None) -> None:
         super().__init__()
 
         if len(album_ids) > MAX_ALBUM_IDS_COUNT:
@@ -17,7 +17,7 @@ class GetAlbums(GetRequest):
         self.api_url = f"{BASE_URL}/albums"
         self.api_params = {
             'ids': config_list_to_comma_str(album_ids),
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -33,7 +33,7 @@ class GetAlbums(GetRequest):
 
 class GetAlbumTracks(GetRequest):
     """ Get Spotify catalog information about an album's tracks. Optional parameters can be used to limit the number of tracks returned. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-an-albums-tracks. """
-    def __init__(self, album_id: str, limit: int = MAX_ALBUM_IDS_COUNT, offset: int = 0, market: str = current_users_market()) -> None:
+    def __init__(self, album_id: str, limit: int = MAX_ALBUM_IDS_COUNT, offset: int = 0, market: str = None) -> None:
         super().__init__()
 
         if limit > MAX_ALBUM_IDS_COUNT:
@@ -45,7 +45,7 @@ class GetAlbumTracks(GetRequest):
         self.api_params = {
             'limit': limit,
             'offset': offset,
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -57,7 +57,7 @@ class GetAlbumTracks(GetRequest):
 
 class GetCurrentUsersSavedAlbums(GetRequest):
     """ Get a list of the albums saved in the current Spotify user's library. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-users-saved-albums. """
-    def __init__(self, limit: int = MAX_ALBUM_IDS_COUNT, offset: int = 0, market: str = current_users_market()) -> None:
+    def __init__(self, limit: int = MAX_ALBUM_IDS_COUNT, offset: int = 0, market: str = None) -> None:
         super().__init__()
 
         if limit > MAX_ALBUM_IDS_COUNT:
@@ -69,7 +69,7 @@ class GetCurrentUsersSavedAlbums(GetRequest):
         self.api_params = {
             'limit': limit,
             'offset': offset,
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -124,7 +124,7 @@ class CheckCurrentUsersSavedAlbums(GetRequest):
 
 class GetNewReleases(GetRequest):
     """ Get a list of new album releases featured in Spotify (shown, for example, on a Spotify player's “Browse” tab). https://developer.spotify.com/documentation/web-api/reference/#/operations/get-new-releases. """
-    def __init__(self, market: str = current_users_market(), limit: int = MAX_ALBUM_IDS_COUNT, offset: int = 0) -> None:
+    def __init__(self, market: str = None, limit: int = MAX_ALBUM_IDS_COUNT, offset: int = 0) -> None:
         super().__init__()
 
         if limit > MAX_ALBUM_IDS_COUNT:
@@ -134,7 +134,7 @@ class GetNewReleases(GetRequest):
 
         self.api_url = f"{BASE_URL}/browse/new-releases"
         self.api_params = {
-            'country': market,
+            'country': resolve_market(market),
             'limit': limit,
             'offset': offset
         }
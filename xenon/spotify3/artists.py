@@ -1,7 +1,7 @@
 
 # Import internal modules
 from xenon.models import GetRequest, PutRequest, DeleteRequest
-from xenon.spotify3.helpers import _headers, BASE_URL, MAX_ARTIST_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, current_users_market
+from xenon.spotify3.helpers import _headers, BASE_URL, MAX_ARTIST_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, resolve_market
 from xenon.spotify3.models import FollowingRequest, Artist, Track
 
 class GetArtists(GetRequest):
@@ -16,7 +16,7 @@ class GetArtists(GetRequest):
 
         self.api_url = f"{BASE_URL}/artists"
         self.api_params = {
-            'ids': artist_ids
+            'ids': config_list_to_comma_str(artist_ids)
         }
         self.api_headers = _headers()
 
@@ -32,7 +32,7 @@ class GetArtists(GetRequest):
 
 class GetArtistsAlbums(GetRequest):
     """ Get Spotify catalog information about an artist's albums. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-an-artists-albums. """
-    def __init__(self, artist_id: str, include_groups: list = ['album', 'single', 'appears_on', 'compilation'], limit: int = MAX_ARTIST_IDS_COUNT, offset: int = 0, market: str = current_users_market()) -> None:
+    def __init__(self, artist_id: str, include_groups: list = ['album', 'single', 'appears_on', 'compilation'], limit: int = MAX_ARTIST_IDS_COUNT, offset: int = 0, market: str = None) -> None:
         super().__init__()
 
         if limit > MAX_ARTIST_IDS_COUNT:
@@ -44,7 +44,8 @@ class GetArtistsAlbums(GetRequest):
         self.api_params = {
             'include_groups': include_groups,
             'limit': limit,
-            'offset': offset
+            'offset': offset,
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -56,12 +57,12 @@ class GetArtistsAlbums(GetRequest):
 
 class GetArtistsTopTracks(GetRequest):
     """ Get Spotify catalog information about an artist's top tracks by country. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-an-artists-top-tracks. """
-    def __init__(self, artist_id: str, market: str = current_users_market()) -> None:
+    def __init__(self, artist_id: str, market: str = None) -> None:
         super().__init__()
 
         self.api_url = f"{BASE_URL}/artists/{artist_id}/top-tracks"
         self.api_params = {
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -1,14 +1,14 @@
 
 # Import internal modules
 from xenon.models import GetRequest, PutRequest, DeleteRequest
-from xenon.spotify3.helpers import _headers, BASE_URL, MAX_AUDIOBOOK_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, current_users_market
+from xenon.spotify3.helpers import _headers, BASE_URL, MAX_AUDIOBOOK_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, resolve_market
 from xenon.spotify3.models import FollowingRequest, Audiobook
 
 class GetAudiobooks(GetRequest):
     """ Get Spotify catalog information for several audiobooks identified by their Spotify IDs. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-multiple-audiobooks.
 
     NOTE: Audiobooks are only available for the US, UK, Ireland, New Zealand and Australia markets. """
-    def __init__(self, audiobook_ids: list, market: str = current_users_market()) -> None:
+    def __init__(self, audiobook_ids: list, market: str = None) -> None:
         super().__init__()
 
         if len(audiobook_ids) > MAX_AUDIOBOOK_IDS_COUNT:
@@ -19,7 +19,7 @@ class GetAudiobooks(GetRequest):
         self.api_url = f"{BASE_URL}/audiobooks"
         self.api_params = {
             'ids': config_list_to_comma_str(audiobook_ids),
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
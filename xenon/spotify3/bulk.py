@@ -0,0 +1,374 @@
+# Import internal modules
+from xenon.models import gather_requests
+from xenon.persistent_cache import get_entity_store
+from xenon.spotify3.models import Track, Album, Artist, Show, Episode, Audiobook, AudioFeatures
+from xenon.spotify3 import compact as compact_models
+from xenon.spotify3.features import AudioFeaturesMatrix
+from xenon.spotify3.helpers import resolve_market, ANY_MARKET, MAX_CONCURRENT_CHUNKS, MIN_IDS_COUNT, MAX_TRACK_IDS_COUNT, MAX_ALBUM_IDS_COUNT, MAX_ARTIST_IDS_COUNT, MAX_SHOW_IDS_COUNT, MAX_EPISODE_IDS_COUNT, MAX_AUDIOBOOK_IDS_COUNT
+from xenon.spotify3.tracks import GetTracks, SaveTracksForCurrentUser, RemoveUsersSavedTrack, CheckUsersSavedTracks, GetTracksAudioFeatures
+from xenon.spotify3.albums import GetAlbums, SaveAlbumForCurrentUser, RemoveCurrentUsersSavedAlbums, CheckCurrentUsersSavedAlbums
+from xenon.spotify3.artists import GetArtists, FollowArtist, UnfollowArtist, CheckIfUserFollowsArtists
+from xenon.spotify3.shows import GetShows, SaveShowsForCurrentUser, RemoveCurrentUsersSavedShows, CheckCurrentUsersSavedShow
+from xenon.spotify3.episodes import GetEpisodes, SaveEpisodesForCurrentUser, RemoveCurrentUsersSavedEpisodes, CheckUsersSavedEpisodes
+from xenon.spotify3.audiobooks import GetAudiobooks, SaveAudiobookForCurrentUser, RemoveUsersSavedAudiobooks, CheckUsersSavedAudiobooks
+
+# Import external modules
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import inspect
+
+def unique_ids(ids: list) -> list:
+    """ Removes duplicate ids from `ids` while keeping the order they first appeared in. """
+    return list(dict.fromkeys(ids))
+
+def chunk_ids(ids: list, size: int) -> list:
+    """ Splits `ids` into a list of lists, each no longer than `size`. """
+    return [ids[i:i + size] for i in range(0, len(ids), size)]
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class BulkRequest():
+    """
+    Add this class as an inheritance for endpoints which take a capped number of ids. Any number of ids can be passed in; duplicates are removed, the ids are split into chunks of
+    `self.max_ids_count` & one `self.request_class` is sent per chunk, with at most `max_workers` chunks in flight at once. The chunk results are merged back in the order the ids were given.
+
+    ---
+    ``` python
+    ngr = BulkGetTracks(track_ids)
+    ngr.create_request()
+
+    if ngr.code != 200:
+        # At least one chunk failed. See `ngr.failed_requests`
+        return
+
+    tracks = ngr.get_data()
+
+    ```
+
+    Catalog endpoints set `model_class` & `compact_class`. With `compact=True` the results are returned as the compact models of `xenon.spotify3.compact` instead, which is worth doing when
+    thousands of objects are kept in memory.
+
+    Catalog endpoints set `entity_type`. When the entity store of `xenon.persistent_cache` is set up, ids which are already stored are not requested again & fetched objects are stored for next time.
+    """
+
+    request_class: type = None
+    max_ids_count: int = None
+    entity_type: str = None
+    model_class: type = None
+    compact_class: type = None
+
+    def __init__(self, ids: list, max_workers: int = MAX_CONCURRENT_CHUNKS, compact: bool = False, **kwargs) -> None:
+        self.ids: list = unique_ids(ids)
+
+        if len(self.ids) < MIN_IDS_COUNT:
+            raise ValueError(f"Parameter 'ids' returned less than {MIN_IDS_COUNT} values.")
+
+        self.max_workers: int = max_workers
+        self.compact: bool = compact and self.compact_class is not None
+        self.kwargs: dict = kwargs
+        self.requests: list = []
+
+        # The market is resolved once so every chunk, & the entity store, use the same one
+        if 'market' in inspect.signature(self.request_class).parameters:
+            self.kwargs['market'] = resolve_market(kwargs.get('market')) or ANY_MARKET
+
+        self.code: int = None
+        self.failed_requests: list = []
+        self._chunks: list = []
+        self._stored: dict = {}
+        self._data: list = None
+
+    def _store_type(self) -> str:
+        """ Returns the resource type objects are stored under. Objects requested for a market are stored separately as playability depends on it. """
+        market = self.kwargs.get('market')
+        if not market:
+            return self.entity_type
+        return f"{self.entity_type}@{market}"
+
+    def _prepare(self) -> None:
+        """ Looks the ids up in the entity store & creates one request per chunk of the ids which are still missing. """
+        store = get_entity_store()
+        if store is not None and self.entity_type is not None:
+            self._stored = store.get_many(self._store_type(), self.ids)
+
+        missing = [id_ for id_ in self.ids if id_ not in self._stored]
+        self._chunks = chunk_ids(missing, self.max_ids_count)
+        self.requests = [self.request_class(chunk, **self.kwargs) for chunk in self._chunks]
+
+    def create_request(self) -> None:
+        """ Sends every chunk on a thread pool & merges the results. """
+        self._prepare()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, request.create_request) for request in self.requests]
+            for future in futures:
+                future.result()
+
+        self._merge()
+
+    async def create_request_async(self) -> None:
+        """ Awaitable version of `self.create_request()`. """
+        self._prepare()
+
+        await gather_requests(self.requests, self.max_workers)
+
+        self._merge()
+
+    def _merge(self) -> None:
+        """ Sets `self.code` & merges the stored objects with the results of every chunk. If any chunk failed then `self.code` is the code of the first failed chunk and no data is returned. """
+        self.failed_requests = [request for request in self.requests if request.code != 200]
+
+        if self.failed_requests:
+            self.code = self.failed_requests[0].code
+            self._data = None
+            return
+
+        self.code = 200
+
+        fetched = {}
+        for chunk, request in zip(self._chunks, self.requests):
+            fetched.update(zip(chunk, self._chunk_results(request)))
+
+        store = get_entity_store()
+        if store is not None and self.entity_type is not None and fetched:
+            store.put_many(self._store_type(), [self._raw(result) for result in fetched.values()])
+
+        merged = []
+        for id_ in self.ids:
+            if id_ in fetched:
+                merged.append(self._wrap(self._raw(fetched[id_])) if self.compact else fetched[id_])
+            elif id_ in self._stored:
+                merged.append(self._wrap(self._stored[id_]))
+
+        self._data = merged
+
+    def _raw(self, result: any) -> dict | None:
+        """ Returns the catalog object behind one result. """
+        if result is None or self.model_class is None:
+            return result
+        return result.get_data()
+
+    def _wrap(self, data: dict) -> any:
+        """ Wraps a stored catalog object in the same model the endpoint returns, or its compact model if `self.compact` is `True`. """
+        if data is None or self.model_class is None:
+            return data
+        if self.compact:
+            return self.compact_class(data)
+        return self.model_class(data)
+
+    def _chunk_results(self, request: object) -> list:
+        """ Returns the results of one chunk as a list. Override this for endpoints which do not return a list. """
+        return request.get_data()
+
+    def get_data(self) -> list:
+        """ Returns the merged results of every chunk, in the order of `self.ids`. """
+        return self._data
+
+    def by_id(self) -> dict:
+        """ Returns the merged results as a dict keyed by the id they were requested with. """
+        return dict(zip(self.ids, self.get_data()))
+
+class _BulkWriteRequest(BulkRequest):
+    """ Inheritance for bulk endpoints which only modify the library (save, remove, follow, ...). They return no data. """
+
+    def _chunk_results(self, request: object) -> list:
+        return []
+
+    def by_id(self) -> dict:
+        raise AttributeError(f"'{type(self).__name__}' does not return any data to key by id.")
+
+
+
+#* ====================================================================================================================================================================================================
+#* TRACKS
+
+
+
+class BulkGetTracks(BulkRequest):
+    """ `GetTracks()` for any number of track ids. Returns a list of `Track()` objects. """
+    request_class = GetTracks
+    max_ids_count = MAX_TRACK_IDS_COUNT
+    entity_type = 'tracks'
+    model_class = Track
+    compact_class = compact_models.Track
+
+class BulkSaveTracksForCurrentUser(_BulkWriteRequest):
+    """ `SaveTracksForCurrentUser()` for any number of track ids. """
+    request_class = SaveTracksForCurrentUser
+    max_ids_count = MAX_TRACK_IDS_COUNT
+
+class BulkRemoveUsersSavedTrack(_BulkWriteRequest):
+    """ `RemoveUsersSavedTrack()` for any number of track ids. """
+    request_class = RemoveUsersSavedTrack
+    max_ids_count = MAX_TRACK_IDS_COUNT
+
+class BulkCheckUsersSavedTracks(BulkRequest):
+    """ `CheckUsersSavedTracks()` for any number of track ids. Returns a list of bools. """
+    request_class = CheckUsersSavedTracks
+    max_ids_count = MAX_TRACK_IDS_COUNT
+
+class BulkGetTracksAudioFeatures(BulkRequest):
+    """ `GetTracksAudioFeatures()` for any number of track ids. Returns a list of `AudioFeatures()` objects. """
+    request_class = GetTracksAudioFeatures
+    max_ids_count = MAX_TRACK_IDS_COUNT
+    entity_type = 'audio-features'
+    model_class = AudioFeatures
+    compact_class = compact_models.AudioFeatures
+
+    def matrix(self) -> AudioFeaturesMatrix:
+        """ Returns the results as an `AudioFeaturesMatrix()`. Tracks without audio features are left out. """
+        return AudioFeaturesMatrix.from_features(self._data or [])
+
+
+
+#* ====================================================================================================================================================================================================
+#* ALBUMS
+
+
+
+class BulkGetAlbums(BulkRequest):
+    """ `GetAlbums()` for any number of album ids. Returns a list of `Album()` objects. """
+    request_class = GetAlbums
+    max_ids_count = MAX_ALBUM_IDS_COUNT
+    entity_type = 'albums'
+    model_class = Album
+    compact_class = compact_models.Album
+
+class BulkSaveAlbumForCurrentUser(_BulkWriteRequest):
+    """ `SaveAlbumForCurrentUser()` for any number of album ids. """
+    request_class = SaveAlbumForCurrentUser
+    max_ids_count = MAX_ALBUM_IDS_COUNT
+
+class BulkRemoveCurrentUsersSavedAlbums(_BulkWriteRequest):
+    """ `RemoveCurrentUsersSavedAlbums()` for any number of album ids. """
+    request_class = RemoveCurrentUsersSavedAlbums
+    max_ids_count = MAX_ALBUM_IDS_COUNT
+
+class BulkCheckCurrentUsersSavedAlbums(BulkRequest):
+    """ `CheckCurrentUsersSavedAlbums()` for any number of album ids. Returns a list of bools. """
+    request_class = CheckCurrentUsersSavedAlbums
+    max_ids_count = MAX_ALBUM_IDS_COUNT
+
+
+
+#* ====================================================================================================================================================================================================
+#* ARTISTS
+
+
+
+class BulkGetArtists(BulkRequest):
+    """ `GetArtists()` for any number of artist ids. Returns a list of `Artist()` objects. """
+    request_class = GetArtists
+    max_ids_count = MAX_ARTIST_IDS_COUNT
+    entity_type = 'artists'
+    model_class = Artist
+    compact_class = compact_models.Artist
+
+class BulkFollowArtist(_BulkWriteRequest):
+    """ `FollowArtist()` for any number of artist ids. """
+    request_class = FollowArtist
+    max_ids_count = MAX_ARTIST_IDS_COUNT
+
+class BulkUnfollowArtist(_BulkWriteRequest):
+    """ `UnfollowArtist()` for any number of artist ids. """
+    request_class = UnfollowArtist
+    max_ids_count = MAX_ARTIST_IDS_COUNT
+
+class BulkCheckIfUserFollowsArtists(BulkRequest):
+    """ `CheckIfUserFollowsArtists()` for any number of artist ids. Returns a list of bools. """
+    request_class = CheckIfUserFollowsArtists
+    max_ids_count = MAX_ARTIST_IDS_COUNT
+
+
+
+#* ====================================================================================================================================================================================================
+#* SHOWS
+
+
+
+class BulkGetShows(BulkRequest):
+    """ `GetShows()` for any number of show ids. Returns a list of `Show()` objects. """
+    request_class = GetShows
+    max_ids_count = MAX_SHOW_IDS_COUNT
+    entity_type = 'shows'
+    model_class = Show
+    compact_class = compact_models.Show
+
+class BulkSaveShowsForCurrentUser(_BulkWriteRequest):
+    """ `SaveShowsForCurrentUser()` for any number of show ids. """
+    request_class = SaveShowsForCurrentUser
+    max_ids_count = MAX_SHOW_IDS_COUNT
+
+class BulkRemoveCurrentUsersSavedShows(_BulkWriteRequest):
+    """ `RemoveCurrentUsersSavedShows()` for any number of show ids. """
+    request_class = RemoveCurrentUsersSavedShows
+    max_ids_count = MAX_SHOW_IDS_COUNT
+
+class BulkCheckCurrentUsersSavedShow(BulkRequest):
+    """ `CheckCurrentUsersSavedShow()` for any number of show ids. Returns a list of bools. """
+    request_class = CheckCurrentUsersSavedShow
+    max_ids_count = MAX_SHOW_IDS_COUNT
+
+
+
+#* ====================================================================================================================================================================================================
+#* EPISODES
+
+
+
+class BulkGetEpisodes(BulkRequest):
+    """ `GetEpisodes()` for any number of episode ids. Returns a list of `Episode()` objects. """
+    request_class = GetEpisodes
+    max_ids_count = MAX_EPISODE_IDS_COUNT
+    entity_type = 'episodes'
+    model_class = Episode
+    compact_class = compact_models.Episode
+
+class BulkSaveEpisodesForCurrentUser(_BulkWriteRequest):
+    """ `SaveEpisodesForCurrentUser()` for any number of episode ids. """
+    request_class = SaveEpisodesForCurrentUser
+    max_ids_count = MAX_EPISODE_IDS_COUNT
+
+class BulkRemoveCurrentUsersSavedEpisodes(_BulkWriteRequest):
+    """ `RemoveCurrentUsersSavedEpisodes()` for any number of episode ids. """
+    request_class = RemoveCurrentUsersSavedEpisodes
+    max_ids_count = MAX_EPISODE_IDS_COUNT
+
+class BulkCheckUsersSavedEpisodes(BulkRequest):
+    """ `CheckUsersSavedEpisodes()` for any number of episode ids. Returns a list of bools. """
+    request_class = CheckUsersSavedEpisodes
+    max_ids_count = MAX_EPISODE_IDS_COUNT
+
+
+
+#* ====================================================================================================================================================================================================
+#* AUDIOBOOKS
+
+
+
+class BulkGetAudiobooks(BulkRequest):
+    """ `GetAudiobooks()` for any number of audiobook ids. Returns a list of `Audiobook()` objects. """
+    request_class = GetAudiobooks
+    max_ids_count = MAX_AUDIOBOOK_IDS_COUNT
+    entity_type = 'audiobooks'
+    model_class = Audiobook
+    compact_class = compact_models.Audiobook
+
+class BulkSaveAudiobookForCurrentUser(_BulkWriteRequest):
+    """ `SaveAudiobookForCurrentUser()` for any number of audiobook ids. """
+    request_class = SaveAudiobookForCurrentUser
+    max_ids_count = MAX_AUDIOBOOK_IDS_COUNT
+
+class BulkRemoveUsersSavedAudiobooks(_BulkWriteRequest):
+    """ `RemoveUsersSavedAudiobooks()` for any number of audiobook ids. """
+    request_class = RemoveUsersSavedAudiobooks
+    max_ids_count = MAX_AUDIOBOOK_IDS_COUNT
+
+class BulkCheckUsersSavedAudiobooks(BulkRequest):
+    """ `CheckUsersSavedAudiobooks()` for any number of audiobook ids. Returns a list of bools. """
+    request_class = CheckUsersSavedAudiobooks
+    max_ids_count = MAX_AUDIOBOOK_IDS_COUNT
@@ -0,0 +1,286 @@
+# Import internal modules
+from xenon.models import SlotScaffold, LazyField, shared_tuple
+from xenon.spotify3.models import FollowingRequest
+from xenon.spotify3.market_set import MarketSet
+
+""" Compact versions of the models in `xenon.spotify3.models`. They have the same property names but copy their fields into `__slots__` once & drop the rest of the json, so they are a lot
+smaller when thousands of them are kept (e.g. a whole library). Nested objects are only decoded when they are first read. A compact model can be created from json or from the full model:
+
+``` python
+track = Track(full_track)
+track.linked_album.name
+```
+"""
+
+def _optional(decoder: callable) -> callable:
+    """ Returns a decoder which leaves `None` as `None`. """
+    return lambda data: None if data is None else decoder(data)
+
+def _pack_markets(data: dict) -> dict:
+    """ Replaces the `available_markets` of nested json which is kept until it is decoded with a `MarketSet()`. """
+    if not isinstance(data.get('available_markets'), list):
+        return data
+    return {**data, 'available_markets': MarketSet.from_codes(data['available_markets'])}
+
+def _unpack_markets(data: dict) -> dict:
+    """ Reverse of `_pack_markets()`. """
+    if not isinstance(data.get('available_markets'), MarketSet):
+        return data
+    return {**data, 'available_markets': data['available_markets'].to_list()}
+
+@property
+def _available_markets(self) -> list | None:
+    """ The markets as a list of ISO 3166-1 alpha-2 codes. They are kept as the `MarketSet()` `markets`, so the list is built each time it is read. """
+    return None if self.markets is None else self.markets.to_list()
+
+def _playable(data: dict | None) -> object:
+    """ Decodes a track or an episode by its `type`. """
+    if data is None:
+        return None
+    if data['type'] == 'episode':
+        return Episode(data)
+    if data['type'] == 'track':
+        return Track(data)
+    raise AttributeError(f"Item was not track or episode. Returned {data['type']} instead.")
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class Album(SlotScaffold):
+    __slots__ = ('type_', 'total_tracks', 'markets', 'external_urls', 'href', 'album_id', 'images', 'name', 'release_date', 'release_date_precision', 'restrictions', 'uri', 'artists',
+                 '_tracks_metadata')
+    _interned = True
+    _fields = {
+        'type_': 'album_type',
+        'total_tracks': 'total_tracks',
+        'markets': 'available_markets',
+        'external_urls': 'external_urls',
+        'href': 'href',
+        'album_id': 'id',
+        'images': 'images',
+        'name': 'name',
+        'release_date': 'release_date',
+        'release_date_precision': 'release_date_precision',
+        'restrictions': 'restrictions',
+        'uri': 'uri',
+        'artists': 'artists'
+    }
+    _converters = {'markets': MarketSet.from_codes}
+    _exporters = {'markets': MarketSet.to_list}
+
+    available_markets = _available_markets
+
+    tracks_metadata = LazyField('tracks', _optional(FollowingRequest))
+
+class Artist(SlotScaffold):
+    __slots__ = ('external_urls', 'followers', 'genres', 'href', 'artist_id', 'images', 'name', 'popularity', 'type_', 'uri')
+    _interned = True
+    _fields = {
+        'external_urls': 'external_urls',
+        'followers': ('followers', 'total'),
+        'genres': 'genres',
+        'href': 'href',
+        'artist_id': 'id',
+        'images': 'images',
+        'name': 'name',
+        'popularity': 'popularity',
+        'type_': 'type',
+        'uri': 'uri'
+    }
+    _converters = {'genres': shared_tuple}
+
+class Show(SlotScaffold):
+    __slots__ = ('markets', 'copyrights', 'description', 'html_description', 'is_explicit', 'external_urls', 'href', 'show_id', 'images', 'is_externally_hosted', 'languages',
+                 'media_type', 'name', 'publisher', 'type_', 'uri', '_episodes')
+    _interned = True
+    _fields = {
+        'markets': 'available_markets',
+        'copyrights': 'copyrights',
+        'description': 'description',
+        'html_description': 'html_description',
+        'is_explicit': 'explicit',
+        'external_urls': 'external_urls',
+        'href': 'href',
+        'show_id': 'id',
+        'images': 'images',
+        'is_externally_hosted': 'is_externally_hosted',
+        'languages': 'languages',
+        'media_type': 'media_type',
+        'name': 'name',
+        'publisher': 'publisher',
+        'type_': 'type',
+        'uri': 'uri'
+    }
+    _converters = {'markets': MarketSet.from_codes, 'languages': shared_tuple}
+    _exporters = {'markets': MarketSet.to_list}
+
+    available_markets = _available_markets
+
+    episodes = LazyField('episodes', _optional(FollowingRequest))
+
+class Episode(SlotScaffold):
+    __slots__ = ('audio_preview_url', 'description', 'html_description', 'duration_ms', 'is_explicit', 'external_urls', 'href', 'episode_id', 'images', 'is_externally_hosted', 'is_playable',
+                 'languages', 'name', 'release_date', 'release_date_precision', 'resume_point', 'type_', 'uri', '_linked_show')
+    _fields = {
+        'audio_preview_url': 'audio_preview_url',
+        'description': 'description',
+        'html_description': 'html_description',
+        'duration_ms': 'duration_ms',
+        'is_explicit': 'explicit',
+        'external_urls': 'external_urls',
+        'href': 'href',
+        'episode_id': 'id',
+        'images': 'images',
+        'is_externally_hosted': 'is_externally_hosted',
+        'is_playable': 'is_playable',
+        'languages': 'languages',
+        'name': 'name',
+        'release_date': 'release_date',
+        'release_date_precision': 'release_date_precision',
+        'resume_point': 'resume_point',
+        'type_': 'type',
+        'uri': 'uri'
+    }
+    _converters = {'languages': shared_tuple}
+
+    linked_show = LazyField('show', _optional(Show))
+
+class Audiobook(SlotScaffold):
+    __slots__ = ('authors', 'markets', 'copyrights', 'description', 'html_description', 'is_explicit', 'external_urls', 'href', 'audiobook_id', 'images', 'languages', 'media_type',
+                 'name', 'narrators', 'publisher', 'type', 'uri', 'total_chapters', '_chapters')
+    _fields = {
+        'authors': 'authors',
+        'markets': 'available_markets',
+        'copyrights': 'copyrights',
+        'description': 'description',
+        'html_description': 'html_description',
+        'is_explicit': 'explicit',
+        'external_urls': 'external_urls',
+        'href': 'href',
+        'audiobook_id': 'id',
+        'images': 'images',
+        'languages': 'languages',
+        'media_type': 'media_type',
+        'name': 'name',
+        'narrators': 'narrators',
+        'publisher': 'publisher',
+        'type': 'type',
+        'uri': 'uri',
+        'total_chapters': 'total_chapters'
+    }
+    _converters = {'markets': MarketSet.from_codes, 'languages': shared_tuple}
+    _exporters = {'markets': MarketSet.to_list}
+
+    available_markets = _available_markets
+
+    chapters = LazyField('chapters', _optional(FollowingRequest))
+
+class Track(SlotScaffold):
+    __slots__ = ('artists', 'markets', 'disc_number', 'duration', 'is_explicit', 'external_ids', 'external_urls', 'href', 'track_id', 'is_playable', 'restrictions', 'name',
+                 'popularity', 'preview_url', 'track_number', 'type_', 'uri', 'is_local', '_linked_album')
+    _interned = True
+    _fields = {
+        'artists': 'artists',
+        'markets': 'available_markets',
+        'disc_number': 'disc_number',
+        'duration': 'duration_ms',
+        'is_explicit': 'explicit',
+        'external_ids': 'external_ids',
+        'external_urls': 'external_urls',
+        'href': 'href',
+        'track_id': 'id',
+        'is_playable': 'is_playable',
+        'restrictions': 'restrictions',
+        'name': 'name',
+        'popularity': 'popularity',
+        'preview_url': 'preview_url',
+        'track_number': 'track_number',
+        'type_': 'type',
+        'uri': 'uri',
+        'is_local': 'is_local'
+    }
+    _converters = {'markets': MarketSet.from_codes}
+    _exporters = {'markets': MarketSet.to_list}
+
+    available_markets = _available_markets
+
+    linked_album = LazyField('album', _optional(Album), _pack_markets, _unpack_markets)
+
+class AudioFeatures(SlotScaffold):
+    __slots__ = ('acousticness', 'analysis_url', 'danceability', 'duration', 'energy', 'audio_feature_id', 'instrumentalness', 'key', 'liveness', 'loudness', 'mode', 'speechiness', 'tempo',
+                 'time_signature', 'track_href', 'type_', 'uri', 'valence')
+    _fields = {
+        'acousticness': 'acousticness',
+        'analysis_url': 'analysis_url',
+        'danceability': 'danceability',
+        'duration': 'duration_ms',
+        'energy': 'energy',
+        'audio_feature_id': 'id',
+        'instrumentalness': 'instrumentalness',
+        'key': 'key',
+        'liveness': 'liveness',
+        'loudness': 'loudness',
+        'mode': 'mode',
+        'speechiness': 'speechiness',
+        'tempo': 'tempo',
+        'time_signature': 'time_signature',
+        'track_href': 'track_href',
+        'type_': 'type',
+        'uri': 'uri',
+        'valence': 'valence'
+    }
+
+class User(SlotScaffold):
+    __slots__ = ('display_name', 'external_urls', 'total_followers', 'href', 'user_id', 'images', 'type_', 'uri')
+    _fields = {
+        'display_name': 'display_name',
+        'external_urls': 'external_urls',
+        'total_followers': ('followers', 'total'),
+        'href': 'href',
+        'user_id': 'id',
+        'images': 'images',
+        'type_': 'type',
+        'uri': 'uri'
+    }
+
+class Playlist(SlotScaffold):
+    __slots__ = ('is_collaborative', 'description', 'external_urls', 'total_followers', 'href', 'playlist_id', 'images', 'name', 'is_public', 'snapshot_id', 'type_', 'uri', '_owner', '_tracks')
+    _interned = True
+    _fields = {
+        'is_collaborative': 'collaborative',
+        'description': 'description',
+        'external_urls': 'external_urls',
+        'total_followers': ('followers', 'total'),
+        'href': 'href',
+        'playlist_id': 'id',
+        'images': 'images',
+        'name': 'name',
+        'is_public': 'public',
+        'snapshot_id': 'snapshot_id',
+        'type_': 'type',
+        'uri': 'uri'
+    }
+
+    owner = LazyField('owner', _optional(User))
+    tracks = LazyField('tracks', _optional(FollowingRequest))
+
+class Device(SlotScaffold):
+    __slots__ = ('device_id', 'is_active', 'is_in_private_session', 'is_restricted', 'name', 'type_', 'volume')
+    _fields = {
+        'device_id': 'id',
+        'is_active': 'is_active',
+        'is_in_private_session': 'is_private_session',
+        'is_restricted': 'is_restricted',
+        'name': 'name',
+        'type_': 'type',
+        'volume': 'volume_percent'
+    }
+
+class Queue(SlotScaffold):
+    __slots__ = ('_currently_playing', '_queue')
+
+    currently_playing = LazyField('currently_playing', _playable)
+    queue = LazyField('queue', lambda items: [_playable(item) for item in items or []])
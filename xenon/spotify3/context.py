@@ -0,0 +1,82 @@
+# Import internal modules
+from xenon.cache import cache_scope
+from xenon.tokens import get_token_manager, DEFAULT_USER
+from xenon.transport import Transport, AsyncTransport, transport_scope
+
+# Import external modules
+from contextlib import contextmanager
+import contextvars
+
+# The market used when no context sets one
+DEFAULT_MARKET = 'GB'
+
+class SpotifyContext():
+    """ Who a Spotify request is sent for: the user whose token is used, their market & optionally the transports the requests are sent through. A `token` overrides the token of `user_id` in
+    `xenon.tokens`. Contexts are immutable; use `spotify_context()` to change one for a block of code. """
+
+    __slots__ = ('user_id', 'market', 'token', 'transport', 'async_transport')
+
+    def __init__(self, user_id: str = DEFAULT_USER, market: str = DEFAULT_MARKET, token: str = None, transport: Transport = None, async_transport: AsyncTransport = None) -> None:
+        self.user_id: str = user_id
+        self.market: str = market
+        self.token: str | None = token
+        self.transport: Transport | None = transport
+        self.async_transport: AsyncTransport | None = async_transport
+
+    @property
+    def access_token(self) -> str:
+        """ The access token to send. Read when a request is created, so a refreshed token is picked up by the next request. """
+        if self.token is not None:
+            return self.token
+        return get_token_manager().access_token(self.user_id)
+
+    @property
+    def cache_scope(self) -> str:
+        """ The scope cached responses of this context are kept under: the user, or the token itself if one was given, as it need not belong to the user. """
+        if self.token is not None:
+            return f"token:{self.token}"
+        return f"user:{self.user_id}"
+
+    def __repr__(self) -> str:
+        return f"SpotifyContext(user_id={self.user_id!r}, market={self.market!r})"
+
+_default_context = SpotifyContext()
+_spotify_context: contextvars.ContextVar = contextvars.ContextVar('xenon_spotify_context', default=_default_context)
+
+def current_context() -> SpotifyContext:
+    """ Returns the context of the caller, or the default context (`DEFAULT_USER` in `DEFAULT_MARKET`) if none is set. """
+    return _spotify_context.get()
+
+@contextmanager
+def spotify_context(user_id: str = None, market: str = None, token: str = None, transport: Transport = None, async_transport: AsyncTransport = None) -> iter:
+    """
+    Within this scope every `xenon.spotify3` request class is created for `user_id`: its token & market are read from the context rather than from globals, so one process can serve several users
+    at once from threads or tasks. Arguments which are not given are kept from the enclosing context.
+
+    ---
+    ``` python
+    with spotify_context(user_id=str(current_user.id), market=current_user.spotify_country_code):
+        ngr = GetCurrentUsersSavedTracks()
+        ngr.create_request()
+
+    ```
+
+    The scope follows the context, so it covers asyncio tasks & the worker threads of the pagination & bulk helpers. Requests read the token & market when they are created, so a request created inside
+    the scope keeps its user even if it is sent outside it. Cached responses of user dependent endpoints are kept apart per user (see `xenon.cache.cache_scope()`) by the scope they are sent in.
+    """
+
+    outer = current_context()
+    context = SpotifyContext(
+        user_id if user_id is not None else outer.user_id,
+        market if market is not None else outer.market,
+        token if token is not None or user_id is not None else outer.token,
+        transport or outer.transport,
+        async_transport or outer.async_transport
+    )
+
+    reset_token = _spotify_context.set(context)
+    try:
+        with transport_scope(context.transport, context.async_transport), cache_scope(context.cache_scope):
+            yield context
+    finally:
+        _spotify_context.reset(reset_token)
@@ -1,12 +1,12 @@
 
 # Import internal modules
 from xenon.models import GetRequest, PutRequest, DeleteRequest
-from xenon.spotify3.helpers import _headers, BASE_URL, MAX_EPISODE_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, current_users_market
+from xenon.spotify3.helpers import _headers, BASE_URL, MAX_EPISODE_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, resolve_market
 from xenon.spotify3.models import FollowingRequest, Episode
 
 class GetEpisodes(GetRequest):
     """ Get Spotify catalog information for several episodes based on their Spotify IDs. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-multiple-episodes. """
-    def __init__(self, episode_ids: list, market: str = current_users_market()) -> None:
+    def __init__(self, episode_ids: list, market: str = None) -> None:
         super().__init__()
 
         if len(episode_ids) > MAX_EPISODE_IDS_COUNT:
@@ -14,10 +14,10 @@ class GetEpisodes(GetRequest):
         if len(episode_ids) < MIN_IDS_COUNT:
             raise ValueError(f"Parameter 'episode_ids' returned less than {MIN_IDS_COUNT} values.")
 
-        self.api_url = f"{BASE_URL}"
+        self.api_url = f"{BASE_URL}/episodes"
         self.api_params = {
             'ids': config_list_to_comma_str(episode_ids),
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -35,7 +35,7 @@ class GetCurrentUsersSavedEpisodes(GetRequest):
     """ Get a list of the episodes saved in the current Spotify user's library. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-users-saved-episodes.
     
     NOTE: This API endpoint is in beta and could change without warning. Please share any feedback that you have, or issues that you discover, in our [developer community forum](https://community.spotify.com/t5/Spotify-for-Developers/bd-p/Spotify_Developer). """
-    def __init__(self, market: str = current_users_market(), limit: int = MAX_EPISODE_IDS_COUNT, offset: int = 0) -> None:
+    def __init__(self, market: str = None, limit: int = MAX_EPISODE_IDS_COUNT, offset: int = 0) -> None:
         super().__init__()
 
         if limit > MAX_EPISODE_IDS_COUNT:
@@ -43,9 +43,9 @@ class GetCurrentUsersSavedEpisodes(GetRequest):
         if limit < MIN_IDS_COUNT:
             raise ValueError(f"Parameter 'limit' returned less than {MIN_IDS_COUNT} values.")
 
-        self.api_url = f"{BASE_URL}"
+        self.api_url = f"{BASE_URL}/me/episodes"
         self.api_params = {
-            'market': market,
+            'market': resolve_market(market),
             'limit': limit,
             'offset': offset
         }
@@ -69,7 +69,7 @@ class SaveEpisodesForCurrentUser(PutRequest):
         if len(episode_ids) < MIN_IDS_COUNT:
             raise ValueError(f"Parameter 'episode_ids' returned less than {MIN_IDS_COUNT} values.")
 
-        self.api_url = f"{BASE_URL}"
+        self.api_url = f"{BASE_URL}/me/episodes"
         self.api_params = {
             'ids': config_list_to_comma_str(episode_ids)
         }
@@ -87,7 +87,7 @@ class RemoveCurrentUsersSavedEpisodes(DeleteRequest):
         if len(episode_ids) < MIN_IDS_COUNT:
             raise ValueError(f"Parameter 'episode_ids' returned less than {MIN_IDS_COUNT} values.")
 
-        self.api_url = f"{BASE_URL}"
+        self.api_url = f"{BASE_URL}/me/episodes"
         self.api_params = {
             'ids': config_list_to_comma_str(episode_ids)
         }
@@ -105,7 +105,7 @@ class CheckUsersSavedEpisodes(GetRequest):
         if len(episode_ids) < MIN_IDS_COUNT:
             raise ValueError(f"Parameter 'episode_ids' returned less than {MIN_IDS_COUNT} values.")
 
-        self.api_url = f"{BASE_URL}"
+        self.api_url = f"{BASE_URL}/me/episodes/contains"
         self.api_params = {
             'ids': config_list_to_comma_str(episode_ids)
         }
@@ -0,0 +1,153 @@
+# Import internal modules
+from xenon.models import ObjectScaffold, SlotScaffold
+
+# Import external modules
+import numpy as np
+
+# The columns of the matrix, named after the keys of the api. `key`, `mode` & `time_signature` are whole numbers but are stored as floats with the rest.
+COLUMNS = ('acousticness', 'danceability', 'energy', 'instrumentalness', 'key', 'liveness', 'loudness', 'mode', 'speechiness', 'tempo', 'time_signature', 'valence', 'duration_ms')
+
+class AudioFeaturesMatrix():
+    """
+    The audio features of many tracks as one contiguous `(tracks, columns)` float32 matrix with a track id index, so a whole library can be filtered, normalised & summarised with vectorised
+    numpy operations instead of a loop over `AudioFeatures()` objects.
+
+    ---
+    ``` python
+    ngr = BulkGetTracksAudioFeatures(track_ids)
+    ngr.create_request()
+
+    features = ngr.matrix()
+    upbeat = features.where(energy=(0.7, None), tempo=(120, 140))
+    upbeat.track_ids
+
+    ```
+
+    Every method which selects or transforms rows returns a new matrix; the original is never changed.
+    """
+
+    def __init__(self, track_ids: list, values: np.ndarray, columns: tuple = COLUMNS) -> None:
+        values = np.ascontiguousarray(values, dtype=np.float32)
+        if values.ndim != 2 or values.shape != (len(track_ids), len(columns)):
+            raise ValueError(f"Parameter 'values' has shape {values.shape}, expected {(len(track_ids), len(columns))}.")
+
+        self.track_ids: list = list(track_ids)
+        self.values: np.ndarray = values
+        self.columns: tuple = tuple(columns)
+
+        self._index: dict = None
+        self._column_index: dict = {column: i for i, column in enumerate(self.columns)}
+
+    @classmethod
+    def from_features(cls, features: list) -> 'AudioFeaturesMatrix':
+        """ Builds the matrix from audio feature dicts or models (`AudioFeatures()` from `models` or `compact`). `None` entries, which the api returns for unknown ids, are skipped. Missing
+        values are `NaN`. """
+        track_ids = []
+        rows = []
+        for item in features:
+            if item is None:
+                continue
+            if isinstance(item, (ObjectScaffold, SlotScaffold)):
+                item = item.get_data()
+
+            track_ids.append(item['id'])
+            rows.append([item.get(column) for column in COLUMNS])
+
+        values = np.array(rows, dtype=np.float32).reshape(len(rows), len(COLUMNS))
+        return cls(track_ids, values)
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    def __contains__(self, track_id: str) -> bool:
+        return track_id in self.index
+
+    def __repr__(self) -> str:
+        return f"AudioFeaturesMatrix({len(self)} tracks, {len(self.columns)} columns)"
+
+    @property
+    def index(self) -> dict:
+        """ Maps each track id to its row. """
+        if self._index is None:
+            self._index = {track_id: row for row, track_id in enumerate(self.track_ids)}
+        return self._index
+
+    def column(self, name: str) -> np.ndarray:
+        """ Returns a column as a 1d array. This is a view, not a copy. """
+        if name not in self._column_index:
+            raise ValueError(f"Parameter 'name' returned '{name}', which is not a column.")
+        return self.values[:, self._column_index[name]]
+
+    def row(self, track_id: str) -> dict:
+        """ Returns the features of one track as a dict. """
+        return dict(zip(self.columns, self.values[self.index[track_id]].tolist()))
+
+    def select(self, columns: list) -> 'AudioFeaturesMatrix':
+        """ Returns a matrix with only `columns`, in that order. """
+        return AudioFeaturesMatrix(self.track_ids, self.values[:, [self._column_index[column] for column in columns]], tuple(columns))
+
+    # The methods below return the rows which are kept as a new matrix
+
+    def filter(self, mask: np.ndarray) -> 'AudioFeaturesMatrix':
+        """ Returns the rows where the boolean `mask` is `True`, e.g. `m.filter(m.column('valence') > 0.5)`. """
+        rows = np.flatnonzero(mask)
+        return AudioFeaturesMatrix([self.track_ids[row] for row in rows], self.values[rows], self.columns)
+
+    def where(self, **ranges) -> 'AudioFeaturesMatrix':
+        """ Returns the rows whose columns are within inclusive `(low, high)` ranges. Either end can be `None`, e.g. `m.where(energy=(0.7, None), tempo=(120, 140))`. """
+        mask = np.ones(len(self), dtype=bool)
+        for name, (low, high) in ranges.items():
+            column = self.column(name)
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        return self.filter(mask)
+
+    def take(self, track_ids: list) -> 'AudioFeaturesMatrix':
+        """ Returns the rows of `track_ids` which are in the matrix, in the order given. """
+        track_ids = [track_id for track_id in track_ids if track_id in self.index]
+        return AudioFeaturesMatrix(track_ids, self.values[[self.index[track_id] for track_id in track_ids]], self.columns)
+
+    def sort_by(self, name: str, descending: bool = False) -> 'AudioFeaturesMatrix':
+        """ Returns the rows ordered by a column. """
+        order = np.argsort(self.column(name), kind='stable')
+        if descending:
+            order = order[::-1]
+        return AudioFeaturesMatrix([self.track_ids[row] for row in order], self.values[order], self.columns)
+
+    def normalize(self, method: str = 'minmax') -> 'AudioFeaturesMatrix':
+        """ Returns the matrix with every column scaled: `minmax` to between 0 & 1, `zscore` to a mean of 0 & a standard deviation of 1. Constant columns become 0. """
+        if method == 'minmax':
+            low = np.nanmin(self.values, axis=0)
+            spread = np.nanmax(self.values, axis=0) - low
+        elif method == 'zscore':
+            low = np.nanmean(self.values, axis=0)
+            spread = np.nanstd(self.values, axis=0)
+        else:
+            raise ValueError(f"Parameter 'method' returned '{method}', expected 'minmax' or 'zscore'.")
+
+        spread[spread == 0] = 1
+        return AudioFeaturesMatrix(self.track_ids, (self.values - low) / spread, self.columns)
+
+    # Statistics over every row. `NaN` values are ignored
+
+    def mean(self) -> dict:
+        """ Returns the mean of every column. """
+        return dict(zip(self.columns, np.nanmean(self.values, axis=0).tolist()))
+
+    def describe(self) -> dict:
+        """ Returns the count, mean, standard deviation, minimum, median & maximum of every column. """
+        stats = {
+            'count': np.count_nonzero(~np.isnan(self.values), axis=0),
+            'mean': np.nanmean(self.values, axis=0),
+            'std': np.nanstd(self.values, axis=0),
+            'min': np.nanmin(self.values, axis=0),
+            'median': np.nanmedian(self.values, axis=0),
+            'max': np.nanmax(self.values, axis=0)
+        }
+        return {column: {name: values[i].item() for name, values in stats.items()} for i, column in enumerate(self.columns)}
+
+    def to_dicts(self) -> list:
+        """ Returns every row as a dict which includes its `id`. """
+        return [{'id': track_id, **dict(zip(self.columns, row))} for track_id, row in zip(self.track_ids, self.values.tolist())]
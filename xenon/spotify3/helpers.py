@@ -1,6 +1,6 @@
 
-# Import external modules
-from flask_login import current_user
+# Import internal modules
+from xenon.spotify3.context import current_context
 
 BASE_URL = 'https://api.spotify.com/v1'
 
@@ -16,18 +16,32 @@ MAX_PLAYER_ITEMS_COUNT = 50
 MIN_IDS_COUNT = 1
 
 MAX_SEED_COUNT = 5
+MAX_RECOMMENDATIONS_COUNT = 100
 
-_TOKEN = ''
+# The number of requests (chunks or pages) of one call which are sent at the same time
+MAX_CONCURRENT_CHUNKS = 4
+
+# The track attributes recommendations can be tuned on, each as `min_*`, `max_*` & `target_*`
+RECOMMENDATION_ATTRIBUTES = ('acousticness', 'danceability', 'duration_ms', 'energy', 'instrumentalness', 'key', 'liveness', 'loudness', 'mode', 'popularity', 'speechiness', 'tempo',
+                             'time_signature', 'valence')
+
+# Pass as `market` to send a request without a market, e.g. to get the `available_markets` of every object
+ANY_MARKET = ''
 
 def current_users_market() -> str:
-    """ Gets the ISO 3166-1 alpha-2 country code of the user """
-    return 'gb'
-    # return current_user.spotify_country_code
+    """ Gets the ISO 3166-1 alpha-2 country code of the user of the current `SpotifyContext()`. """
+    return current_context().market
+
+def resolve_market(market: str | None) -> str | None:
+    """ Returns the market a request is sent with: the market of the user if `market` is `None`, no market (`None`) if it is `ANY_MARKET`, otherwise `market`. """
+    if market is None:
+        return current_users_market()
+    return market or None
 
 def _headers() -> dict:
     return {
         'Content-Type': 'application/json',
-        'Authorization': f"Bearer {_TOKEN}"
+        'Authorization': f"Bearer {current_context().access_token}"
     }
 
 def config_list_to_comma_str(data_list: list) -> str:
@@ -0,0 +1,259 @@
+# Import internal modules
+from xenon.databases import db, LibraryObjects, LibraryItems, LibrarySyncs
+from xenon.exceptions import RequestError
+from xenon.helpers import convert_iso_to_dt
+from xenon.persistent_cache import _pack_markets, _unpack_markets
+from xenon.spotify3.context import current_context
+from xenon.spotify3.helpers import ANY_MARKET
+from xenon.spotify3.albums import GetCurrentUsersSavedAlbums
+from xenon.spotify3.audiobooks import GetCurrentUsersSavedAudiobooks
+from xenon.spotify3.episodes import GetCurrentUsersSavedEpisodes
+from xenon.spotify3.shows import GetCurrentUsersSavedShows
+from xenon.spotify3.tracks import GetCurrentUsersSavedTracks
+
+# Import external modules
+from flask import Flask
+import inspect
+import json
+import time
+
+""" A local mirror of the libraries of Spotify users (saved tracks, albums, shows, episodes & audiobooks) in the `library` bind, so a view of a library is an indexed query rather than paging
+through the whole collection on every visit.
+
+---
+``` python
+mirror = get_library_mirror()
+with spotify_context(user_id=str(current_user.id), market=current_user.spotify_country_code):
+    mirror.sync('tracks')                     # one request if nothing changed
+
+tracks = mirror.items('tracks', user_id=str(current_user.id), limit=50)    # [{'added_at': ..., 'track': {...}}, ...] newest first
+
+```
+
+Objects are stored once however many users saved them, so they are fetched without a market (with their `available_markets` rather than the `is_playable` & relinking of one user's
+market) & without the fields which belong to one user (`USER_FIELDS`).
+
+A sync walks the collection newest first & stops at the first item which is already stored with the same `added_at`, as everything older is then known. Removals do not change the newest items,
+so if the number of stored items does not match the `total` reported by Spotify the collection is synced in full instead.
+"""
+
+# collection: (request class, key of the object in each item, largest page)
+COLLECTIONS = {
+    'tracks': (GetCurrentUsersSavedTracks, 'track', 50),
+    'albums': (GetCurrentUsersSavedAlbums, 'album', 20),
+    'shows': (GetCurrentUsersSavedShows, 'show', 50),
+    'episodes': (GetCurrentUsersSavedEpisodes, 'episode', 50),
+    'audiobooks': (GetCurrentUsersSavedAudiobooks, 'audiobook', 50)
+}
+
+# Fields of saved objects which belong to the user who fetched them rather than to the object. They are not stored, as objects are shared between users.
+USER_FIELDS = ('resume_point',)
+
+# Rows are deleted in chunks of this many ids, below the number of variables SQLite allows in one query
+_DELETE_CHUNK = 500
+
+class SyncResult():
+    """ What a sync changed & how many requests it took. """
+
+    __slots__ = ('collection', 'added', 'removed', 'requests', 'full')
+
+    def __init__(self, collection: str, added: int = 0, removed: int = 0, requests: int = 0, full: bool = False) -> None:
+        self.collection: str = collection
+        self.added: int = added
+        self.removed: int = removed
+        self.requests: int = requests
+        self.full: bool = full
+
+    def __repr__(self) -> str:
+        return f"SyncResult(collection={self.collection!r}, added={self.added}, removed={self.removed}, requests={self.requests}, full={self.full})"
+
+def _validate_collection(collection: str) -> None:
+    if collection not in COLLECTIONS:
+        raise ValueError(f"Parameter 'collection' returned '{collection}' which is not one of {', '.join(COLLECTIONS)}.")
+
+def _sort_key(added_at: str | None) -> float | None:
+    return convert_iso_to_dt(added_at).timestamp() if added_at else None
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class LibraryMirror():
+    """ Keeps the libraries of Spotify users in the `LibraryItems` & `LibraryObjects` tables. Syncs are sent for the user of the current `spotify_context()`. Every method opens its own app context
+    so the mirror can be used from worker threads & outside of a flask request. """
+
+    def __init__(self, app: Flask) -> None:
+        self.app: Flask = app
+
+    # Syncing
+
+    def _fetch_page(self, collection: str, offset: int) -> object:
+        """ Sends one page request for the current user. Raises `RequestError()` if it fails. """
+        request_class, _, limit = COLLECTIONS[collection]
+
+        kwargs = {'market': ANY_MARKET} if 'market' in inspect.signature(request_class).parameters else {}
+        request = request_class(limit=limit, offset=offset, **kwargs)
+        request.create_request()
+        if request.code != 200:
+            raise RequestError(request)
+        return request.get_data()
+
+    def sync(self, collection: str, full: bool = False) -> SyncResult:
+        """ Brings the mirror of `collection` up to date with the library of the current user & returns what changed. With `full=True` every page is fetched & items which are no longer saved
+        are removed; a sync which finds the stored collection out of step does this by itself. """
+        _validate_collection(collection)
+        user_id = current_context().user_id
+        _, key, _ = COLLECTIONS[collection]
+
+        with self.app.app_context():
+            known = dict(db.session.query(LibraryItems.item_id, LibraryItems.added_at).filter_by(user_id=user_id, collection=collection).all())
+
+        fetched = []
+        requests = 0
+        offset = 0
+        while True:
+            page = self._fetch_page(collection, offset)
+            requests += 1
+
+            caught_up = False
+            for item in page.items:
+                # Saved audiobooks are returned without an `added_at` wrapper
+                object_ = item.get(key, item)
+                added_at = item.get('added_at')
+                if not full and object_['id'] in known and known[object_['id']] == added_at:
+                    caught_up = True
+                    break
+                fetched.append((object_, added_at))
+
+            total = page.total
+            if caught_up or page.next is None:
+                break
+            offset += len(page.items)
+
+        ids = {object_['id'] for object_, _ in fetched}
+        if not full and len(ids | set(known)) != total:
+            result = self.sync(collection, full=True)
+            result.requests += requests
+            return result
+
+        removed = [item_id for item_id in known if item_id not in ids] if full else []
+        added = sum(1 for object_, added_at in fetched if known.get(object_['id'], False) != added_at)
+        self._store(user_id, collection, fetched, removed, total, full)
+        return SyncResult(collection, added, len(removed), requests, full)
+
+    def sync_all(self) -> dict:
+        """ Syncs every collection of the current user. Returns `{collection: SyncResult()}`. """
+        return {collection: self.sync(collection) for collection in COLLECTIONS}
+
+    def _store(self, user_id: str, collection: str, fetched: list, removed: list, total: int, full: bool) -> None:
+        """ Writes the fetched items (newest first) & deletes the removed ones. Items without an `added_at` are ordered after (full sync) or before (incremental sync) the stored items by
+        position. """
+        now = time.time()
+
+        with self.app.app_context():
+            if full:
+                base = 0.0
+            else:
+                base = db.session.query(db.func.coalesce(db.func.max(LibraryItems.sort_key), 0.0)).filter_by(user_id=user_id, collection=collection).scalar()
+
+            for position, (object_, added_at) in enumerate(fetched):
+                sort_key = _sort_key(added_at)
+                if sort_key is None:
+                    sort_key = base + len(fetched) - position
+
+                db.session.merge(LibraryObjects(collection=collection, item_id=object_['id'], name=object_.get('name') or '', data=self.encode(object_), updated_at=now))
+                db.session.merge(LibraryItems(user_id=user_id, collection=collection, item_id=object_['id'], added_at=added_at, sort_key=sort_key))
+
+            for start in range(0, len(removed), _DELETE_CHUNK):
+                LibraryItems.query.filter(LibraryItems.user_id == user_id, LibraryItems.collection == collection, LibraryItems.item_id.in_(removed[start:start + _DELETE_CHUNK])).delete()
+
+            db.session.merge(LibrarySyncs(user_id=user_id, collection=collection, total=total, synced_at=now))
+            db.session.commit()
+
+    # Reading
+
+    def _user_id(self, user_id: str | None) -> str:
+        return user_id if user_id is not None else current_context().user_id
+
+    def items(self, collection: str, user_id: str = None, limit: int = 50, offset: int = 0) -> list:
+        """ Returns a page of the stored `collection`, newest first, in the shape of the items of a Spotify page (e.g. `{'added_at': ..., 'track': {...}}`). Defaults to the current user. """
+        _validate_collection(collection)
+        _, key, _ = COLLECTIONS[collection]
+
+        with self.app.app_context():
+            rows = db.session.query(LibraryItems.added_at, LibraryObjects.data).join(
+                LibraryObjects, (LibraryObjects.collection == LibraryItems.collection) & (LibraryObjects.item_id == LibraryItems.item_id)
+            ).filter(
+                LibraryItems.user_id == self._user_id(user_id), LibraryItems.collection == collection
+            ).order_by(LibraryItems.sort_key.desc()).limit(limit).offset(offset).all()
+
+        return [{'added_at': added_at, key: self.decode(data)} for added_at, data in rows]
+
+    def count(self, collection: str, user_id: str = None) -> int:
+        """ Returns the number of stored items of `collection`. """
+        _validate_collection(collection)
+        with self.app.app_context():
+            return LibraryItems.query.filter_by(user_id=self._user_id(user_id), collection=collection).count()
+
+    def contains(self, collection: str, item_ids: list, user_id: str = None) -> list:
+        """ Returns whether each of `item_ids` is saved, in the same order, as `CheckUsersSaved*` does. """
+        _validate_collection(collection)
+        with self.app.app_context():
+            saved = {row.item_id for row in LibraryItems.query.filter(
+                LibraryItems.user_id == self._user_id(user_id), LibraryItems.collection == collection, LibraryItems.item_id.in_(item_ids)
+            ).with_entities(LibraryItems.item_id)}
+
+        return [item_id in saved for item_id in item_ids]
+
+    def search(self, collection: str, query: str, user_id: str = None, limit: int = 50) -> list:
+        """ Returns the stored items of `collection` whose name contains `query` (case insensitive), newest first. """
+        _validate_collection(collection)
+        _, key, _ = COLLECTIONS[collection]
+
+        with self.app.app_context():
+            rows = db.session.query(LibraryItems.added_at, LibraryObjects.data).join(
+                LibraryObjects, (LibraryObjects.collection == LibraryItems.collection) & (LibraryObjects.item_id == LibraryItems.item_id)
+            ).filter(
+                LibraryItems.user_id == self._user_id(user_id), LibraryItems.collection == collection, LibraryObjects.name.ilike(f"%{query}%")
+            ).order_by(LibraryItems.sort_key.desc()).limit(limit).all()
+
+        return [{'added_at': added_at, key: self.decode(data)} for added_at, data in rows]
+
+    def last_synced(self, collection: str, user_id: str = None) -> float | None:
+        """ Returns when `collection` was last synced (a unix timestamp), or `None` if it never has been. """
+        _validate_collection(collection)
+        with self.app.app_context():
+            row = db.session.get(LibrarySyncs, (self._user_id(user_id), collection))
+            return row.synced_at if row is not None else None
+
+    def encode(self, object_: dict) -> bytes:
+        """ Converts a saved object into the bytes which are stored, with its `available_markets` packed as in `xenon.persistent_cache` & without its `USER_FIELDS`. """
+        object_ = {key: value for key, value in object_.items() if key not in USER_FIELDS}
+        return json.dumps(_pack_markets(object_), separators=(',', ':')).encode('utf-8')
+
+    def decode(self, data: bytes) -> dict:
+        return _unpack_markets(json.loads(data))
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+_library_mirror: LibraryMirror = None
+
+def get_library_mirror() -> LibraryMirror | None:
+    """ Returns the mirror set up by `configure_library_mirror()`, or `None` if it has not been set up. """
+    return _library_mirror
+
+def configure_library_mirror(app: Flask) -> LibraryMirror:
+    """ Creates the tables of the `library` bind & sets up the library mirror. """
+    global _library_mirror
+
+    with app.app_context():
+        db.create_all(bind_key='library')
+
+    _library_mirror = LibraryMirror(app)
+    return _library_mirror
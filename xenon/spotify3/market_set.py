@@ -0,0 +1,127 @@
+""" A compact form of the `available_markets` lists on albums, tracks, shows & audiobooks. Each list of about 180 two letter codes becomes one integer with a bit per market of `MARKETS`.
+
+---
+``` python
+markets = MarketSet.from_codes(album.available_markets)
+
+'GB' in markets
+len(markets & other_markets)
+markets.to_list()
+```
+"""
+
+# Import external modules
+import weakref
+
+# Every ISO 3166-1 alpha-2 code in alphabetical order, followed by the user-assigned codes Spotify uses (`XK` for Kosovo). The position of a code is its bit, so this table is stored in the
+# persistent cache: codes may only ever be appended to the end of it.
+MARKETS = (
+    'AD', 'AE', 'AF', 'AG', 'AI', 'AL', 'AM', 'AO', 'AQ', 'AR', 'AS', 'AT', 'AU', 'AW', 'AX', 'AZ', 'BA', 'BB', 'BD', 'BE', 'BF', 'BG', 'BH', 'BI', 'BJ', 'BL', 'BM', 'BN', 'BO', 'BQ', 'BR', 'BS',
+    'BT', 'BV', 'BW', 'BY', 'BZ', 'CA', 'CC', 'CD', 'CF', 'CG', 'CH', 'CI', 'CK', 'CL', 'CM', 'CN', 'CO', 'CR', 'CU', 'CV', 'CW', 'CX', 'CY', 'CZ', 'DE', 'DJ', 'DK', 'DM', 'DO', 'DZ', 'EC', 'EE',
+    'EG', 'EH', 'ER', 'ES', 'ET', 'FI', 'FJ', 'FK', 'FM', 'FO', 'FR', 'GA', 'GB', 'GD', 'GE', 'GF', 'GG', 'GH', 'GI', 'GL', 'GM', 'GN', 'GP', 'GQ', 'GR', 'GS', 'GT', 'GU', 'GW', 'GY', 'HK', 'HM',
+    'HN', 'HR', 'HT', 'HU', 'ID', 'IE', 'IL', 'IM', 'IN', 'IO', 'IQ', 'IR', 'IS', 'IT', 'JE', 'JM', 'JO', 'JP', 'KE', 'KG', 'KH', 'KI', 'KM', 'KN', 'KP', 'KR', 'KW', 'KY', 'KZ', 'LA', 'LB', 'LC',
+    'LI', 'LK', 'LR', 'LS', 'LT', 'LU', 'LV', 'LY', 'MA', 'MC', 'MD', 'ME', 'MF', 'MG', 'MH', 'MK', 'ML', 'MM', 'MN', 'MO', 'MP', 'MQ', 'MR', 'MS', 'MT', 'MU', 'MV', 'MW', 'MX', 'MY', 'MZ', 'NA',
+    'NC', 'NE', 'NF', 'NG', 'NI', 'NL', 'NO', 'NP', 'NR', 'NU', 'NZ', 'OM', 'PA', 'PE', 'PF', 'PG', 'PH', 'PK', 'PL', 'PM', 'PN', 'PR', 'PS', 'PT', 'PW', 'PY', 'QA', 'RE', 'RO', 'RS', 'RU', 'RW',
+    'SA', 'SB', 'SC', 'SD', 'SE', 'SG', 'SH', 'SI', 'SJ', 'SK', 'SL', 'SM', 'SN', 'SO', 'SR', 'SS', 'ST', 'SV', 'SX', 'SY', 'SZ', 'TC', 'TD', 'TF', 'TG', 'TH', 'TJ', 'TK', 'TL', 'TM', 'TN', 'TO',
+    'TR', 'TT', 'TV', 'TW', 'TZ', 'UA', 'UG', 'UM', 'US', 'UY', 'UZ', 'VA', 'VC', 'VE', 'VG', 'VI', 'VN', 'VU', 'WF', 'WS', 'YE', 'YT', 'ZA', 'ZM', 'ZW',
+    'XK'
+)
+
+_BITS = {code: 1 << index for index, code in enumerate(MARKETS)}
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class MarketSet():
+    """ An immutable set of markets. Membership, `&`, `|`, `-` & `len()` work on the bits directly; `to_list()` gives the codes back in the order of `MARKETS`. Codes which are not in `MARKETS`
+    are kept separately in `other` so nothing Spotify returns is lost. Equal sets made by `from_codes()` are shared, as most objects are available in the same markets. """
+
+    __slots__ = ('bits', 'other', '__weakref__')
+
+    def __init__(self, bits: int = 0, other: frozenset = frozenset()) -> None:
+        self.bits: int = bits
+        self.other: frozenset = other
+
+    @classmethod
+    def from_codes(cls, codes: list) -> 'MarketSet':
+        """ Creates the set of a list of ISO 3166-1 alpha-2 codes (any case). A `MarketSet()` is returned as it is. """
+        if isinstance(codes, MarketSet):
+            return codes
+
+        bits = 0
+        other = []
+        for code in codes:
+            code = code.upper()
+            bit = _BITS.get(code)
+            if bit is None:
+                other.append(code)
+            else:
+                bits |= bit
+        return _shared(cls(bits, frozenset(other)))
+
+    @classmethod
+    def from_hex(cls, value: str) -> 'MarketSet':
+        """ Reverse of `self.to_hex()`. """
+        bits, _, other = value.partition(':')
+        return _shared(cls(int(bits, 16), frozenset(other.split(',')) if other else frozenset()))
+
+    def to_hex(self) -> str:
+        """ Returns the set as a short string for storage, e.g. in the persistent cache. """
+        if not self.other:
+            return format(self.bits, 'x')
+        return f"{self.bits:x}:{','.join(sorted(self.other))}"
+
+    def to_list(self) -> list:
+        """ Returns the codes of the set, as `available_markets` is returned by Spotify. """
+        codes = [code for code, bit in _BITS.items() if self.bits & bit]
+        return codes + sorted(self.other)
+
+    def __contains__(self, code: str) -> bool:
+        code = code.upper()
+        bit = _BITS.get(code)
+        if bit is None:
+            return code in self.other
+        return bool(self.bits & bit)
+
+    def __and__(self, other: 'MarketSet') -> 'MarketSet':
+        return MarketSet(self.bits & other.bits, self.other & other.other)
+
+    def __or__(self, other: 'MarketSet') -> 'MarketSet':
+        return MarketSet(self.bits | other.bits, self.other | other.other)
+
+    def __sub__(self, other: 'MarketSet') -> 'MarketSet':
+        return MarketSet(self.bits & ~other.bits, self.other - other.other)
+
+    def __len__(self) -> int:
+        return self.bits.bit_count() + len(self.other)
+
+    def __bool__(self) -> bool:
+        return bool(self.bits or self.other)
+
+    def __iter__(self) -> iter:
+        return iter(self.to_list())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MarketSet):
+            return NotImplemented
+        return self.bits == other.bits and self.other == other.other
+
+    def __hash__(self) -> int:
+        return hash((self.bits, self.other))
+
+    def __repr__(self) -> str:
+        return f"MarketSet({len(self)} markets)"
+
+    def isdisjoint(self, other: 'MarketSet') -> bool:
+        """ Returns `True` if the sets have no market in common. """
+        return not (self.bits & other.bits or self.other & other.other)
+
+# Keyed on the contents rather than the set itself & weak, so a set is forgotten once no object is available in its markets any more
+_shared_sets = weakref.WeakValueDictionary()
+
+def _shared(market_set: MarketSet) -> MarketSet:
+    """ Returns the shared instance equal to `market_set`. """
+    return _shared_sets.setdefault((market_set.bits, market_set.other), market_set)
@@ -1,6 +1,7 @@
 
 # Import internal modules
 from xenon.models import ObjectScaffold
+from xenon.spotify3.market_set import MarketSet
 
 """ MODIFIED ATTR:
 1. id
@@ -36,7 +37,19 @@ class FollowingRequest(ObjectScaffold):
         """ The cursor to use as key to find the next page of items. """
         return self.get_data()['cursors']['after']
 
+    @property
+    def total(self) -> int | None:
+        """ The total number of items available to return. Cursor based pages may not include this, in which case `None` is returned. """
+        return self.get_data().get('total')
+
+    @property
+    def next(self) -> str | None:
+        """ URL to the next page of items. `None` if this is the last page. """
+        return self.get_data().get('next')
+
 class Album(ObjectScaffold):
+    _interned = True
+
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
@@ -56,6 +69,11 @@ class Album(ObjectScaffold):
         market. """
         return self.get_data()['available_markets']
 
+    @property
+    def markets(self) -> MarketSet:
+        """ `available_markets` as a `MarketSet()`, which supports membership, intersection & count queries without the list. """
+        return MarketSet.from_codes(self.get_data().get('available_markets') or [])
+
     @property
     def external_urls(self) -> dict:
         """ Known external URLs for this album. """
@@ -114,6 +132,8 @@ class Album(ObjectScaffold):
         return FollowingRequest(self.get_data()['tracks'])   
 
 class Artist(ObjectScaffold):
+    _interned = True
+
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
@@ -169,6 +189,8 @@ class Artist(ObjectScaffold):
         return self.get_data()['uri']
 
 class Show(ObjectScaffold):
+    _interned = True
+
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
@@ -177,6 +199,11 @@ class Show(ObjectScaffold):
         """ A list of the countries in which the show can be played, identified by their ISO 3166-1 alpha-2 code. """
         return self.get_data()['available_markets']
 
+    @property
+    def markets(self) -> MarketSet:
+        """ `available_markets` as a `MarketSet()`, which supports membership, intersection & count queries without the list. """
+        return MarketSet.from_codes(self.get_data().get('available_markets') or [])
+
     @property
     def copyrights(self) -> list:
         """ The copyright statements of the show. """
@@ -368,6 +395,11 @@ class Audiobook(ObjectScaffold):
     def available_markets(self) -> list:
         """ A list of the countries in which the audiobook can be played, identified by their ISO 3166-1 alpha-2 code. """
         return self.get_data()['available_markets']
+
+    @property
+    def markets(self) -> MarketSet:
+        """ `available_markets` as a `MarketSet()`, which supports membership, intersection & count queries without the list. """
+        return MarketSet.from_codes(self.get_data().get('available_markets') or [])
         
     @property
     def copyrights(self) -> list:
@@ -561,6 +593,8 @@ class Chapter(ObjectScaffold):
         return self.get_data()['audiobook']
         
 class Track(ObjectScaffold):
+    _interned = True
+
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
@@ -578,6 +612,11 @@ class Track(ObjectScaffold):
     def available_markets(self) -> list:
         """ A list of the countries in which the track can be played, identified by their ISO 3166-1 alpha-2 code. """
         return self.get_data()['available_markets']
+
+    @property
+    def markets(self) -> MarketSet:
+        """ `available_markets` as a `MarketSet()`, which supports membership, intersection & count queries without the list. """
+        return MarketSet.from_codes(self.get_data().get('available_markets') or [])
         
     @property   
     def disc_number(self) -> int:
@@ -669,99 +708,98 @@ class Track(ObjectScaffold):
         return self.get_data()['is_local']
         
 class AudioFeatures(ObjectScaffold):
-    @property
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
     @property
     def acousticness(self) -> float:
         """ A confidence measure from 0.0 to 1.0 of whether the track is acoustic. 1.0 represents high confidence the track is acoustic. """
-        return self.get_data()['audio_features']['acousticness']
+        return self.get_data()['acousticness']
     
     @property
     def analysis_url(self) -> str:
         """ A URL to access the full audio analysis of this track. An access token is required to access this data. """
-        return self.get_data()['audio_features']['analysis_url']
+        return self.get_data()['analysis_url']
     
     @property
     def danceability(self) -> float:
         """ Danceability describes how suitable a track is for dancing based on a combination of musical elements including tempo, rhythm stability, beat strength, and overall regularity. A value of 0.0 is least danceable and 1.0 is most danceable. """
-        return self.get_data()['audio_features']['danceability']
+        return self.get_data()['danceability']
     
     @property
     def duration(self) -> int:
         """ The duration of the track in milliseconds. """
-        return self.get_data()['audio_features']['duration_ms']
+        return self.get_data()['duration_ms']
     
     @property
     def energy(self) -> float:
         """ Energy is a measure from 0.0 to 1.0 and represents a perceptual measure of intensity and activity. Typically, energetic tracks feel fast, loud, and noisy. For example, death metal has high energy, while a Bach prelude scores low on the scale. Perceptual features contributing to this attribute include dynamic range, perceived loudness, timbre, onset rate, and general entropy. """
-        return self.get_data()['audio_features']['energy']
+        return self.get_data()['energy']
     
     @property
     def audio_feature_id(self) -> str:
         """ The Spotify ID for the track. """
-        return self.get_data()['audio_features']['id']
+        return self.get_data()['id']
     
     @property
     def instrumentalness(self) -> float:
         """ Predicts whether a track contains no vocals. "Ooh" and "aah" sounds are treated as instrumental in this context. Rap or spoken word tracks are clearly "vocal". The closer the instrumentalness value is to 1.0, the greater likelihood the track contains no vocal content. Values above 0.5 are intended to represent instrumental tracks, but confidence is higher as the value approaches 1.0. """
-        return self.get_data()['audio_features']['instrumentalness']
+        return self.get_data()['instrumentalness']
     
     @property
     def key(self) -> int:
         """ The key the track is in. Integers map to pitches using standard [Pitch Class notation](https://en.wikipedia.org/wiki/Pitch_class). E.g. 0 = C, 1 = C♯/D♭, 2 = D, and so on. If no key was detected, the value is -1. """
-        return self.get_data()['audio_features']['key']
+        return self.get_data()['key']
     
     @property
     def liveness(self) -> float:
         """ Detects the presence of an audience in the recording. Higher liveness values represent an increased probability that the track was performed live. A value above 0.8 provides strong likelihood that the track is live. """
-        return self.get_data()['audio_features']['liveness']
+        return self.get_data()['liveness']
     
     @property
     def loudness(self) -> float:
         """ The overall loudness of a track in decibels (dB). Loudness values are averaged across the entire track and are useful for comparing relative loudness of tracks. Loudness is the quality of a sound that is the primary psychological correlate of physical strength (amplitude). Values typically range between -60 and 0 db. """
-        return self.get_data()['audio_features']['loudness']
+        return self.get_data()['loudness']
     
     @property
     def mode(self) -> int:
         """ Mode indicates the modality (major or minor) of a track, the type of scale from which its melodic content is derived. Major is represented by 1 and minor is 0. """
-        return self.get_data()['audio_features']['mode']
+        return self.get_data()['mode']
     
     @property
     def speechiness(self) -> float:
         """ Speechiness detects the presence of spoken words in a track. The more exclusively speech-like the recording (e.g. talk show, audio book, poetry), the closer to 1.0 the attribute value. Values above 0.66 describe tracks that are probably made entirely of spoken words. Values between 0.33 and 0.66 describe tracks that may contain both music and speech, either in sections or layered, including such cases as rap music. Values below 0.33 most likely represent music and other non-speech-like tracks. """
-        return self.get_data()['audio_features']['speechiness']
+        return self.get_data()['speechiness']
     
     @property
     def tempo(self) -> float:
         """ The overall estimated tempo of a track in beats per minute (BPM). In musical terminology, tempo is the speed or pace of a given piece and derives directly from the average beat duration. """
-        return self.get_data()['audio_features']['tempo']
+        return self.get_data()['tempo']
     
     @property
     def time_signature(self) -> int:
         """ An estimated time signature. The time signature (meter) is a notational convention to specify how many beats are in each bar (or measure). The time signature ranges from 3 to 7 indicating time signatures of "3/4", to "7/4". """
-        return self.get_data()['audio_features']['time_signature']
+        return self.get_data()['time_signature']
     
     @property
     def track_href(self) -> str:
         """ A link to the Web API endpoint providing full details of the track. """
-        return self.get_data()['audio_features']['track_href']
+        return self.get_data()['track_href']
     
     @property
     def type_(self) -> str:
         """ The object type. """
-        return self.get_data()['audio_features']['type_']
+        return self.get_data()['type']
     
     @property
     def uri(self) -> str:
         """ The Spotify URI for the track. """
-        return self.get_data()['audio_features']['uri']
+        return self.get_data()['uri']
     
     @property
     def valence(self) -> float:
         """ A measure from 0.0 to 1.0 describing the musical positiveness conveyed by a track. Tracks with high valence sound more positive (e.g. happy, cheerful, euphoric), while tracks with low valence sound more negative (e.g. sad, depressed, angry). """
-        return self.get_data()['audio_features']['valence']
+        return self.get_data()['valence']
 
 class SearchResults(ObjectScaffold):
     def __init__(self, data: dict) -> None:
@@ -861,9 +899,12 @@ class User(ObjectScaffold):
         return self.get_data()['uri']
 
 class Playlist(ObjectScaffold):
+    _interned = True
+
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
+    @property
     def is_collaborative(self) -> bool:
         """ True if the owner allows other users to modify the playlist. """
         return self.get_data()['collaborative']
@@ -892,6 +933,11 @@ class Playlist(ObjectScaffold):
     def playlist_id(self) -> str:
         """ The [Spotify ID](https://developer.spotify.com/documentation/web-api/#spotify-uris-and-ids) for the playlist. """
         return self.get_data()['id']
+
+    @property
+    def snapshot_id(self) -> str:
+        """ The version identifier for the current playlist. Changes every time the playlist is modified, so it can be used to tell whether a stored copy of the items is still current. """
+        return self.get_data()['snapshot_id']
         
     @property
     def images(self) -> list:
@@ -932,18 +978,22 @@ class Category(ObjectScaffold):
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
+    @property
     def href(self) -> str:
         """ A link to the Web API endpoint returning full details of the category. """
         return self.get_data()['href']
 
+    @property
     def icons(self) -> list:
         """ The category icon, in various sizes. """
         return self.get_data()['icons']
 
+    @property
     def category_id(self) -> str:
         """ The [Spotify category ID](https://developer.spotify.com/documentation/web-api/#spotify-uris-and-ids) of the category. """
         return self.get_data()['id']
 
+    @property
     def name(self) -> str:
         """ The name of the category. """
         return self.get_data()['name']
@@ -952,6 +1002,7 @@ class Device(ObjectScaffold):
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
+    @property
     def device_id(self) -> str:
         """ The device ID. """
         return self.get_data()['id']
@@ -990,10 +1041,12 @@ class Queue(ObjectScaffold):
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
+    @property
     def currently_playing(self) -> Track:
         """ Information about the track that is currently playing. """
         return Track(self.get_data()['currently_playing'])
 
+    @property
     def queue(self) -> list:
         """ The tracks or episodes in the queue. Can be empty. """
         items_list = []
@@ -1010,6 +1063,7 @@ class PlaybackState(ObjectScaffold):
     def __init__(self, data: dict) -> None:
         super().__init__(data)
 
+    @property
     def device(self) -> Device:
         """ The device that is currently active. """
         return Device(self.get_data()['device'])
@@ -1061,4 +1115,14 @@ class PlaybackState(ObjectScaffold):
     @property
     def actions(self) -> dict:
         """ Allows to update the user interface based on which playback actions are available within the current context. """
-        return self.get_data()['actions']
\ No newline at end of file
+        return self.get_data()['actions']
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+# The nested json of these models is interned with them (see `ObjectScaffold()`). Set here as the models refer to models which are defined after them.
+Album._nested = {'artists': Artist}
+Track._nested = {'album': Album, 'artists': Artist}
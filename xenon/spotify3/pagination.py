@@ -0,0 +1,235 @@
+# Import internal modules
+from xenon.exceptions import RequestError
+from xenon.spotify3.helpers import MAX_CONCURRENT_CHUNKS
+from xenon.spotify3.models import FollowingRequest
+
+# Import external modules
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import asyncio
+
+""" Lazily walks the pages of any endpoint that returns a `FollowingRequest()`. Only the page being consumed and the page being prefetched are held in memory, so a 10,000 item playlist never
+needs more than two pages at a time.
+
+---
+``` python
+for item in iterate_items(GetPlaylistItems, playlist_id):
+    ...
+
+async for item in aiterate_items(GetCurrentUsersFollowedArtists, cursor=True):
+    ...
+
+# Endpoints whose page is not the whole data package need a `page_getter`
+for track in iterate_items(SearchForItem, 'query', filters=['track'], page_getter=lambda r: r.get_data().tracks):
+    ...
+
+# Offset pages can also be fetched all at once: the first page reports `total`, then every remaining offset is requested in parallel. Cursor pages are followed one at a time.
+items = fetch_all_items(GetCurrentUsersSavedTracks)
+```
+"""
+
+def _default_page(request: object) -> FollowingRequest:
+    """ Returns the page of a request whose `_config_data()` wraps the data in a `FollowingRequest()`. """
+    return request.get_data()
+
+def _next_kwargs(page: FollowingRequest, cursor: bool) -> dict | None:
+    """ Returns the keyword arguments for the request of the page after `page`. `None` if `page` is the last page. """
+    if page.next is None or not page.items:
+        return None
+
+    if cursor:
+        return {'after': page.after}
+    return {'offset': page.offset}
+
+def _fetch_page(request_class: type, args: tuple, kwargs: dict, page_getter: callable) -> FollowingRequest:
+    """ Creates & sends one page request. Raises `RequestError()` if it fails. """
+    request = request_class(*args, **kwargs)
+    request.create_request()
+
+    if request.code != 200:
+        raise RequestError(request)
+    return page_getter(request)
+
+async def _fetch_page_async(request_class: type, args: tuple, kwargs: dict, page_getter: callable) -> FollowingRequest:
+    """ Awaitable version of `_fetch_page()`. """
+    request = request_class(*args, **kwargs)
+    await request.create_request_async()
+
+    if request.code != 200:
+        raise RequestError(request)
+    return page_getter(request)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+def iterate_pages(request_class: type, *args, cursor: bool = False, page_getter: callable = _default_page, prefetch: bool = True, **kwargs) -> iter:
+    """ Yields every page of `request_class` as a `FollowingRequest()`. `args` & `kwargs` are passed to `request_class` along with the `offset` (or `after` if `cursor` is `True`) of each page. If
+    `prefetch` is `True` the next page is requested on a background thread while the current page is being consumed. """
+
+    page = _fetch_page(request_class, args, kwargs, page_getter)
+
+    if not prefetch:
+        while page is not None:
+            yield page
+            next_kwargs = _next_kwargs(page, cursor)
+            page = None if next_kwargs is None else _fetch_page(request_class, args, {**kwargs, **next_kwargs}, page_getter)
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        while page is not None:
+            next_kwargs = _next_kwargs(page, cursor)
+
+            future = None
+            if next_kwargs is not None:
+                future = executor.submit(contextvars.copy_context().run, _fetch_page, request_class, args, {**kwargs, **next_kwargs}, page_getter)
+
+            yield page
+            page = None if future is None else future.result()
+
+def iterate_items(request_class: type, *args, cursor: bool = False, page_getter: callable = _default_page, prefetch: bool = True, **kwargs) -> iter:
+    """ Yields every item across every page of `request_class`. See `iterate_pages()`. """
+    for page in iterate_pages(request_class, *args, cursor=cursor, page_getter=page_getter, prefetch=prefetch, **kwargs):
+        yield from page.items
+
+async def aiterate_pages(request_class: type, *args, cursor: bool = False, page_getter: callable = _default_page, prefetch: bool = True, **kwargs) -> iter:
+    """ Async generator version of `iterate_pages()`. The next page is requested as a task while the current page is being consumed. """
+
+    page = await _fetch_page_async(request_class, args, kwargs, page_getter)
+
+    while page is not None:
+        next_kwargs = _next_kwargs(page, cursor)
+
+        task = None
+        if next_kwargs is not None:
+            task = _fetch_page_async(request_class, args, {**kwargs, **next_kwargs}, page_getter)
+            if prefetch:
+                task = asyncio.create_task(task)
+
+        try:
+            yield page
+        except GeneratorExit:
+            if isinstance(task, asyncio.Task):
+                task.cancel()
+            elif task is not None:
+                task.close()
+            raise
+
+        page = None if task is None else await task
+
+async def aiterate_items(request_class: type, *args, cursor: bool = False, page_getter: callable = _default_page, prefetch: bool = True, **kwargs) -> iter:
+    """ Async generator version of `iterate_items()`. """
+    async for page in aiterate_pages(request_class, *args, cursor=cursor, page_getter=page_getter, prefetch=prefetch, **kwargs):
+        for item in page.items:
+            yield item
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+def _is_offset_page(page: FollowingRequest) -> bool:
+    """ Returns `True` if the remaining pages after `page` can be worked out from its `total` & requested by offset. Cursor based pages (e.g. `GetCurrentUsersFollowedArtists()`) & pages
+    without a `total` can only be followed one `next` at a time. """
+    return 'cursors' not in page.get_data() and page.total is not None
+
+def _following_pages(request_class: type, args: tuple, kwargs: dict, page_getter: callable, first_page: FollowingRequest, max_items: int = None) -> list:
+    """ Returns `first_page` & every page after it, requested one after another by following `next`. Used for pages which `_is_offset_page()` rejects. """
+    cursor = 'cursors' in first_page.get_data()
+    pages = [first_page]
+    count = len(first_page.items)
+
+    while max_items is None or count < max_items:
+        next_kwargs = _next_kwargs(pages[-1], cursor)
+        if next_kwargs is None:
+            break
+
+        pages.append(_fetch_page(request_class, args, {**kwargs, **next_kwargs}, page_getter))
+        count += len(pages[-1].items)
+    return pages
+
+async def _afollowing_pages(request_class: type, args: tuple, kwargs: dict, page_getter: callable, first_page: FollowingRequest, max_items: int = None) -> list:
+    """ Awaitable version of `_following_pages()`. """
+    cursor = 'cursors' in first_page.get_data()
+    pages = [first_page]
+    count = len(first_page.items)
+
+    while max_items is None or count < max_items:
+        next_kwargs = _next_kwargs(pages[-1], cursor)
+        if next_kwargs is None:
+            break
+
+        pages.append(await _fetch_page_async(request_class, args, {**kwargs, **next_kwargs}, page_getter))
+        count += len(pages[-1].items)
+    return pages
+
+def _remaining_offsets(page: FollowingRequest, max_items: int = None) -> list:
+    """ Returns the offset of every page after `page`, using the `total` it reports. `max_items` caps the number of items fetched (counted from the offset of `page`). Raises `ValueError()` for
+    pages which `_is_offset_page()` rejects. """
+    if not _is_offset_page(page):
+        raise ValueError("Parameter 'page' returned a cursor based page or one without a total, whose remaining offsets are unknown.")
+
+    end = page.total
+    if max_items is not None:
+        end = min(end, page.get_data()['offset'] + max_items)
+
+    return list(range(page.offset, end, page.limit))
+
+def fetch_all_pages(request_class: type, *args, page_getter: callable = _default_page, max_workers: int = MAX_CONCURRENT_CHUNKS, max_items: int = None, **kwargs) -> list:
+    """ Returns every page of an offset paginated `request_class`. The first page is requested on its own; its `total` gives every remaining offset, which are then requested in parallel with at
+    most `max_workers` in flight. The pages are returned in offset order. Use `max_items` to cap endpoints whose `total` is very large (e.g. `SearchForItem()`).
+
+    Cursor based endpoints (e.g. `GetCurrentUsersFollowedArtists()`) & pages without a `total` cannot be requested in parallel, so their pages are requested one after another instead. """
+
+    first_page = _fetch_page(request_class, args, kwargs, page_getter)
+    if not _is_offset_page(first_page):
+        return _following_pages(request_class, args, kwargs, page_getter, first_page, max_items)
+
+    offsets = _remaining_offsets(first_page, max_items)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, _fetch_page, request_class, args, {**kwargs, 'offset': offset}, page_getter) for offset in offsets]
+        pages = [future.result() for future in futures]
+
+    return [first_page] + pages
+
+def fetch_all_items(request_class: type, *args, page_getter: callable = _default_page, max_workers: int = MAX_CONCURRENT_CHUNKS, max_items: int = None, **kwargs) -> list:
+    """ Returns every item of an offset paginated `request_class`, in order. See `fetch_all_pages()`. """
+    items = []
+    for page in fetch_all_pages(request_class, *args, page_getter=page_getter, max_workers=max_workers, max_items=max_items, **kwargs):
+        items.extend(page.items)
+
+    if max_items is not None:
+        return items[:max_items]
+    return items
+
+async def afetch_all_pages(request_class: type, *args, page_getter: callable = _default_page, max_workers: int = MAX_CONCURRENT_CHUNKS, max_items: int = None, **kwargs) -> list:
+    """ Awaitable version of `fetch_all_pages()`. """
+
+    first_page = await _fetch_page_async(request_class, args, kwargs, page_getter)
+    if not _is_offset_page(first_page):
+        return await _afollowing_pages(request_class, args, kwargs, page_getter, first_page, max_items)
+
+    offsets = _remaining_offsets(first_page, max_items)
+
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def _fetch(offset: int) -> FollowingRequest:
+        async with semaphore:
+            return await _fetch_page_async(request_class, args, {**kwargs, 'offset': offset}, page_getter)
+
+    pages = await asyncio.gather(*[_fetch(offset) for offset in offsets])
+    return [first_page] + list(pages)
+
+async def afetch_all_items(request_class: type, *args, page_getter: callable = _default_page, max_workers: int = MAX_CONCURRENT_CHUNKS, max_items: int = None, **kwargs) -> list:
+    """ Awaitable version of `fetch_all_items()`. """
+    items = []
+    for page in await afetch_all_pages(request_class, *args, page_getter=page_getter, max_workers=max_workers, max_items=max_items, **kwargs):
+        items.extend(page.items)
+
+    if max_items is not None:
+        return items[:max_items]
+    return items
@@ -1,17 +1,17 @@
 
 # Import internal modules
 from xenon.models import GetRequest, PutRequest, PostRequest
-from xenon.spotify3.helpers import _headers, BASE_URL, MAX_PLAYER_ITEMS_COUNT, current_users_market
+from xenon.spotify3.helpers import _headers, BASE_URL, MAX_PLAYER_ITEMS_COUNT, resolve_market
 from xenon.spotify3.models import FollowingRequest, PlaybackState, Device, Queue
 
 class GetPlaybackState(GetRequest):
     """ Get information about the user's current playback state, including track or episode, progress, and active device. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-information-about-the-users-current-playback. """
-    def __init__(self, market: str = current_users_market()) -> None:
-        super.__init__()
+    def __init__(self, market: str = None) -> None:
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player"
         self.api_params = {
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -24,7 +24,7 @@ class GetPlaybackState(GetRequest):
 class TransferPlayback(PutRequest):
     """ Transfer playback to a new device and determine if it should start playing. https://developer.spotify.com/documentation/web-api/reference/#/operations/transfer-a-users-playback. """
     def __init__(self, device_id: str, play: bool = True) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player"
         self.api_params = {}
@@ -36,7 +36,7 @@ class TransferPlayback(PutRequest):
 class GetAvailableDevices(GetRequest):
     """ Get information about a user's available devices. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-a-users-available-devices. """
     def __init__(self) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/players/devices"
         self.api_params = {}
@@ -55,7 +55,7 @@ class GetAvailableDevices(GetRequest):
 class StartResumePlayback(PutRequest):
     """ Start a new context or resume current playback on the user's active device. https://developer.spotify.com/documentation/web-api/reference/#/operations/start-a-users-playback. """
     def __init__(self, device_id: str) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/play"
         self.api_params = {
@@ -66,7 +66,7 @@ class StartResumePlayback(PutRequest):
 class PausePlayback(PutRequest):
     """ Pause playback on the user's account. https://developer.spotify.com/documentation/web-api/reference/#/operations/pause-a-users-playback. """
     def __init__(self, device_id: str) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/pause"
         self.api_params = {
@@ -77,7 +77,7 @@ class PausePlayback(PutRequest):
 class SkipToNext(PostRequest):
     """ Skips to next track in the user's queue. https://developer.spotify.com/documentation/web-api/reference/#/operations/skip-users-playback-to-next-track. """
     def __init__(self, device_id: str) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/next"
         self.api_params = {
@@ -88,7 +88,7 @@ class SkipToNext(PostRequest):
 class SkipToPrevious(PostRequest):
     """ Skips to previous track in the user's queue. https://developer.spotify.com/documentation/web-api/reference/#/operations/skip-users-playback-to-previous-track. """
     def __init__(self, device_id: str) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/previous"
         self.api_params = {
@@ -99,7 +99,7 @@ class SkipToPrevious(PostRequest):
 class SeekToPosition(PutRequest):
     """ Seeks to the given position in the user's currently playing track. https://developer.spotify.com/documentation/web-api/reference/#/operations/seek-to-position-in-currently-playing-track. """
     def __init__(self, position: int, device_id: str) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/seek"
         self.api_params = {
@@ -111,7 +111,7 @@ class SeekToPosition(PutRequest):
 class SetRepeatMode(PutRequest):
     """ Set the repeat mode for the user's playback. Options are repeat-track, repeat-context, and off. https://developer.spotify.com/documentation/web-api/reference/#/operations/set-repeat-mode-on-users-playback. """
     def __init__(self, state: str, device_id: str) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/repeat"
         self.api_params = {
@@ -123,7 +123,7 @@ class SetRepeatMode(PutRequest):
 class SetPlaybackVolume(PutRequest):
     """ Set the volume for the user's current playback device. https://developer.spotify.com/documentation/web-api/reference/#/operations/set-volume-for-users-playback. """
     def __init__(self, volume: int, device_id: str) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/volume"
         self.api_params = {
@@ -135,7 +135,7 @@ class SetPlaybackVolume(PutRequest):
 class TogglePlaybackShuffle(PutRequest):
     """ Toggle shuffle on or off for user's playback. https://developer.spotify.com/documentation/web-api/reference/#/operations/toggle-shuffle-for-users-playback.  """
     def __init__(self, state: bool, device_id: str) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/shuffle"
         self.api_params = {
@@ -147,7 +147,7 @@ class TogglePlaybackShuffle(PutRequest):
 class GetRecentlyPlayedTracks(GetRequest):
     """ Get tracks from the current user's recently played tracks. NOTE: Currently doesn't support podcast episodes. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-recently-played. """
     def __init__(self, after: int, limit: int = MAX_PLAYER_ITEMS_COUNT) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/recently-played"
         self.api_params = {
@@ -165,7 +165,7 @@ class GetRecentlyPlayedTracks(GetRequest):
 class GetCurrentUsersQueue(GetRequest):
     """ Get the list of objects that make up the user's queue. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-queue. """
     def __init__(self) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/queue"
         self.api_params = {}
@@ -180,7 +180,7 @@ class GetCurrentUsersQueue(GetRequest):
 class AddItemToPlaybackQueue(PostRequest):
     """ Add an item to the end of the user's current playback queue. https://developer.spotify.com/documentation/web-api/reference/#/operations/add-to-queue. """
     def __init__(self, item_uri: str, device_id: str) -> None:
-        super.__init__()
+        super().__init__()
 
         self.api_url = f"{BASE_URL}/me/player/queue"
         self.api_params = {
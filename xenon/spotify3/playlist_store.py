@@ -0,0 +1,165 @@
+# Import internal modules
+from xenon.databases import db, PlaylistSnapshots, PlaylistItems
+from xenon.exceptions import RequestError
+from xenon.persistent_cache import _pack_markets, _unpack_markets
+from xenon.spotify3.context import current_context
+from xenon.spotify3.helpers import resolve_market
+from xenon.spotify3.models import Playlist
+from xenon.spotify3.pagination import fetch_all_items
+from xenon.spotify3.playlists import GetPlaylist, GetPlaylistItems
+
+# Import external modules
+from flask import Flask
+import json
+import time
+
+""" Keeps the items of playlists together with the `snapshot_id` they were fetched at. Spotify changes the `snapshot_id` of a playlist on every edit, so a refresh first fetches only the header of
+the playlist & pages through the items again only when the snapshot differs from the stored one. For a large playlist which has not changed a refresh is one small request.
+
+---
+``` python
+store = get_playlist_store()
+with spotify_context(user_id=str(current_user.id), market=current_user.spotify_country_code):
+    items = store.items(playlist_id)               # checks the snapshot, downloads the items only if it changed
+    items = store.items(playlist_id, max_age=60)   # no request at all if the snapshot was checked in the last minute
+
+```
+
+Playlists are stored for the user of the current `spotify_context()`, so a private or collaborative playlist is only served to users who could fetch it themselves.
+
+The header is fetched before the items, so if the playlist is edited while its items are being paged the stored snapshot is the older one & the next refresh downloads the items again.
+"""
+
+# The fields of the header which are fetched to check the snapshot. The items are left out, so the request stays small however long the playlist is.
+HEADER_FIELDS = 'collaborative,description,external_urls,followers,href,id,images,name,owner,public,snapshot_id,type,uri,tracks(href,total)'
+
+def _market_key(market: str | None) -> str:
+    """ Returns the market a playlist is stored under. Playlists fetched without a market are stored under `''`. """
+    return resolve_market(market) or ''
+
+class PlaylistStore():
+    """ Keeps playlists in the `PlaylistSnapshots` & `PlaylistItems` tables of the `library` bind. Requests are sent for, & playlists are stored & read as, the user of the current
+    `spotify_context()`. Every method opens its own app context so the store can be used from worker threads & outside of a flask request. """
+
+    def __init__(self, app: Flask) -> None:
+        self.app: Flask = app
+
+    def _fetch_header(self, playlist_id: str, market: str | None) -> dict:
+        request = GetPlaylist(playlist_id, market).select(HEADER_FIELDS)
+        request.create_request()
+        if request.code != 200:
+            raise RequestError(request)
+        return request.get_data().get_data()
+
+    def refresh(self, playlist_id: str, market: str = None, force: bool = False) -> bool:
+        """ Checks the snapshot of a playlist & downloads its items if it changed (or if `force` is `True`). Returns `True` if the items were downloaded. Raises `RequestError()` if a request
+        fails, in which case the stored copy is left as it was. """
+        user_id = current_context().user_id
+        key = _market_key(market)
+        header = self._fetch_header(playlist_id, market)
+        now = time.time()
+
+        with self.app.app_context():
+            stored = db.session.get(PlaylistSnapshots, (user_id, playlist_id, key))
+            if stored is not None and stored.snapshot_id == header['snapshot_id'] and not force:
+                stored.header = self.encode(header)
+                stored.checked_at = now
+                db.session.commit()
+                return False
+
+        items = fetch_all_items(GetPlaylistItems, playlist_id, market=market)
+        self._store(user_id, playlist_id, key, header, items, now)
+        return True
+
+    def _store(self, user_id: str, playlist_id: str, key: str, header: dict, items: list, now: float) -> None:
+        """ Replaces the stored items & header of a playlist. """
+        with self.app.app_context():
+            PlaylistItems.query.filter_by(user_id=user_id, playlist_id=playlist_id, market=key).delete()
+            db.session.add_all([
+                PlaylistItems(user_id=user_id, playlist_id=playlist_id, market=key, position=position, item_id=(item.get('track') or {}).get('id'), added_at=item.get('added_at'), data=self.encode(item))
+                for position, item in enumerate(items)
+            ])
+            db.session.merge(PlaylistSnapshots(
+                user_id=user_id,
+                playlist_id=playlist_id,
+                market=key,
+                snapshot_id=header['snapshot_id'],
+                header=self.encode(header),
+                total=len(items),
+                checked_at=now,
+                fetched_at=now
+            ))
+            db.session.commit()
+
+    def _ensure(self, playlist_id: str, market: str | None, max_age: float) -> None:
+        """ Refreshes the playlist unless its snapshot was checked less than `max_age` seconds ago. """
+        if max_age > 0:
+            with self.app.app_context():
+                stored = db.session.get(PlaylistSnapshots, (current_context().user_id, playlist_id, _market_key(market)))
+                if stored is not None and time.time() - stored.checked_at < max_age:
+                    return
+        self.refresh(playlist_id, market)
+
+    def playlist(self, playlist_id: str, market: str = None, max_age: float = 0.0) -> Playlist:
+        """ Returns the header of a playlist as a `Playlist()`, without its items. See `items()` for `max_age`. """
+        self._ensure(playlist_id, market, max_age)
+        with self.app.app_context():
+            stored = db.session.get(PlaylistSnapshots, (current_context().user_id, playlist_id, _market_key(market)))
+            return Playlist(self.decode(stored.header))
+
+    def items(self, playlist_id: str, market: str = None, limit: int = None, offset: int = 0, max_age: float = 0.0) -> list:
+        """ Returns the items of a playlist in order, in the shape of the items of `GetPlaylistItems()`. The snapshot is checked first unless it was checked less than `max_age` seconds ago. """
+        self._ensure(playlist_id, market, max_age)
+        with self.app.app_context():
+            query = db.session.query(PlaylistItems.data).filter_by(user_id=current_context().user_id, playlist_id=playlist_id, market=_market_key(market)).order_by(PlaylistItems.position).offset(offset)
+            if limit is not None:
+                query = query.limit(limit)
+            return [self.decode(data) for data, in query.all()]
+
+    def snapshot_id(self, playlist_id: str, market: str = None) -> str | None:
+        """ Returns the snapshot the stored items belong to, or `None` if the playlist is not stored for the current user. No request is sent. """
+        with self.app.app_context():
+            stored = db.session.get(PlaylistSnapshots, (current_context().user_id, playlist_id, _market_key(market)))
+            return stored.snapshot_id if stored is not None else None
+
+    def forget(self, playlist_id: str) -> None:
+        """ Removes a playlist of the current user from the store, in every market. """
+        user_id = current_context().user_id
+        with self.app.app_context():
+            PlaylistItems.query.filter_by(user_id=user_id, playlist_id=playlist_id).delete()
+            PlaylistSnapshots.query.filter_by(user_id=user_id, playlist_id=playlist_id).delete()
+            db.session.commit()
+
+    def encode(self, data: dict) -> bytes:
+        """ Converts an item or header into the bytes which are stored, with the `available_markets` of its track packed as in `xenon.persistent_cache`. """
+        if isinstance(data.get('track'), dict):
+            data = {**data, 'track': _pack_markets(data['track'])}
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, data: bytes) -> dict:
+        data = json.loads(data)
+        if isinstance(data.get('track'), dict):
+            _unpack_markets(data['track'])
+        return data
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+_playlist_store: PlaylistStore = None
+
+def get_playlist_store() -> PlaylistStore | None:
+    """ Returns the store set up by `configure_playlist_store()`, or `None` if it has not been set up. """
+    return _playlist_store
+
+def configure_playlist_store(app: Flask) -> PlaylistStore:
+    """ Creates the tables of the `library` bind & sets up the playlist store. """
+    global _playlist_store
+
+    with app.app_context():
+        db.create_all(bind_key='library')
+
+    _playlist_store = PlaylistStore(app)
+    return _playlist_store
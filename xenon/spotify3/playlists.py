@@ -1,17 +1,19 @@
 
 # Import internal modules
 from xenon.models import GetRequest, PutRequest, PostRequest, DeleteRequest
-from xenon.spotify3.helpers import _headers, BASE_URL, MAX_PLAYLIST_ITEMS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, current_users_market
+from xenon.spotify3.helpers import _headers, BASE_URL, MAX_PLAYLIST_ITEMS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, resolve_market
 from xenon.spotify3.models import FollowingRequest, Playlist
 
 class GetPlaylist(GetRequest):
     """ Get a playlist owned by a Spotify user. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-playlist. """
-    def __init__(self, playlist_id: str, market: str = current_users_market()) -> None:
+    projection_param = 'fields'
+
+    def __init__(self, playlist_id: str, market: str = None) -> None:
         super().__init__()
 
         self.api_url = f"{BASE_URL}/playlists/{playlist_id}"
         self.api_params = {
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -41,7 +43,9 @@ class ChangePlaylistDetails(PutRequest):
 
 class GetPlaylistItems(GetRequest):
     """ Get full details of the items of a playlist owned by a Spotify user. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-playlists-tracks. """
-    def __init__(self, playlist_id: str, limit: int = MAX_PLAYLIST_ITEMS_COUNT, offset: int = 0, market: str = current_users_market()) -> None:
+    projection_param = 'fields'
+
+    def __init__(self, playlist_id: str, limit: int = MAX_PLAYLIST_ITEMS_COUNT, offset: int = 0, market: str = None) -> None:
         super().__init__()
 
         if limit > MAX_PLAYLIST_ITEMS_COUNT:
@@ -53,7 +57,7 @@ class GetPlaylistItems(GetRequest):
         self.api_params = {
             'limit': limit,
             'offset': offset,
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -198,12 +202,12 @@ class GetFeaturedPlaylists(GetRequest):
 
 class GetCategoryPlaylists(GetRequest):
     """ Get a list of Spotify playlists tagged with a particular category. """
-    def __init__(self, category_id: str, market: str = current_users_market(), limit: int = MAX_PLAYLIST_ITEMS_COUNT, offset: int = 0) -> None:
+    def __init__(self, category_id: str, market: str = None, limit: int = MAX_PLAYLIST_ITEMS_COUNT, offset: int = 0) -> None:
         super().__init__()
 
         self.api_url = f"{BASE_URL}/browse/categories/{category_id}/playlists"
         self.api_params = {
-            'country': market,
+            'country': resolve_market(market),
             'limit': limit,
             'offset': offset
         }
@@ -1,14 +1,14 @@
 
 # Import internal modules
 from xenon.models import GetRequest
-from xenon.spotify3.helpers import _headers, BASE_URL, MAX_PLAYLIST_ITEMS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, current_users_market
+from xenon.spotify3.helpers import _headers, BASE_URL, MAX_PLAYLIST_ITEMS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, resolve_market
 from xenon.spotify3.models import SearchResults
 
 class SearchForItem(GetRequest):
     """ Get Spotify catalog information about albums, artists, playlists, tracks, shows, episodes or audiobooks that match a keyword string.
     
     NOTE: Audiobooks are only available for the US, UK, Ireland, New Zealand and Australia markets. """
-    def __init__(self, search_query: str, filters: list = ['album', 'artist', 'playlist', 'track', 'show', 'episode', 'audiobook'], limit: int = MAX_PLAYLIST_ITEMS_COUNT, offset: int = 0, market: str = current_users_market()) -> None:
+    def __init__(self, search_query: str, filters: list = ['album', 'artist', 'playlist', 'track', 'show', 'episode', 'audiobook'], limit: int = MAX_PLAYLIST_ITEMS_COUNT, offset: int = 0, market: str = None) -> None:
         super().__init__()
 
         if limit > MAX_PLAYLIST_ITEMS_COUNT:
@@ -22,7 +22,7 @@ class SearchForItem(GetRequest):
             'type': config_list_to_comma_str(filters),
             'limit': limit,
             'offset': offset,
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
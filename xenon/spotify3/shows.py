@@ -1,7 +1,7 @@
 
 # Import internal modules
 from xenon.models import GetRequest, PutRequest, DeleteRequest
-from xenon.spotify3.helpers import _headers, BASE_URL, MAX_SHOW_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, current_users_market
+from xenon.spotify3.helpers import _headers, BASE_URL, MAX_SHOW_IDS_COUNT, MIN_IDS_COUNT, config_list_to_comma_str, resolve_market
 from xenon.spotify3.models import FollowingRequest, Show
 
 class GetShows(GetRequest):
@@ -33,7 +33,7 @@ class GetShows(GetRequest):
 
 class GetShowEpisodes(GetRequest):
     """ Get Spotify catalog information about an show's episodes. Optional parameters can be used to limit the number of episodes returned. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-a-shows-episodes. """
-    def __init__(self, show_id: str, market: str = current_users_market(), limit: int = MAX_SHOW_IDS_COUNT, offset: int = 0) -> None:
+    def __init__(self, show_id: str, market: str = None, limit: int = MAX_SHOW_IDS_COUNT, offset: int = 0) -> None:
         super().__init__()
 
         if limit > MAX_SHOW_IDS_COUNT:
@@ -43,7 +43,7 @@ class GetShowEpisodes(GetRequest):
 
         self.api_url = f"{BASE_URL}/shows/{show_id}/episodes"
         self.api_params = {
-            'market': market,
+            'market': resolve_market(market),
             'limit': limit,
             'offset': offset
         }
@@ -96,7 +96,7 @@ class SaveShowsForCurrentUser(PutRequest):
 
 class RemoveCurrentUsersSavedShows(DeleteRequest):
     """ Delete one or more shows from current Spotify user's library. https://developer.spotify.com/documentation/web-api/reference/#/operations/remove-shows-user. """
-    def __init__(self, show_ids: list, market: str = current_users_market()) -> None:
+    def __init__(self, show_ids: list, market: str = None) -> None:
         super().__init__()
 
         if len(show_ids) > MAX_SHOW_IDS_COUNT:
@@ -107,7 +107,7 @@ class RemoveCurrentUsersSavedShows(DeleteRequest):
         self.api_url = f"{BASE_URL}/me/shows"
         self.api_params = {
             'ids': config_list_to_comma_str(show_ids),
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
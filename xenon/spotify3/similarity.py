@@ -0,0 +1,225 @@
+# Import internal modules
+from xenon.exceptions import RequestError
+from xenon.spotify3 import compact
+from xenon.spotify3.bulk import BulkGetTracksAudioFeatures
+from xenon.spotify3.features import AudioFeaturesMatrix
+from xenon.spotify3.helpers import ANY_MARKET
+from xenon.spotify3.pagination import fetch_all_items
+from xenon.spotify3.tracks import GetCurrentUsersSavedTracks
+from xenon.spotify3.users import GetCurrentUsersTopItems
+
+# Import external modules
+import numpy as np
+
+""" Local "tracks like these" recommendations. The audio features of the user's library are indexed in a KD-tree once, after which every query is answered in memory without an api call.
+
+---
+``` python
+index = build_library_index()
+
+for track_id, distance in index.similar(seed_track_ids, limit=20, market='GB', explicit=False):
+    track = index.tracks[track_id]
+
+# Target values instead of seeds, like the `target_*` parameters of `GetRecommendations()`
+index.similar_to_features({'energy': 0.9, 'tempo': 128, 'valence': 0.8})
+```
+"""
+
+# The columns of `AudioFeaturesMatrix()` which describe how a track sounds. `key`, `mode`, `time_signature` & `duration_ms` are left out as they say little about similarity on their own.
+SIMILARITY_COLUMNS = ('acousticness', 'danceability', 'energy', 'instrumentalness', 'liveness', 'loudness', 'speechiness', 'tempo', 'valence')
+
+TIME_RANGES = ('short_term', 'medium_term', 'long_term')
+
+class KDTree():
+    """ A KD-tree over the rows of a `(points, dimensions)` array. The points are split on their widest dimension at the median until each cell holds at most `leaf_size` points; every cell is
+    a contiguous slice of the reordered points with a bounding box. A query ranks every cell by the distance to its box in one vectorised step, then scans cells nearest first until no box can
+    hold a closer point, so a query costs a handful of numpy operations instead of a python step per node. """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 64) -> None:
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        if points.ndim != 2:
+            raise ValueError(f"Parameter 'points' has {points.ndim} dimensions, expected 2.")
+
+        self.leaf_size: int = max(1, leaf_size)
+
+        order = np.arange(len(points))
+        leaves = []
+
+        stack = [(0, len(points))] if len(points) else []
+        while stack:
+            start, end = stack.pop()
+            if end - start <= self.leaf_size:
+                leaves.append((start, end))
+                continue
+
+            rows = order[start:end]
+            dimension = np.argmax(np.ptp(points[rows], axis=0))
+            middle = (end - start) // 2
+            order[start:end] = rows[np.argpartition(points[rows, dimension], middle)]
+
+            stack.append((start + middle, end))
+            stack.append((start, start + middle))
+
+        self.order: np.ndarray = order
+        self.points: np.ndarray = points[order]
+
+        self._positions: list = [np.arange(start, end) for start, end in leaves]
+        self._lower: np.ndarray = np.array([self.points[start:end].min(axis=0) for start, end in leaves], dtype=np.float32).reshape(len(leaves), points.shape[1])
+        self._upper: np.ndarray = np.array([self.points[start:end].max(axis=0) for start, end in leaves], dtype=np.float32).reshape(len(leaves), points.shape[1])
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def query(self, point: np.ndarray, k: int = 1, mask: np.ndarray = None) -> tuple:
+        """ Returns the rows of the `k` nearest points to `point` & their euclidean distances, nearest first. Only rows where the boolean `mask` is `True` are considered. """
+        point = np.asarray(point, dtype=np.float32)
+        if mask is not None:
+            mask = mask[self.order]
+
+        # Squared distance from the point to the box of every cell
+        gap = np.maximum(self._lower - point, 0) + np.maximum(point - self._upper, 0)
+        box_distances = np.einsum('ij,ij->i', gap, gap)
+
+        best_positions = np.empty(0, dtype=np.intp)
+        best_distances = np.empty(0, dtype=np.float32)
+        worst = np.inf
+
+        # Cells are scanned in batches which double in size, so a query takes a few vectorised steps even when many cells have to be scanned
+        leaves = np.argsort(box_distances, kind='stable')
+        scanned = 0
+        batch_size = 1
+        while scanned < len(leaves) and k >= 1:
+            batch = leaves[scanned:scanned + batch_size]
+            batch = batch[box_distances[batch] < worst]
+            if not len(batch):
+                break
+            scanned += batch_size
+            batch_size *= 2
+
+            positions = np.concatenate([self._positions[leaf] for leaf in batch])
+            if mask is not None:
+                positions = positions[mask[positions]]
+
+            difference = self.points[positions] - point
+            best_positions = np.concatenate((best_positions, positions))
+            best_distances = np.concatenate((best_distances, np.einsum('ij,ij->i', difference, difference)))
+
+            if len(best_distances) > k:
+                kept = np.argpartition(best_distances, k - 1)[:k]
+                best_positions, best_distances = best_positions[kept], best_distances[kept]
+            if len(best_distances) == k:
+                worst = best_distances.max()
+
+        nearest = np.argsort(best_distances, kind='stable')
+        return self.order[best_positions[nearest]], np.sqrt(best_distances[nearest])
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class SimilarityIndex():
+    """
+    Finds the tracks whose audio features are closest to a set of seed tracks. The features are scaled to z-scores so that every column counts equally (`weights` can change that), then indexed in
+    a `KDTree()`. Results can be limited to tracks available in a market & to clean tracks.
+
+    `tracks` are track models (`xenon.spotify3.models`, `compact` or `structs`) which give the explicitness & markets of each track; tracks without models are assumed clean & available everywhere,
+    as are tracks whose models have no `available_markets` (Spotify leaves it out when a request was sent with a market).
+    """
+
+    def __init__(self, features: AudioFeaturesMatrix, tracks: list = (), columns: tuple = SIMILARITY_COLUMNS, weights: dict = None, leaf_size: int = 64) -> None:
+        features = features.select(columns)
+        values = features.values
+
+        self.columns: tuple = tuple(columns)
+        self.track_ids: list = features.track_ids
+        self.index: dict = features.index
+        self.tracks: dict = {}
+
+        self._mean: np.ndarray = np.nanmean(values, axis=0) if len(values) else np.zeros(len(columns), dtype=np.float32)
+        self._scale: np.ndarray = np.nanstd(values, axis=0) if len(values) else np.ones(len(columns), dtype=np.float32)
+        self._scale[self._scale == 0] = 1
+        if weights is not None:
+            self._scale = self._scale / np.array([weights.get(column, 1) for column in columns], dtype=np.float32)
+
+        self._vectors: np.ndarray = np.nan_to_num(self._scale_values(values))
+        self.tree: KDTree = KDTree(self._vectors, leaf_size)
+
+        self._explicit: np.ndarray = np.zeros(len(self.track_ids), dtype=bool)
+        self._markets: list = [None] * len(self.track_ids)
+        self._market_masks: dict = {}
+        for track in tracks:
+            position = self.index.get(track.track_id)
+            if position is None:
+                continue
+            self.tracks[track.track_id] = track
+            self._explicit[position] = bool(track.is_explicit)
+            self._markets[position] = track.markets or None
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    def _scale_values(self, values: np.ndarray) -> np.ndarray:
+        return ((values - self._mean) / self._scale).astype(np.float32)
+
+    def _market_mask(self, market: str) -> np.ndarray:
+        """ Returns which tracks are available in `market`. Cached per market. """
+        market = market.upper()
+        if market not in self._market_masks:
+            self._market_masks[market] = np.fromiter((markets is None or market in markets for markets in self._markets), dtype=bool, count=len(self._markets))
+        return self._market_masks[market]
+
+    def _mask(self, market: str | None, explicit: bool, excluded: list) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if market is not None:
+            mask &= self._market_mask(market)
+        if not explicit:
+            mask &= ~self._explicit
+        mask[excluded] = False
+        return mask
+
+    def _query(self, vector: np.ndarray, limit: int, market: str | None, explicit: bool, excluded: list) -> list:
+        rows, distances = self.tree.query(vector, limit, self._mask(market, explicit, excluded))
+        return [(self.track_ids[row], float(distance)) for row, distance in zip(rows, distances)]
+
+    def similar(self, seed_track_ids: list, limit: int = 20, market: str = None, explicit: bool = True) -> list:
+        """ Returns up to `limit` `(track_id, distance)` pairs for the tracks closest to the average of the seed tracks, nearest first. The seeds themselves are never returned. Seeds which
+        are not in the index are ignored. """
+        seeds = [self.index[track_id] for track_id in seed_track_ids if track_id in self.index]
+        if not seeds:
+            raise ValueError(f"Parameter 'seed_track_ids' returned no tracks which are in the index.")
+
+        return self._query(self._vectors[seeds].mean(axis=0), limit, market, explicit, seeds)
+
+    def similar_to_features(self, features: dict, limit: int = 20, market: str = None, explicit: bool = True) -> list:
+        """ Returns up to `limit` `(track_id, distance)` pairs for the tracks closest to target feature values, e.g. `{'energy': 0.9, 'tempo': 128}`. Columns which are not given are matched
+        to the average of the library. """
+        for column in features:
+            if column not in self.columns:
+                raise ValueError(f"Parameter 'features' returned '{column}', which is not one of {self.columns}.")
+
+        values = np.array([features.get(column, np.nan) for column in self.columns], dtype=np.float32)
+        return self._query(np.nan_to_num(self._scale_values(values)), limit, market, explicit, [])
+
+def build_library_index(time_ranges: tuple = TIME_RANGES, **kwargs) -> SimilarityIndex:
+    """ Builds a `SimilarityIndex()` of the current user's saved tracks & top tracks over `time_ranges`. Tracks are fetched without a market so their `available_markets` are known & any market
+    can be filtered on later. `kwargs` are passed to `SimilarityIndex()`. Raises `RequestError()` if a request fails. """
+
+    tracks = {}
+    for item in fetch_all_items(GetCurrentUsersSavedTracks, market=ANY_MARKET):
+        tracks[item['track']['id']] = item['track']
+    for time_range in time_ranges:
+        for track in fetch_all_items(GetCurrentUsersTopItems, type_='tracks', time_range=time_range):
+            tracks.setdefault(track['id'], track)
+
+    tracks = [compact.Track(track) for track_id, track in tracks.items() if track_id is not None]
+    if not tracks:
+        return SimilarityIndex(AudioFeaturesMatrix.from_features([]), **kwargs)
+
+    ngr = BulkGetTracksAudioFeatures([track.track_id for track in tracks], compact=True)
+    ngr.create_request()
+    if ngr.code != 200:
+        raise RequestError(ngr)
+
+    return SimilarityIndex(ngr.matrix(), tracks, **kwargs)
@@ -0,0 +1,389 @@
+# Import internal modules
+from xenon.spotify3.tracks import GetTracks, GetCurrentUsersSavedTracks
+from xenon.spotify3.albums import GetAlbums, GetAlbumTracks, GetCurrentUsersSavedAlbums, GetNewReleases
+from xenon.spotify3.artists import GetArtists, GetArtistsAlbums, GetArtistsTopTracks, GetArtistsRelatedArtists
+from xenon.spotify3.shows import GetShows, GetShowEpisodes, GetCurrentUsersSavedShows
+from xenon.spotify3.episodes import GetEpisodes, GetCurrentUsersSavedEpisodes
+from xenon.spotify3.audiobooks import GetAudiobooks, GetCurrentUsersSavedAudiobooks
+from xenon.spotify3.playlists import GetPlaylist, GetPlaylistItems, GetCurrentUsersPlaylists, GetUsersPlaylists, GetFeaturedPlaylists, GetCategoryPlaylists
+from xenon.spotify3.player import GetRecentlyPlayedTracks
+from xenon.spotify3.search import SearchForItem
+from xenon.spotify3.users import GetCurrentUsersProfile, GetCurrentUsersFollowedArtists
+from xenon.spotify3.market_set import MarketSet
+
+# Import external modules
+from typing import Generic, TypeVar
+import msgspec
+
+""" Typed versions of the models in `xenon.spotify3.models`, decoded by msgspec straight from the response bytes. No dict tree is built: only the fields declared below are read & unknown
+fields are skipped while parsing. The structs have the same property names as the models they replace, so `page.items`, `track.track_id`, `track.linked_album.name` etc. all still work.
+`available_markets` is kept as a slice of the response bytes until it is read, so the bytes of a response stay in memory for as long as its structs do.
+
+---
+``` python
+ngr = typed(GetPlaylistItems(playlist_id))
+ngr.create_request()
+
+for item in ngr.get_data().items:
+    item.track.name
+
+# Request classes can also be wrapped, e.g. for the pagination helpers
+for item in iterate_items(typed(GetPlaylistItems), playlist_id):
+    ...
+```
+"""
+
+T = TypeVar('T')
+
+class _Struct(msgspec.Struct, kw_only=True, gc=False):
+    """ Base of every struct. Every field has a default, as Spotify leaves fields out depending on the endpoint, market & scopes. Decoded payloads never contain reference cycles so the structs are
+    not tracked by the garbage collector. """
+
+_EMPTY_LIST = msgspec.Raw(b'[]')
+
+@property
+def _available_markets(self) -> list:
+    """ The markets the object is available in: ISO 3166-1 alpha-2 country codes. This list is long & rarely read, so it is kept as raw json & only decoded when it is read. """
+    return msgspec.json.decode(self.raw_available_markets)
+
+@property
+def _markets(self) -> MarketSet:
+    """ `available_markets` as a `MarketSet()`. """
+    return MarketSet.from_codes(msgspec.json.decode(self.raw_available_markets))
+
+class Image(_Struct):
+    url: str = None
+    height: int | None = None
+    width: int | None = None
+
+class Followers(_Struct):
+    total: int | None = None
+
+class Cursors(_Struct):
+    after: str | None = None
+    before: str | None = None
+
+class Paging(_Struct, Generic[T]):
+    """ Typed version of `FollowingRequest()`. """
+
+    href: str = None
+    items: list[T] = []
+    limit: int = None
+    next: str | None = None
+    previous: str | None = None
+    total: int | None = None
+    cursors: Cursors | None = None
+    raw_offset: int = msgspec.field(name='offset', default=0)
+
+    @property
+    def offset(self) -> int:
+        """ The offset of the next page, the same as `FollowingRequest.offset`. """
+        return self.raw_offset + self.limit
+
+    @property
+    def after(self) -> str | None:
+        """ The cursor to use as key to find the next page of items. """
+        return None if self.cursors is None else self.cursors.after
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class User(_Struct):
+    display_name: str | None = None
+    external_urls: dict[str, str] = {}
+    followers: Followers | None = None
+    href: str = None
+    user_id: str = msgspec.field(name='id', default=None)
+    images: list[Image] = []
+    type_: str = msgspec.field(name='type', default=None)
+    uri: str = None
+
+    @property
+    def total_followers(self) -> int | None:
+        return None if self.followers is None else self.followers.total
+
+class SimplifiedArtist(_Struct):
+    external_urls: dict[str, str] = {}
+    href: str = None
+    artist_id: str = msgspec.field(name='id', default=None)
+    name: str = None
+    type_: str = msgspec.field(name='type', default=None)
+    uri: str = None
+
+class Artist(SimplifiedArtist):
+    genres: list[str] = []
+    images: list[Image] = []
+    popularity: int = None
+    raw_followers: Followers | None = msgspec.field(name='followers', default=None)
+
+    @property
+    def followers(self) -> int | None:
+        return None if self.raw_followers is None else self.raw_followers.total
+
+class Album(_Struct):
+    type_: str = msgspec.field(name='album_type', default=None)
+    total_tracks: int = None
+    raw_available_markets: msgspec.Raw = msgspec.field(name='available_markets', default=_EMPTY_LIST)
+    available_markets = _available_markets
+    markets = _markets
+    external_urls: dict[str, str] = {}
+    href: str = None
+    album_id: str = msgspec.field(name='id', default=None)
+    images: list[Image] = []
+    name: str = None
+    release_date: str = None
+    release_date_precision: str = None
+    restrictions: dict | None = None
+    uri: str = None
+    artists: list[SimplifiedArtist] = []
+    tracks_metadata: 'Paging[Track] | None' = msgspec.field(name='tracks', default=None)
+
+class Track(_Struct, tag_field='type', tag='track'):
+    linked_album: Album | None = msgspec.field(name='album', default=None)
+    artists: list[SimplifiedArtist] = []
+    raw_available_markets: msgspec.Raw = msgspec.field(name='available_markets', default=_EMPTY_LIST)
+    available_markets = _available_markets
+    markets = _markets
+    disc_number: int = None
+    duration: int = msgspec.field(name='duration_ms', default=None)
+    is_explicit: bool = msgspec.field(name='explicit', default=None)
+    external_ids: dict[str, str] = {}
+    external_urls: dict[str, str] = {}
+    href: str | None = None
+    track_id: str | None = msgspec.field(name='id', default=None)
+    is_playable: bool | None = None
+    restrictions: dict | None = None
+    name: str = None
+    popularity: int = None
+    preview_url: str | None = None
+    track_number: int = None
+    uri: str = None
+    is_local: bool = False
+
+    @property
+    def type_(self) -> str:
+        return 'track'
+
+class Show(_Struct):
+    raw_available_markets: msgspec.Raw = msgspec.field(name='available_markets', default=_EMPTY_LIST)
+    available_markets = _available_markets
+    markets = _markets
+    copyrights: list[dict] = []
+    description: str = None
+    html_description: str = None
+    is_explicit: bool = msgspec.field(name='explicit', default=None)
+    external_urls: dict[str, str] = {}
+    href: str = None
+    show_id: str = msgspec.field(name='id', default=None)
+    images: list[Image] = []
+    is_externally_hosted: bool | None = None
+    languages: list[str] = []
+    media_type: str = None
+    name: str = None
+    publisher: str = None
+    type_: str = msgspec.field(name='type', default=None)
+    uri: str = None
+    episodes: 'Paging[Episode] | None' = None
+
+class Episode(_Struct, tag_field='type', tag='episode'):
+    audio_preview_url: str | None = None
+    description: str = None
+    html_description: str = None
+    duration_ms: int = None
+    is_explicit: bool = msgspec.field(name='explicit', default=None)
+    external_urls: dict[str, str] = {}
+    href: str = None
+    episode_id: str = msgspec.field(name='id', default=None)
+    images: list[Image] = []
+    is_externally_hosted: bool | None = None
+    is_playable: bool | None = None
+    languages: list[str] = []
+    name: str = None
+    release_date: str = None
+    release_date_precision: str = None
+    resume_point: dict | None = None
+    uri: str = None
+    linked_show: Show | None = msgspec.field(name='show', default=None)
+
+    @property
+    def type_(self) -> str:
+        return 'episode'
+
+class Audiobook(_Struct):
+    authors: list[dict] = []
+    raw_available_markets: msgspec.Raw = msgspec.field(name='available_markets', default=_EMPTY_LIST)
+    available_markets = _available_markets
+    markets = _markets
+    copyrights: list[dict] = []
+    description: str = None
+    html_description: str = None
+    is_explicit: bool = msgspec.field(name='explicit', default=None)
+    external_urls: dict[str, str] = {}
+    href: str = None
+    audiobook_id: str = msgspec.field(name='id', default=None)
+    images: list[Image] = []
+    languages: list[str] = []
+    media_type: str = None
+    name: str = None
+    narrators: list[dict] = []
+    publisher: str = None
+    type: str = None
+    uri: str = None
+    total_chapters: int | None = None
+
+class PlaylistTrack(_Struct):
+    added_at: str | None = None
+    added_by: User | None = None
+    is_local: bool = False
+    track: Track | Episode | None = None
+
+class Playlist(_Struct):
+    is_collaborative: bool = msgspec.field(name='collaborative', default=None)
+    description: str | None = None
+    external_urls: dict[str, str] = {}
+    followers: Followers | None = None
+    href: str = None
+    playlist_id: str = msgspec.field(name='id', default=None)
+    images: list[Image] | None = []
+    name: str = None
+    owner: User | None = None
+    is_public: bool | None = msgspec.field(name='public', default=None)
+    snapshot_id: str = None
+    tracks: Paging[PlaylistTrack] | None = None
+    type_: str = msgspec.field(name='type', default=None)
+    uri: str = None
+
+    @property
+    def total_followers(self) -> int | None:
+        return None if self.followers is None else self.followers.total
+
+class SavedTrack(_Struct):
+    added_at: str = None
+    track: Track = None
+
+class SavedAlbum(_Struct):
+    added_at: str = None
+    album: Album = None
+
+class SavedShow(_Struct):
+    added_at: str = None
+    show: Show = None
+
+class SavedEpisode(_Struct):
+    added_at: str = None
+    episode: Episode = None
+
+class PlayHistory(_Struct):
+    played_at: str = None
+    context: dict | None = None
+    track: Track = None
+
+class SearchResults(_Struct):
+    tracks: Paging[Track] | None = None
+    artists: Paging[Artist] | None = None
+    albums: Paging[Album] | None = None
+    playlists: Paging[Playlist | None] | None = None
+    shows: Paging[Show | None] | None = None
+    episodes: Paging[Episode | None] | None = None
+    audiobooks: Paging[Audiobook | None] | None = None
+
+class _Several(_Struct):
+    """ Responses of the endpoints which return a list of objects, e.g. `{"tracks": [...]}`. """
+    tracks: list[Track | None] = []
+    albums: list[Album | None] = []
+    artists: list[Artist | None] = []
+    shows: list[Show | None] = []
+    episodes: list[Episode | None] = []
+    audiobooks: list[Audiobook | None] = []
+
+class _Albums(_Struct):
+    albums: Paging[Album] = None
+
+class _Artists(_Struct):
+    artists: Paging[Artist] = None
+
+class _Playlists(_Struct):
+    playlists: Paging[Playlist | None] = None
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+# Request class: (struct the response is decoded into, attribute of the struct which is returned or `None` for the struct itself)
+TYPED_RESPONSES = {
+    GetTracks: (_Several, 'tracks'),
+    GetCurrentUsersSavedTracks: (Paging[SavedTrack], None),
+    GetAlbums: (_Several, 'albums'),
+    GetAlbumTracks: (Paging[Track], None),
+    GetCurrentUsersSavedAlbums: (Paging[SavedAlbum], None),
+    GetNewReleases: (_Albums, 'albums'),
+    GetArtists: (_Several, 'artists'),
+    GetArtistsAlbums: (Paging[Album], None),
+    GetArtistsTopTracks: (_Several, 'tracks'),
+    GetArtistsRelatedArtists: (_Several, 'artists'),
+    GetShows: (_Several, 'shows'),
+    GetShowEpisodes: (Paging[Episode], None),
+    GetCurrentUsersSavedShows: (Paging[SavedShow], None),
+    GetEpisodes: (_Several, 'episodes'),
+    GetCurrentUsersSavedEpisodes: (Paging[SavedEpisode], None),
+    GetAudiobooks: (_Several, 'audiobooks'),
+    GetCurrentUsersSavedAudiobooks: (Paging[Audiobook], None),
+    GetPlaylist: (Playlist, None),
+    GetPlaylistItems: (Paging[PlaylistTrack], None),
+    GetCurrentUsersPlaylists: (Paging[Playlist], None),
+    GetUsersPlaylists: (Paging[Playlist], None),
+    GetFeaturedPlaylists: (_Playlists, 'playlists'),
+    GetCategoryPlaylists: (_Playlists, 'playlists'),
+    GetRecentlyPlayedTracks: (Paging[PlayHistory], None),
+    SearchForItem: (SearchResults, None),
+    GetCurrentUsersProfile: (User, None),
+    GetCurrentUsersFollowedArtists: (_Artists, 'artists')
+}
+
+class TypedDecoder():
+    """ Decodes response bytes into `struct` & returns its `attribute` (or the struct itself if `attribute` is `None`). Set as `GetRequest.decoder` by `typed()`. """
+
+    def __init__(self, struct: type, attribute: str | None = None) -> None:
+        self.struct: type = struct
+        self.attribute: str | None = attribute
+
+        self._decoder = msgspec.json.Decoder(struct)
+
+    def decode(self, content: bytes) -> any:
+        data = self._decoder.decode(content)
+        if self.attribute is None:
+            return data
+        return getattr(data, self.attribute)
+
+_decoders: dict = {}
+
+def decoder_for(request_class: type) -> TypedDecoder:
+    """ Returns the (shared) decoder of `request_class`. Raises `ValueError` if the endpoint has no typed response. """
+    for cls in request_class.__mro__:
+        if cls in TYPED_RESPONSES:
+            if cls not in _decoders:
+                _decoders[cls] = TypedDecoder(*TYPED_RESPONSES[cls])
+            return _decoders[cls]
+    raise ValueError(f"Request class '{request_class.__name__}' does not have a typed response.")
+
+def typed(request: object) -> object:
+    """ Makes a request decode its response into structs. Given a request, its decoder is set & the request is returned. Given a request class, returns a callable which creates typed requests of
+    that class, so it can be passed anywhere a request class is expected. """
+    if isinstance(request, type):
+        decoder = decoder_for(request)
+
+        def _create(*args, **kwargs) -> object:
+            new_request = request(*args, **kwargs)
+            new_request.decoder = decoder
+            return new_request
+
+        _create.__name__ = request.__name__
+        return _create
+
+    request.decoder = decoder_for(type(request))
+    return request
@@ -1,12 +1,12 @@
 
 # Import internal modules
 from xenon.models import GetRequest, PutRequest, DeleteRequest
-from xenon.spotify3.helpers import _headers, BASE_URL, MAX_TRACK_IDS_COUNT, MIN_IDS_COUNT, MAX_SEED_COUNT, config_list_to_comma_str, current_users_market
+from xenon.spotify3.helpers import _headers, BASE_URL, MAX_TRACK_IDS_COUNT, MIN_IDS_COUNT, MAX_SEED_COUNT, MAX_RECOMMENDATIONS_COUNT, RECOMMENDATION_ATTRIBUTES, config_list_to_comma_str, resolve_market
 from xenon.spotify3.models import FollowingRequest, Track, AudioFeatures
 
 class GetTracks(GetRequest):
     """ Get Spotify catalog information for multiple tracks based on their Spotify IDs. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-several-tracks. """
-    def __init__(self, track_ids: list, market: str = current_users_market()) -> None:
+    def __init__(self, track_ids: list, market: str = None) -> None:
         super().__init__()
 
         if len(track_ids) > MAX_TRACK_IDS_COUNT:
@@ -17,7 +17,7 @@ class GetTracks(GetRequest):
         self.api_url = f"{BASE_URL}/tracks"
         self.api_params = {
             'ids': config_list_to_comma_str(track_ids),
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -33,7 +33,7 @@ class GetTracks(GetRequest):
 
 class GetCurrentUsersSavedTracks(GetRequest):
     """ Get a list of the songs saved in the current Spotify user's 'Your Music' library. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-users-saved-tracks. """
-    def __init__(self, limit: int = MAX_TRACK_IDS_COUNT, offset: int = 0, market: str = current_users_market()) -> None:
+    def __init__(self, limit: int = MAX_TRACK_IDS_COUNT, offset: int = 0, market: str = None) -> None:
         super().__init__()
 
         if limit > MAX_TRACK_IDS_COUNT:
@@ -45,7 +45,7 @@ class GetCurrentUsersSavedTracks(GetRequest):
         self.api_params = {
             'limit': limit,
             'offset': offset,
-            'market': market
+            'market': resolve_market(market)
         }
         self.api_headers = _headers()
 
@@ -119,46 +119,66 @@ class GetTracksAudioFeatures(GetRequest):
         }
         self.api_headers = _headers()
 
+        self.cdq = True
+
     def _config_data(self) -> None:
         """ Configures the data ready to returned to be the caller. """
-        self._data = AudioFeatures(self.get_data())
+        features_list = []
+        for features in self.get_data()['audio_features']:
+            features_list.append(None if features is None else AudioFeatures(features))
+
+        self._data = features_list
 
 class GetRecommendations(GetRequest):
     """ Recommendations are generated based on the available information for a given seed entity and matched against similar artists and tracks. If there is sufficient information about the provided seeds, a list of tracks will be returned together with pool size details. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-recommendations.
 
-    For artists and tracks that are very new or obscure there might not be enough data to generate a list of tracks. 
-    
-    TODO: Review this whole function - more specifically how the api works. As of now it only takes in required parameters, however there are many more to include.
+    For artists and tracks that are very new or obscure there might not be enough data to generate a list of tracks. To find tracks like ones in the user's library without an api call, see
+    `xenon.spotify3.similarity`.
+
+    The results can be tuned with `min_*`, `max_*` & `target_*` keyword arguments for any attribute in `RECOMMENDATION_ATTRIBUTES` (e.g. `min_energy=0.6, target_tempo=120`).
     """
-    def __init__(self, seed_artists: list = None, seed_genres: list = None, seed_tracks: list = None, limit: int = MAX_TRACK_IDS_COUNT, offset: int = 0, market: str = current_users_market()) -> None:
+    def __init__(self, seed_artists: list = None, seed_genres: list = None, seed_tracks: list = None, limit: int = MAX_TRACK_IDS_COUNT, market: str = None, **tunables) -> None:
         super().__init__()
 
-        seed_len = (0 if seed_artists is None else len(seed_artists)) + (0 if seed_genres is None else len(seed_genres)) + (0 if seed_tracks is None else len(seed_tracks))
-        if seed_len > MAX_SEED_COUNT:
-            raise ValueError(f"Up to {MAX_SEED_COUNT} seed values may be provided in any combination of 'seed_artists', 'seed_tracks' and 'seed_genres'. Got {seed_len} seed values!")
+        for name in tunables:
+            prefix, _, attribute = name.partition('_')
+            if prefix not in ('min', 'max', 'target') or attribute not in RECOMMENDATION_ATTRIBUTES:
+                raise ValueError(f"Parameter '{name}' is not a 'min_*', 'max_*' or 'target_*' value of one of {', '.join(RECOMMENDATION_ATTRIBUTES)}.")
 
-        if seed_artists is not None:
-            self.api_params.update({'seed_artists': seed_artists})
-        if seed_genres is not None:
-            self.api_params.update({'seed_artists': seed_genres})
-        if seed_tracks is not None:
-            self.api_params.update({'seed_artists': seed_tracks})
+        seeds = {
+            'seed_artists': seed_artists or [],
+            'seed_genres': seed_genres or [],
+            'seed_tracks': seed_tracks or []
+        }
 
-        if not self.api_params:
+        seed_len = sum(len(seed_values) for seed_values in seeds.values())
+        if seed_len > MAX_SEED_COUNT:
+            raise ValueError(f"Up to {MAX_SEED_COUNT} seed values may be provided in any combination of 'seed_artists', 'seed_tracks' and 'seed_genres'. Got {seed_len} seed values!")
+        if seed_len == 0:
             raise ValueError(f"No seed values were passed. There must be at least 1 seed value to process this request!")
+        if limit > MAX_RECOMMENDATIONS_COUNT:
+            raise ValueError(f"Parameter 'limit' returned more than {MAX_RECOMMENDATIONS_COUNT} values.")
+        if limit < MIN_IDS_COUNT:
+            raise ValueError(f"Parameter 'limit' returned less than {MIN_IDS_COUNT} values.")
 
         self.api_url = f"{BASE_URL}/recommendations"
         self.api_params = {
             'limit': limit,
-            'offset': offset
+            'market': resolve_market(market)
         }
+        for name, seed_values in seeds.items():
+            if seed_values:
+                self.api_params[name] = config_list_to_comma_str(seed_values)
+        self.api_params.update(tunables)
         self.api_headers = _headers()
 
+        self.cdq = True
+
     def _config_data(self) -> None:
         """ Configures the data ready to returned to be the caller. """
 
         tracks_list = []
-        for track in self.get_data()['track']:
+        for track in self.get_data()['tracks']:
             tracks_list.append(Track(track))
 
         self._data = tracks_list
\ No newline at end of file
@@ -26,15 +26,17 @@ class GetCurrentUsersProfile(GetRequest):
 
 class GetCurrentUsersTopItems(GetRequest):
     """ Get the current user's top artists or tracks based on calculated affinity. https://developer.spotify.com/documentation/web-api/reference/#/operations/get-users-top-artists-and-tracks. """
-    def __init__(self, limit: int = MAX_TRACK_IDS_COUNT, offset: int = 0, time_range: str = 'medium_term') -> None:
+    def __init__(self, limit: int = MAX_TRACK_IDS_COUNT, offset: int = 0, time_range: str = 'medium_term', type_: str = 'tracks') -> None:
         super().__init__()
 
+        if type_ not in ('artists', 'tracks'):
+            raise ValueError(f"Parameter 'type_' returned '{type_}', expected 'artists' or 'tracks'.")
         if limit > MAX_TRACK_IDS_COUNT:
             raise ValueError(f"Parameter 'limit' returned more than {MAX_TRACK_IDS_COUNT} values.")
         if limit < MIN_IDS_COUNT:
             raise ValueError(f"Parameter 'limit' returned less than {MIN_IDS_COUNT} values.")
 
-        self.api_url = f"{BASE_URL}/me/top/type"
+        self.api_url = f"{BASE_URL}/me/top/{type_}"
         self.api_params = {
             'limit': limit,
             'offset': offset,
@@ -68,20 +70,21 @@ class GetCurrentUsersFollowedArtists(GetRequest):
     def __init__(self, after: str = None, limit: int = MAX_TRACK_IDS_COUNT) -> None:
         super().__init__()
 
-        if after is not None:
-           self.api_params.values({'after': after}) 
-
         self.api_url = f"{BASE_URL}/me/following"
         self.api_params = {
+            'type': 'artist',
             'limit': limit
         }
         self.api_headers = _headers()
 
+        if after is not None:
+            self.api_params.update({'after': after})
+
         self.cdq = True
 
     def _config_data(self) -> None:
         """ Configures the data ready to returned to be the caller. """
-        self._data = FollowingRequest(self.get_data())
+        self._data = FollowingRequest(self.get_data()['artists'])
 
 class FollowUser(PutRequest):
     """ Add the current user as a follower of one or more Spotify users. https://developer.spotify.com/documentation/web-api/reference/#/operations/follow-artists-users. """
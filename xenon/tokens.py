@@ -0,0 +1,321 @@
+# Import internal modules
+from xenon.exceptions import TokenError
+from xenon.loggers import xenon_requests
+from xenon.transport import get_transport
+
+# Import external modules
+from concurrent.futures import Future
+from urllib.parse import urlencode
+from base64 import b64encode
+import threading
+import tempfile
+import json
+import time
+import os
+
+TOKEN_URL = 'https://accounts.spotify.com/api/token'
+TOKEN_FILE_PATH = 'instance/spt.json'
+
+DEFAULT_USER = 'default'
+
+# Tokens are refreshed this many seconds before they expire. Spotify access tokens last an hour.
+REFRESH_MARGIN = 5 * 60
+
+# How long to wait before trying a failed background refresh again, in seconds
+RETRY_INTERVAL = 30
+
+class Token():
+    """ An OAuth access token, the refresh token which renews it & the wall clock time it expires at. """
+
+    __slots__ = ('access_token', 'refresh_token', 'expires_at')
+
+    def __init__(self, access_token: str, refresh_token: str | None = None, expires_at: float = 0.0) -> None:
+        self.access_token: str = access_token
+        self.refresh_token: str | None = refresh_token
+        self.expires_at: float = expires_at
+
+    @classmethod
+    def from_response(cls, data: dict, previous: 'Token' = None) -> 'Token':
+        """ Creates a token from the json of the token endpoint. Spotify does not always return a new refresh token, in which case the one of `previous` is kept. """
+        refresh_token = data.get('refresh_token') or (previous.refresh_token if previous is not None else None)
+        return cls(data['access_token'], refresh_token, time.time() + data.get('expires_in', 3600))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Token':
+        return cls(data['access_token'], data.get('refresh_token'), data.get('expires_at', 0.0))
+
+    def to_dict(self) -> dict:
+        return {
+            'access_token': self.access_token,
+            'refresh_token': self.refresh_token,
+            'expires_at': self.expires_at
+        }
+
+    @property
+    def expires_in(self) -> float:
+        """ The number of seconds until the token expires. Negative once it has expired. """
+        return self.expires_at - time.time()
+
+    def __repr__(self) -> str:
+        return f"Token(expires_in={self.expires_in:.0f})"
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class TokenManager():
+    """
+    Keeps the Spotify token of each user in memory & refreshes it on a background thread `refresh_margin` seconds before it expires, so a request never has to wait for a refresh. Tokens are
+    persisted to `fp` with an atomic replace, so a crash mid-write never leaves a broken file.
+
+    ---
+    ``` python
+    manager = configure_token_manager(client_id, client_secret)
+    headers = {'Authorization': f"Bearer {manager.access_token(user_id)}"}
+
+    ```
+
+    Concurrent refreshes of one user are merged: the first caller sends the request & every other caller waits for its result. A request only waits on a refresh if its token has already expired,
+    which only happens when the background refresh has been failing (see the `xenon_requests` log).
+    """
+
+    def __init__(self, client_id: str = '', client_secret: str = '', fp: str = TOKEN_FILE_PATH, refresh_margin: float = REFRESH_MARGIN, token_url: str = TOKEN_URL) -> None:
+        self.client_id: str = client_id
+        self.client_secret: str = client_secret
+        self.fp: str = fp
+        self.refresh_margin: float = refresh_margin
+        self.token_url: str = token_url
+
+        self._tokens: dict = {}
+        self._in_flight: dict = {}
+        self._retry_at: dict = {}
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+
+        self._thread: threading.Thread = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+
+    # Storage
+
+    def load(self) -> None:
+        """ Reads the tokens of `self.fp`. A file in the old single user format (`access_token` & `refresh_token` at the top level) is loaded as `DEFAULT_USER`. """
+        try:
+            with open(self.fp, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+
+        if 'access_token' in data:
+            data = {DEFAULT_USER: data}
+
+        with self._lock:
+            self._tokens.update({user: Token.from_dict(token) for user, token in data.items()})
+        self._wake.set()
+
+    def save(self) -> None:
+        """ Writes every token to `self.fp`. The tokens are written to a temporary file in the same directory which then replaces `self.fp`, so readers only ever see a whole file. """
+        with self._lock:
+            data = {user: token.to_dict() for user, token in self._tokens.items()}
+
+        with self._file_lock:
+            directory = os.path.dirname(self.fp) or '.'
+            fd, temp_fp = tempfile.mkstemp(dir=directory, prefix='.spt-', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_fp, self.fp)
+            except Exception:
+                if os.path.exists(temp_fp):
+                    os.remove(temp_fp)
+                raise
+
+    # Tokens
+
+    def get(self, user: str = DEFAULT_USER) -> Token | None:
+        """ Returns the token of `user`, or `None` if there is none. """
+        return self._tokens.get(user)
+
+    def set(self, user: str, token: Token) -> None:
+        """ Stores & persists the token of `user`. """
+        with self._lock:
+            self._tokens[user] = token
+            self._retry_at.pop(user, None)
+
+        self.save()
+        self._wake.set()
+
+    def remove(self, user: str) -> None:
+        """ Forgets the token of `user`. """
+        with self._lock:
+            self._tokens.pop(user, None)
+            self._retry_at.pop(user, None)
+
+        self.save()
+
+    def users(self) -> list:
+        return list(self._tokens)
+
+    def access_token(self, user: str = DEFAULT_USER) -> str:
+        """ Returns the access token of `user`, or an empty string if there is none. An expired token is refreshed before it is returned; a token close to expiring is returned as it is & refreshed
+        in the background. """
+        token = self._tokens.get(user)
+        if token is None:
+            return ''
+
+        expires_in = token.expires_in
+        if expires_in <= 0 and token.refresh_token:
+            return self.refresh(user).access_token
+        if expires_in <= self.refresh_margin and time.time() >= self._retry_at.get(user, 0.0):
+            self.refresh_async(user)
+        return token.access_token
+
+    # Refreshing
+
+    def _begin(self, user: str) -> tuple:
+        """ Returns the future of the refresh of `user` which is in flight & `False`, or a new future & `True` if the caller has to send the refresh itself. """
+        with self._lock:
+            future = self._in_flight.get(user)
+            if future is not None:
+                return future, False
+
+            future = Future()
+            self._in_flight[user] = future
+            return future, True
+
+    def _refresh(self, user: str, future: Future) -> None:
+        """ Sends the refresh of `user` & completes `future` with the new token. """
+        try:
+            token = self._request_token(user, {'grant_type': 'refresh_token', 'refresh_token': self._refresh_token(user)}, self._tokens.get(user))
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(user, None)
+                self._retry_at[user] = time.time() + RETRY_INTERVAL
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._in_flight.pop(user, None)
+        future.set_result(token)
+
+    def _refresh_token(self, user: str) -> str:
+        token = self._tokens.get(user)
+        if token is None or not token.refresh_token:
+            raise TokenError(user, "There is no refresh token.")
+        return token.refresh_token
+
+    def refresh(self, user: str = DEFAULT_USER) -> Token:
+        """ Refreshes the token of `user` & returns the new token. If a refresh of `user` is already in flight its result is returned instead of sending another. Raises `TokenError()` if the
+        refresh fails. """
+        future, is_owner = self._begin(user)
+        if is_owner:
+            self._refresh(user, future)
+        return future.result()
+
+    def refresh_async(self, user: str = DEFAULT_USER) -> Future:
+        """ Refreshes the token of `user` on a new thread unless a refresh is already in flight. Returns the future of the new token. """
+        future, is_owner = self._begin(user)
+        if is_owner:
+            threading.Thread(target=self._refresh, args=(user, future), name=f"xenon-token-refresh-{user}", daemon=True).start()
+        return future
+
+    def exchange_code(self, code: str, redirect_uri: str, user: str = DEFAULT_USER) -> Token:
+        """ Exchanges an authorization code for the first token of `user`. """
+        return self._request_token(user, {'grant_type': 'authorization_code', 'code': code, 'redirect_uri': redirect_uri})
+
+    def _request_token(self, user: str, payload: dict, previous: Token = None) -> Token:
+        """ Sends `payload` to the token endpoint & stores the token it returns. """
+        credentials = b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
+        headers = {
+            'Authorization': f"Basic {credentials}",
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+
+        r = get_transport().request('POST', self.token_url, headers=headers, data=urlencode(payload), endpoint='TokenRefresh')
+        if r.status_code != 200:
+            raise TokenError(user, f"The token endpoint returned status code {r.status_code}.")
+
+        token = Token.from_response(r.json(), previous)
+        self.set(user, token)
+        return token
+
+    # Background refreshing
+
+    def start(self) -> None:
+        """ Starts the background thread which refreshes tokens before they expire. """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='xenon-token-manager', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """ Stops the background thread. """
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _due(self) -> tuple:
+        """ Returns the users whose tokens are due a refresh & the number of seconds until the next token is due. """
+        now = time.time()
+        due = []
+        next_due = 60.0
+        with self._lock:
+            for user, token in self._tokens.items():
+                if not token.refresh_token or user in self._in_flight:
+                    continue
+
+                at = max(token.expires_at - self.refresh_margin, self._retry_at.get(user, 0.0))
+                if at <= now:
+                    due.append(user)
+                else:
+                    next_due = min(next_due, at - now)
+        return due, next_due
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.clear()
+            due, next_due = self._due()
+            for user in due:
+                future, is_owner = self._begin(user)
+                if not is_owner:
+                    continue
+
+                self._refresh(user, future)
+                if future.exception() is not None:
+                    xenon_requests.warning(f"Background refresh of the token of '{user}' failed, retrying in {RETRY_INTERVAL}s: {future.exception()}")
+
+            if not due:
+                self._wake.wait(next_due)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+_token_manager = TokenManager()
+
+def get_token_manager() -> TokenManager:
+    """ Returns the token manager used by the Spotify request classes. """
+    return _token_manager
+
+def configure_token_manager(client_id: str, client_secret: str, fp: str = TOKEN_FILE_PATH, refresh_margin: float = REFRESH_MARGIN, start: bool = True) -> TokenManager:
+    """ Sets the credentials of the default token manager, loads its tokens from `fp` & starts refreshing them in the background. """
+    _token_manager.stop()
+    _token_manager.client_id = client_id
+    _token_manager.client_secret = client_secret
+    _token_manager.fp = fp
+    _token_manager.refresh_margin = refresh_margin
+    _token_manager.load()
+
+    if start:
+        _token_manager.start()
+    return _token_manager
@@ -0,0 +1,405 @@
+# Import internal modules
+from xenon.scheduler import Scheduler
+from xenon.cache import ResponseCache
+from xenon.metrics import Metrics
+
+# Import external modules
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import contextvars
+import requests
+import aiohttp
+import asyncio
+import threading
+import json
+import time
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+class TransportSettings():
+    """ Settings used by `Transport()`. `pool_maxsize` is the number of keep-alive connections held open for each upstream host, `host_limits` can override this for a single host (e.g.
+    `{'api.spotify.com': 20}`). If `pool_block` is `True` a request waits for a free connection instead of opening a throwaway one once the limit is reached. `host_overrides` sends the requests of
+    a host to another base url (e.g. `{'api.spotify.com': 'http://127.0.0.1:5050/spotify'}` for `fake_upstream.py`); rate limits, caching & metrics still use the original url. """
+
+    def __init__(self, pool_maxsize: int = 10, host_limits: dict = None, pool_block: bool = True, connect_timeout: float = 3.05, read_timeout: float = 15.0, max_retries: int = 0,
+                 host_overrides: dict = None) -> None:
+        self.pool_maxsize: int = pool_maxsize
+        self.host_limits: dict = host_limits or {}
+        self.pool_block: bool = pool_block
+        self.connect_timeout: float = connect_timeout
+        self.read_timeout: float = read_timeout
+        self.max_retries: int = max_retries
+        self.host_overrides: dict = host_overrides or {}
+
+    @property
+    def timeout(self) -> tuple:
+        """ Returns the `(connect, read)` timeout tuple passed to `requests`. """
+        return (self.connect_timeout, self.read_timeout)
+
+    def host_limit(self, host: str) -> int:
+        """ Returns the maximum number of pooled connections for `host`. """
+        return self.host_limits.get(host, self.pool_maxsize)
+
+    def target(self, url: str) -> str:
+        """ Returns the url a request for `url` is actually sent to, after applying `host_overrides`. """
+        if not self.host_overrides:
+            return url
+
+        parts = urlsplit(url)
+        base = self.host_overrides.get(parts.netloc)
+        if base is None:
+            return url
+        return base.rstrip('/') + url[len(f"{parts.scheme}://{parts.netloc}"):]
+
+class Response():
+    """ The transport independent result of a request. Both the sync & async transports return this so the request classes do not depend on which http client was used. `elapsed` is the time
+    spent on the final attempt, `wait` the time spent queued by the scheduler & `retries` the number of attempts which were retried. `cache` is `'hit'`, `'revalidated'` or `'miss'` for cacheable
+    requests and `None` otherwise. """
+
+    def __init__(self, status_code: int, headers: dict, content: bytes, elapsed: float = 0.0, wait: float = 0.0, retries: int = 0, cache: str = None) -> None:
+        self.status_code: int = status_code
+        self.headers: CaseInsensitiveDict = CaseInsensitiveDict(headers)
+        self.content: bytes = content
+        self.elapsed: float = elapsed
+        self.wait: float = wait
+        self.retries: int = retries
+        self.cache: str | None = cache
+
+    @property
+    def text(self) -> str:
+        """ Returns the body of the response decoded as utf-8. """
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> any:
+        """ Returns the body of the response parsed as json. An empty body returns `None`. """
+        if not self.content:
+            return None
+        return json.loads(self.content)
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+def _query_pairs(params: dict | None) -> list:
+    """ Returns `params` as the query pairs `requests` would send: a list or tuple value becomes one pair per item, `None` values & items are left out & anything else is sent as `str(value)`. """
+    pairs = []
+    for key, values in (params or {}).items():
+        if isinstance(values, (str, bytes)) or not hasattr(values, '__iter__'):
+            values = [values]
+
+        for value in values:
+            if value is not None:
+                pairs.append((key, value.decode('utf-8') if isinstance(value, bytes) else str(value)))
+    return pairs
+
+def _complete_cached(cache: ResponseCache, key: str, entry: object, ttl: float, r: Response) -> Response:
+    """ Records the upstream response `r` of a cacheable request & returns the response the caller should get. """
+    revalidated = cache.complete(key, entry, ttl, r.status_code, r.headers, r.content)
+    if revalidated is not None:
+        return Response(revalidated.status_code, revalidated.headers, revalidated.content, r.elapsed, r.wait, r.retries, cache='revalidated')
+
+    r.cache = 'miss'
+    return r
+
+def _record(metrics: Metrics | None, scheduler: Scheduler, method: str, url: str, endpoint: str | None, started: float, r: Response | None) -> None:
+    """ Records a request in `metrics`. `r` is `None` if the request raised. """
+    if metrics is None:
+        return
+
+    upstream = scheduler.upstream(url)
+    duration = time.perf_counter() - started
+    if r is None:
+        metrics.observe_request(endpoint or upstream, upstream, method, 'error', duration)
+        return
+
+    latency = None if r.cache == 'hit' else r.elapsed
+    metrics.observe_request(endpoint or upstream, upstream, method, r.status_code, duration, latency, len(r.content), r.retries, r.wait, r.cache)
+
+class Transport():
+    """ Keeps one pooled, keep-alive `requests.Session()` for each upstream host (api.spotify.com, developer-api.govee.com, api.satchelone.com, ...). Every request class in `xenon.models` sends
+    through a `Transport()` so connections are reused rather than renegotiated on every call. """
+
+    def __init__(self, settings: TransportSettings = None, scheduler: Scheduler = None, cache: ResponseCache = None, metrics: Metrics = None, cassette: object = None) -> None:
+        self.settings: TransportSettings = settings or TransportSettings()
+        self.scheduler: Scheduler = scheduler or Scheduler()
+        self.cache: ResponseCache | None = cache
+        self.metrics: Metrics | None = metrics
+        self.cassette: object = cassette
+
+        self._sessions: dict = {}
+        self._lock = threading.Lock()
+
+    def _new_session(self, host: str) -> requests.Session:
+        """ Creates a session whose connection pool is sized for `host`. """
+        limit = self.settings.host_limit(host)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=limit, pool_block=self.settings.pool_block, max_retries=self.settings.max_retries)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """ Returns the session for the host of `url`, creating it on first use. """
+        host = urlsplit(url).netloc
+
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._new_session(host)
+                    self._sessions[host] = session
+        return session
+
+    def request(self, method: str, url: str, params: dict = None, headers: dict = None, data: str = None, endpoint: str = None) -> Response:
+        """ Sends a request through the pooled session of the upstream host. Cacheable GET requests are answered from `self.cache` when possible. The request is recorded in `self.metrics` under
+        `endpoint` (the name of the request class), or under its upstream if no endpoint is given. """
+        started = time.perf_counter()
+        try:
+            r = self._request(method, url, params, headers, data)
+        except Exception:
+            _record(self.metrics, self.scheduler, method, url, endpoint, started, None)
+            raise
+
+        _record(self.metrics, self.scheduler, method, url, endpoint, started, r)
+        return r
+
+    def _request(self, method: str, url: str, params: dict = None, headers: dict = None, data: str = None) -> Response:
+        if self.cache is None:
+            return self._send(method, url, params, headers, data)
+
+        key, entry, ttl, headers = self.cache.prepare(method, url, params, headers)
+        if key is None:
+            return self._send(method, url, params, headers, data)
+
+        if entry is not None and entry.is_fresh:
+            self.cache.hit()
+            return Response(entry.status_code, entry.headers, entry.content, cache='hit')
+
+        r = self._send(method, url, params, headers, data)
+        return _complete_cached(self.cache, key, entry, ttl, r)
+
+    def _send(self, method: str, url: str, params: dict = None, headers: dict = None, data: str = None) -> Response:
+        """ Sends the request upstream. The request waits for the upstream's rate limit & is retried as decided by `self.scheduler`. While `self.cassette` (see `xenon.cassettes`) is recording
+        the final response is added to it; while it is replaying the request is answered from it instead. """
+        if self.cassette is not None and self.cassette.replaying:
+            r, delay = self.cassette.play(method, url, params)
+            if delay > 0:
+                time.sleep(delay)
+            return r
+
+        session = self.get_session(url)
+        target = self.settings.target(url)
+        total_wait = 0.0
+        attempt = 0
+
+        while True:
+            wait = self.scheduler.reserve(url)
+            if wait > 0:
+                time.sleep(wait)
+                total_wait += wait
+
+            start = time.perf_counter()
+            r = session.request(method, target, params=params, headers=headers, data=data, timeout=self.settings.timeout)
+            elapsed = time.perf_counter() - start
+
+            delay = self.scheduler.retry_delay(url, method, r.status_code, r.headers, attempt)
+            if delay is None:
+                response = Response(r.status_code, r.headers, r.content, elapsed, total_wait, attempt)
+                if self.cassette is not None:
+                    self.cassette.record(method, url, params, response)
+                return response
+
+            r.close()
+            time.sleep(delay)
+            total_wait += delay
+            attempt += 1
+
+    def close(self) -> None:
+        """ Closes every pooled connection. Sessions are recreated on the next request. """
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+
+        for session in sessions:
+            session.close()
+
+
+
+class AsyncTransport():
+    """ The asyncio counterpart of `Transport()`. Keeps one pooled `aiohttp.ClientSession()` for each upstream host. Sessions belong to the event loop they were created on, so they are stored
+    per loop & per host, & are closed when their loop shuts down (`asyncio.run()` & any runner which calls `loop.shutdown_asyncgens()`). Loops which are closed by hand should `await close()`
+    first. """
+
+    def __init__(self, settings: TransportSettings = None, scheduler: Scheduler = None, cache: ResponseCache = None, metrics: Metrics = None, cassette: object = None) -> None:
+        self.settings: TransportSettings = settings or TransportSettings()
+        self.scheduler: Scheduler = scheduler or Scheduler()
+        self.cache: ResponseCache | None = cache
+        self.metrics: Metrics | None = metrics
+        self.cassette: object = cassette
+
+        self._sessions: dict = {}
+        self._closers: dict = {}
+
+    def _new_session(self, host: str) -> aiohttp.ClientSession:
+        """ Creates a session whose connector is sized for `host`. """
+        limit = self.settings.host_limit(host)
+        connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit)
+        timeout = aiohttp.ClientTimeout(sock_connect=self.settings.connect_timeout, sock_read=self.settings.read_timeout)
+
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def _close_on_shutdown(self, loop: asyncio.AbstractEventLoop) -> iter:
+        """ Closes the sessions of `loop` when it shuts down. Started & left suspended on the first session of a loop, so the loop tracks it as an async generator & closes it in
+        `shutdown_asyncgens()`, which runs the `finally` on the loop before it is closed. """
+        try:
+            yield
+        finally:
+            sessions = self._sessions.pop(loop, {})
+            self._closers.pop(loop, None)
+            for session in sessions.values():
+                await session.close()
+
+    def _loop_sessions(self) -> dict:
+        """ Returns the `{host: session}` dict of the running event loop, registering its shutdown hook on first use. """
+        loop = asyncio.get_running_loop()
+
+        sessions = self._sessions.get(loop)
+        if sessions is None:
+            sessions = self._sessions[loop] = {}
+
+            closer = self._close_on_shutdown(loop)
+            try:
+                # Runs the generator up to its `yield` without awaiting, as nothing before it suspends
+                closer.asend(None).send(None)
+            except StopIteration:
+                pass
+            self._closers[loop] = closer
+        return sessions
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        """ Returns the session for the host of `url` on the running event loop, creating it on first use. """
+        sessions = self._loop_sessions()
+        host = urlsplit(url).netloc
+
+        session = sessions.get(host)
+        if session is None or session.closed:
+            session = self._new_session(host)
+            sessions[host] = session
+        return session
+
+    async def request(self, method: str, url: str, params: dict = None, headers: dict = None, data: str = None, endpoint: str = None) -> Response:
+        """ Sends a request through the pooled session of the upstream host. Cacheable GET requests are answered from `self.cache` when possible. See `Transport.request()`. """
+        started = time.perf_counter()
+        try:
+            r = await self._request(method, url, params, headers, data)
+        except Exception:
+            _record(self.metrics, self.scheduler, method, url, endpoint, started, None)
+            raise
+
+        _record(self.metrics, self.scheduler, method, url, endpoint, started, r)
+        return r
+
+    async def _request(self, method: str, url: str, params: dict = None, headers: dict = None, data: str = None) -> Response:
+        if self.cache is None:
+            return await self._send(method, url, params, headers, data)
+
+        key, entry, ttl, headers = self.cache.prepare(method, url, params, headers)
+        if key is None:
+            return await self._send(method, url, params, headers, data)
+
+        if entry is not None and entry.is_fresh:
+            self.cache.hit()
+            return Response(entry.status_code, entry.headers, entry.content, cache='hit')
+
+        r = await self._send(method, url, params, headers, data)
+        return _complete_cached(self.cache, key, entry, ttl, r)
+
+    async def _send(self, method: str, url: str, params: dict = None, headers: dict = None, data: str = None) -> Response:
+        """ Sends the request upstream. The request waits for the upstream's rate limit & is retried as decided by `self.scheduler`. See `Transport._send()` for `self.cassette`. """
+        if self.cassette is not None and self.cassette.replaying:
+            r, delay = self.cassette.play(method, url, params)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return r
+
+        session = self.get_session(url)
+        target = self.settings.target(url)
+        query = _query_pairs(params)
+        total_wait = 0.0
+        attempt = 0
+
+        while True:
+            wait = self.scheduler.reserve(url)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                total_wait += wait
+
+            start = time.perf_counter()
+            async with session.request(method, target, params=query, headers=headers, data=data) as r:
+                content = await r.read()
+            elapsed = time.perf_counter() - start
+
+            delay = self.scheduler.retry_delay(url, method, r.status, r.headers, attempt)
+            if delay is None:
+                response = Response(r.status, r.headers, content, elapsed, total_wait, attempt)
+                if self.cassette is not None:
+                    self.cassette.record(method, url, params, response)
+                return response
+
+            await asyncio.sleep(delay)
+            total_wait += delay
+            attempt += 1
+
+    async def close(self) -> None:
+        """ Closes every session that belongs to the running event loop. """
+        sessions = self._sessions.get(asyncio.get_running_loop(), {})
+
+        for host in list(sessions):
+            await sessions.pop(host).close()
+
+
+
+#* ====================================================================================================================================================================================================
+
+
+
+_transport = Transport(cache=ResponseCache(), metrics=Metrics())
+_async_transport = AsyncTransport(_transport.settings, _transport.scheduler, _transport.cache, _transport.metrics)
+
+_transports: contextvars.ContextVar = contextvars.ContextVar('xenon_transports', default=(None, None))
+
+def get_transport() -> Transport:
+    """ Returns the transport used by the request classes in `xenon.models`: the one of the current `transport_scope()`, otherwise the default transport. """
+    return _transports.get()[0] or _transport
+
+def get_async_transport() -> AsyncTransport:
+    """ Returns the transport used by the awaitable `create_request_async()` of the request classes in `xenon.models`. See `get_transport()`. """
+    return _transports.get()[1] or _async_transport
+
+@contextmanager
+def transport_scope(transport: Transport = None, async_transport: AsyncTransport = None) -> iter:
+    """ Sends every request of this scope through `transport` & `async_transport` instead of the defaults. Transports which are not given are kept from the enclosing scope. """
+    outer_transport, outer_async_transport = _transports.get()
+    token = _transports.set((transport or outer_transport, async_transport or outer_async_transport))
+    try:
+        yield
+    finally:
+        _transports.reset(token)
+
+def configure_transport(**kwargs) -> Transport:
+    """ Replaces the settings of the default transports. Takes the same keyword arguments as `TransportSettings()`. Open sync connections are closed so the new limits apply straight away; async
+    sessions pick the new limits up when they are next created. """
+    _transport.close()
+    _transport.settings = TransportSettings(**kwargs)
+    _async_transport.settings = _transport.settings
+    return _transport